@@ -1,17 +1,39 @@
 import logging
+import time
 
 import discord
-import requests
-from discord import Interaction
+from discord import Interaction, Message
 
 from constants import cardpool_format_example
-from Database.Models.draft import PickType
-from Database.draft_setup import create_draft, get_cards_from_data
+from Database.cube_setup import add_cube_to_draft, get_cube
+from Database.Models.draft import DraftStatus, PickMode, PickType
+from Database.draft_setup import create_draft, finish_import
 from Messages import open_draft_msg
-from Utils.collective_api import get_card_data, ApiError
+from Utils.cardpool_import import card_count, parse_cardpool
+from Utils.cardpool_pipeline import ImportProgress, import_cardpool
+from Utils.collective_api import ApiError
+from Utils.import_queue import import_queue
 
 # I don't like this in Actions, discord interactions should be elsewhere, I wanted actions to be pure without chat stuff
 
+# seconds between edits of the progress message, discord rate limits message edits
+PROGRESS_INTERVAL = 2
+
+
+def _progress_reporter(message: Message):
+    last_edit = time.monotonic()
+
+    async def report(progress: ImportProgress):
+        nonlocal last_edit
+        if not progress.done and time.monotonic() - last_edit < PROGRESS_INTERVAL:
+            return
+        last_edit = time.monotonic()
+        await message.edit(
+            content=f"Loading cards... {progress.inserted}/{progress.total} added, {progress.resolved} found"
+        )
+
+    return report
+
 
 async def create_draft_dis(interaction: Interaction):
     await interaction.response.defer()
@@ -59,6 +81,17 @@ async def create_draft_dis(interaction: Interaction):
             )
             return
 
+        # get pick mode
+        draft_pick_mode_msg = await get_answer(
+            "How should players pick? `buttons` -> browse the pack card by card, `menu` -> see the whole pack and pick from a menu in one click",
+        )
+        draft_pick_mode = draft_pick_mode_msg.content.strip()
+        if draft_pick_mode not in [pick_mode.value for pick_mode in PickMode]:
+            await interaction.user.dm_channel.send(
+                "Invalid pick mode. Please try again."
+            )
+            return
+
         # pack options
         # get packs per player
         draft_packs_per_player_msg = await get_answer("How many packs per player?")
@@ -78,20 +111,46 @@ async def create_draft_dis(interaction: Interaction):
         draft_max_participants_msg = await get_answer("How many maximum participants?")
         draft_max_participants = int(draft_max_participants_msg.content.strip())
 
-        # get draft file
+        # get draft file or the name of a saved cube
         draft_cardpool_msg = await get_answer(
-            "Please send me a .txt file with the cardpool for the draft. The format is as follows:\n"
+            "Please send me a file with the cardpool for the draft, or the name of a saved cube (see `/show_cubes`). Lines may start with a count like `2 Card Name`, CSV and JSON exports work too. The basic format is as follows:\n"
             + cardpool_format_example,
         )
-        draft_cardpool_url = draft_cardpool_msg.attachments[0].url
-        draft_cardpool_request = requests.get(draft_cardpool_url)
-        draft_cardpool_lines = draft_cardpool_request.text.splitlines()
 
-        # message to confirm processing
-        duration = round(len(draft_cardpool_lines) / 100)
-        await interaction.user.dm_channel.send(
-            f"Thank you! I'll create the draft now. Please wait, this may take {'less than a minute' if duration <= 1 else f'{duration} minutes'}."
-        )
+        if not draft_cardpool_msg.attachments:
+            cube_name = draft_cardpool_msg.content.strip()
+            try:
+                cube = await get_cube(cube_name)
+            except ValueError as e:
+                await interaction.user.dm_channel.send(f"{e} Please try again.")
+                return
+
+            await interaction.user.dm_channel.send(
+                f"Thank you! I'll create the draft from **{cube.name}** (version {cube.version}) now."
+            )
+
+        else:
+            cube = None
+            draft_cardpool_file = draft_cardpool_msg.attachments[0]
+            draft_cardpool = await draft_cardpool_file.read()
+            try:
+                draft_cardpool_entries = parse_cardpool(
+                    draft_cardpool.decode("utf-8"), draft_cardpool_file.filename
+                )
+            except ValueError as e:
+                await interaction.user.dm_channel.send(
+                    f"I couldn't read the cardpool: {e} Please try again."
+                )
+                return
+            if not draft_cardpool_entries:
+                await interaction.user.dm_channel.send(
+                    "The cardpool is empty. Please try again."
+                )
+                return
+
+            await interaction.user.dm_channel.send(
+                "Thank you! I'll create the draft now, I'll keep you posted on the progress."
+            )
 
     except TimeoutError:
         await interaction.user.dm_channel.send(
@@ -105,31 +164,79 @@ async def create_draft_dis(interaction: Interaction):
         )
         return
 
-    try:
-        # fetch cards
-        draft_cards_data = await get_card_data(draft_cardpool_lines)
-    except ApiError as e:
+    async def create_and_fill_draft():
+        try:
+            # create draft in database
+            draft = await create_draft(
+                owner_discord_id=interaction.user.id,
+                name=draft_name,
+                description=draft_description,
+                pick_type=PickType(draft_pick_type),
+                packs_per_player=draft_packs_per_player,
+                cards_per_pack=draft_cards_per_pack,
+                seconds_per_pick=seconds_per_pick,
+                max_participants=draft_max_participants,
+                pick_mode=PickMode(draft_pick_mode),
+                status=DraftStatus.IMPORTING,
+            )
+        except:
+            logging.exception("Error while creating draft (2/2)")
+            await interaction.user.dm_channel.send(
+                "Something went wrong during the draft creation process (2/2), please try again."
+            )
+            return None
+
+        try:
+            # fill draft with cardpool, saved cubes are already resolved
+            if cube:
+                await add_cube_to_draft(cube, draft)
+            else:
+                progress_message = await interaction.user.dm_channel.send(
+                    f"Loading cards... 0/{card_count(draft_cardpool_entries)}"
+                )
+                await import_cardpool(
+                    draft_cardpool_entries,
+                    draft,
+                    on_progress=_progress_reporter(progress_message),
+                )
+            # only now can the draft be found, joined and started
+            await finish_import(draft)
+        except ApiError as e:
+            await draft.delete()
+            await interaction.user.dm_channel.send(
+                f"Something went wrong while fetching the card data. Please make sure the cardpool is correct and try again.\n{e.message}"
+            )
+            return None
+        except:
+            logging.exception("Error while creating draft (2/2)")
+            await draft.delete()
+            await interaction.user.dm_channel.send(
+                "Something went wrong during the draft creation process (2/2), please try again."
+            )
+            return None
+
+        return draft
+
+    async def notify_queued(position):
         await interaction.user.dm_channel.send(
-            f"Something went wrong while fetching the card data. Please make sure the cardpool is correct and try again.\n{e}"
+            f"A few other cardpools are being loaded right now, you're number {position} in line. I'll start as soon as it's your turn."
         )
+
+    # saved cubes are a single insert, only file imports wait in the import queue
+    if cube:
+        draft = await create_and_fill_draft()
+    else:
+        try:
+            draft = await import_queue.run(
+                interaction.user.id, create_and_fill_draft, on_queued=notify_queued
+            )
+        except ValueError as e:
+            await interaction.user.dm_channel.send(str(e))
+            return
+    if not draft:
         return
 
     try:
-        # create draft in database
-        draft = await create_draft(
-            owner_discord_id=interaction.user.id,
-            name=draft_name,
-            description=draft_description,
-            pick_type=PickType(draft_pick_type),
-            packs_per_player=draft_packs_per_player,
-            cards_per_pack=draft_cards_per_pack,
-            seconds_per_pick=seconds_per_pick,
-            max_participants=draft_max_participants,
-        )
-
-        # fill draft with cardpool
-        await get_cards_from_data(draft_cards_data, draft)
-
         # create draft messages for dm and channel
         message = await open_draft_msg.get_message(
             draft_name=draft_name, interaction=interaction
@@ -0,0 +1,174 @@
+from collections import defaultdict
+from typing import Dict, List
+
+from tortoise.exceptions import DoesNotExist
+from tortoise.transactions import in_transaction
+
+from Database import card_catalog, draft_state
+from Database.Models.card import Card
+from Database.Models.draft import Draft, DraftStatus
+from Database.draft_setup import (
+    get_cards_from_data,
+    get_or_create_user_by_discord_id,
+)
+from Utils.cardpool_import import (
+    CardpoolEntry,
+    EntryKind,
+    classify,
+    get_entries_data,
+    parse_cardpool,
+)
+from Utils.collective_api import ApiError
+
+
+async def _get_editable_draft(draft_name: str, user_discord_id: int) -> Draft:
+    try:
+        draft = await Draft.get(name=draft_name)
+    except DoesNotExist:
+        raise ValueError("Draft does not exist.")
+
+    await draft.fetch_related("owner")
+
+    user = await get_or_create_user_by_discord_id(user_discord_id)
+
+    if user not in draft.owner:
+        raise ValueError("You are not the owner of this draft.")
+
+    if draft.status != DraftStatus.PREPARING.value:
+        raise ValueError("The cardpool can only be changed before the draft starts.")
+
+    return draft
+
+
+def _parse(cards: str) -> List[CardpoolEntry]:
+    # slash command options are a single line, cards are separated by ';'
+    entries = parse_cardpool(cards.replace(";", "\n"))
+    if not entries:
+        raise ValueError("Please name at least one card.")
+    return entries
+
+
+def _lookup_key(kind: EntryKind, key: str) -> tuple:
+    # same keys the importer dedupes by, links and uids of a card are one key
+    return kind == EntryKind.NAME, key.lower() if kind == EntryKind.NAME else key
+
+
+async def _pool_by_key(draft: Draft) -> Dict[tuple, List[Card]]:
+    """The draft's cards, reachable by uid and by name without asking the api."""
+    cards = await Card.filter(draft=draft).order_by("id")
+    await card_catalog.load(cards)
+
+    pool = defaultdict(list)
+    for card in cards:
+        kind, uid = classify(card.link)
+        pool[_lookup_key(kind, uid)].append(card)
+        pool[_lookup_key(EntryKind.NAME, card.name)].append(card)
+    return pool
+
+
+def _card_data(card: Card) -> dict:
+    return {
+        "name": card.name,
+        "link": card.link,
+        "faction": card.faction,
+        "card_type": card.card_type,
+    }
+
+
+async def _resolve(draft: Draft, entries: List[CardpoolEntry]) -> List[dict]:
+    pool = await _pool_by_key(draft)
+
+    # every requested copy is added, only cards that aren't in the pool yet are looked up
+    cards = []
+    new_entries = []
+    for entry in entries:
+        copies = pool.get(_lookup_key(entry.kind, entry.key))
+        if copies:
+            cards += [_card_data(copies[0])] * entry.count
+        else:
+            new_entries.append(entry)
+
+    if new_entries:
+        try:
+            cards += await get_entries_data(new_entries)
+        except ApiError as e:
+            raise ValueError(e.message)
+
+    return cards
+
+
+async def _remove(draft: Draft, entries: List[CardpoolEntry]) -> int:
+    pool = await _pool_by_key(draft)
+
+    missing = [
+        entry.key
+        for entry in entries
+        if _lookup_key(entry.kind, entry.key) not in pool.keys()
+    ]
+    if missing:
+        raise ValueError(f"Not in the cardpool: {', '.join(missing)}")
+
+    card_ids = set()
+    for entry in entries:
+        copies = [
+            card.id
+            for card in pool[_lookup_key(entry.kind, entry.key)]
+            if card.id not in card_ids
+        ]
+        card_ids.update(copies[: entry.count])
+
+    await Card.filter(id__in=card_ids).delete()
+    return len(card_ids)
+
+
+async def add_cards(draft_name: str, user_discord_id: int, cards: str):
+    """Handle add cards interaction."""
+    draft = await _get_editable_draft(draft_name, user_discord_id)
+    # looked up before taking the lock, joins don't wait for the api
+    new_cards = await _resolve(draft, _parse(cards))
+
+    async with draft_state.draft_lock(draft_name):
+        draft = await _get_editable_draft(draft_name, user_discord_id)
+        async with in_transaction("default"):
+            await get_cards_from_data(new_cards, draft)
+
+    return f"Added {len(new_cards)} cards to the cardpool."
+
+
+async def remove_cards(draft_name: str, user_discord_id: int, cards: str):
+    """Handle remove cards interaction."""
+    entries = _parse(cards)
+
+    # the draft can't start while its cardpool shrinks
+    async with draft_state.draft_lock(draft_name):
+        draft = await _get_editable_draft(draft_name, user_discord_id)
+        async with in_transaction("default"):
+            removed = await _remove(draft, entries)
+
+    return f"Removed {removed} cards from the cardpool."
+
+
+async def replace_card(
+    draft_name: str, user_discord_id: int, old_card: str, new_card: str
+):
+    """Handle replace card interaction."""
+    draft = await _get_editable_draft(draft_name, user_discord_id)
+    old_entries, new_entries = _parse(old_card), _parse(new_card)
+
+    # resolve the new card before anything is removed, a typo leaves the pool untouched
+    pool = await _pool_by_key(draft)
+    if any(_lookup_key(e.kind, e.key) in pool.keys() for e in new_entries):
+        raise ValueError("The new card is already in the cardpool.")
+    try:
+        cards = await get_entries_data(new_entries)
+    except ApiError as e:
+        raise ValueError(e.message)
+
+    # the draft can't start in between, and a failed insert puts the old card back
+    async with draft_state.draft_lock(draft_name):
+        draft = await _get_editable_draft(draft_name, user_discord_id)
+        async with in_transaction("default"):
+            await _remove(draft, old_entries)
+            await get_cards_from_data(cards, draft)
+
+    return f"Replaced {old_card} with {', '.join(card['name'] for card in cards)}."
@@ -1,5 +1,4 @@
-from tortoise.exceptions import DoesNotExist
-
+from Database import draft_listing, draft_state
 from Database.Models.draft import Draft, DraftStatus
 from Database.draft_setup import get_or_create_user_by_discord_id
 
@@ -7,23 +6,37 @@ from Database.draft_setup import get_or_create_user_by_discord_id
 async def join_draft(draft_name: str, user_discord_id: int):
     """Handle join draft interaction."""
 
-    try:
-        draft = await Draft.get(name=draft_name).prefetch_related("participants")
-    except DoesNotExist:
-        raise ValueError("Draft does not exist.")
+    async with draft_state.draft_lock(draft_name) as state:
+        if state.status == DraftStatus.IMPORTING.value:
+            raise ValueError("Draft is still loading its cardpool.")
+
+        if state.status != DraftStatus.PREPARING.value:
+            raise ValueError("Draft is not accepting participants anymore.")
+
+        if user_discord_id in state.participants:
+            raise ValueError("You already joined this draft.")
+
+        if len(state.participants) >= state.max_participants:
+            raise ValueError("Draft is full.")
 
-    if draft.status != DraftStatus.PREPARING.value:
-        raise ValueError("Draft is not accepting participants anymore.")
+        user = await get_or_create_user_by_discord_id(user_discord_id)
 
-    user = await get_or_create_user_by_discord_id(user_discord_id)
+        # a running draft needs all of its seats until it's over
+        if user.participates_in_draft_id is not None and DraftStatus.RUNNING.value in (
+            await Draft.filter(id=user.participates_in_draft_id).values_list(
+                "status", flat=True
+            )
+        ):
+            raise ValueError("You can't join another draft while yours is running.")
 
-    if user in draft.participants:
-        raise ValueError("You already joined this draft.")
+        # joining moves the user out of the draft they were in before
+        if user.participates_in_draft_id is not None:
+            draft_state.forget(user.participates_in_draft_id)
 
-    if len(draft.participants) >= draft.max_participants:
-        raise ValueError("Draft is full.")
+        user.participates_in_draft_id = state.draft_id
+        await user.save()
+        state.participants.add(user_discord_id)
 
-    user.participates_in_draft = draft
-    await user.save()
+    draft_listing.invalidate()
 
     return "You joined the draft successfully."
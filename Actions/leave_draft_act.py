@@ -1,26 +1,23 @@
-from tortoise.exceptions import DoesNotExist
-
-from Database.Models.draft import Draft, DraftStatus
+from Database import draft_listing, draft_state
+from Database.Models.draft import DraftStatus
 from Database.draft_setup import get_or_create_user_by_discord_id
 
 
 async def leave_draft(draft_name: str, user_discord_id: int):
     """Handle leave draft interaction."""
 
-    try:
-        draft = await Draft.get(name=draft_name).prefetch_related("participants")
-    except DoesNotExist:
-        raise ValueError("Draft does not exist.")
-
-    if draft.status != DraftStatus.PREPARING.value:
-        raise ValueError("You can't leave the draft anymore.")
+    async with draft_state.draft_lock(draft_name) as state:
+        if state.status != DraftStatus.PREPARING.value:
+            raise ValueError("You can't leave the draft anymore.")
 
-    user = await get_or_create_user_by_discord_id(user_discord_id)
+        if user_discord_id not in state.participants:
+            raise ValueError("You are not part of this draft.")
 
-    if user not in draft.participants:
-        raise ValueError("You are not part of this draft.")
+        user = await get_or_create_user_by_discord_id(user_discord_id)
+        user.participates_in_draft = None
+        await user.save()
+        state.participants.discard(user_discord_id)
 
-    user.participates_in_draft = None
-    await user.save()
+    draft_listing.invalidate()
 
     return "You left the draft successfully."
@@ -0,0 +1,33 @@
+from discord import Attachment
+
+from Database.cube_setup import save_cube as save_cube_cards
+from Utils import contact_sheet
+from Utils.cardpool_import import get_entries_data, parse_cardpool
+from Utils.collective_api import ApiError
+from Utils.import_queue import import_queue
+
+
+async def save_cube(name: str, cardpool: Attachment, user_discord_id: int):
+    """Handle save cube interaction."""
+
+    if not cardpool.filename.endswith((".txt", ".csv", ".json")):
+        raise ValueError("Cardpool must be a .txt, .csv or .json file.")
+
+    text = await cardpool.read()
+    entries = parse_cardpool(text.decode("utf-8"), cardpool.filename)
+    if not entries:
+        raise ValueError("Cardpool is empty.")
+
+    try:
+        cards = await import_queue.run(
+            user_discord_id, lambda: get_entries_data(entries)
+        )
+    except ApiError as e:
+        raise ValueError(
+            f"Something went wrong while fetching the card data. Please make sure the cardpool is correct and try again.\n{e.message}"
+        )
+
+    cube = await save_cube_cards(name, user_discord_id, cards)
+    contact_sheet.prefetch(card["link"] for card in cards)
+
+    return f"Saved **{cube.name}** (version {cube.version}, {len(cards)} cards). Pick it by name when you create a draft."
@@ -1,67 +1,91 @@
-from random import shuffle
+import logging
+import random
+from datetime import timedelta
 
 from tortoise.exceptions import DoesNotExist
 
+from Database import card_catalog, draft_listing, draft_state
+from Database.draft_names import draft_names
 from Database.Models.draft import Draft, DraftStatus
 from Database.Models.pack import Pack
 from Database.draft_setup import get_or_create_user_by_discord_id
+from Utils.pack_collation import collate_packs
+from Utils.passing_schedule import PassingSchedule
 from constants import MIN_PARTICIPANTS
 
 
 async def start_draft(draft_name: str, user_discord_id: int, channel_id: int):
     """Handle start draft interaction."""
 
-    try:
-        draft = await Draft.get(name=draft_name)
-    except DoesNotExist:
-        raise ValueError("Draft does not exist.")
+    async with draft_state.draft_lock(draft_name) as state:
+        try:
+            draft = await Draft.get(name=draft_name)
+        except DoesNotExist:
+            raise ValueError("Draft does not exist.")
 
-    await draft.fetch_related("settings", "participants", "packs", "cards", "owner")
+        await draft.fetch_related("settings", "participants", "packs", "cards", "owner")
 
-    user = await get_or_create_user_by_discord_id(user_discord_id)
+        user = await get_or_create_user_by_discord_id(user_discord_id)
 
-    if user not in draft.owner:
-        raise ValueError("You are not the owner of this draft.")
+        if user not in draft.owner:
+            raise ValueError("You are not the owner of this draft.")
 
-    if len(draft.participants) < MIN_PARTICIPANTS:
-        raise ValueError("Draft does not have enough participants.")
+        if draft.status == DraftStatus.IMPORTING.value:
+            raise ValueError("Draft is still loading its cardpool.")
 
-    if draft.status != DraftStatus.PREPARING.value:
-        raise ValueError("Draft already started.")
+        if len(draft.participants) < MIN_PARTICIPANTS:
+            raise ValueError("Draft does not have enough participants.")
 
-    # check if settings make sense
-    # current players * packs per player * cards per pack <= total cards
-    if len(
-        draft.participants
-    ) * draft.settings.packs_per_player * draft.settings.cards_per_pack > len(
-        draft.cards
-    ):
-        raise ValueError(
-            "Draft settings are not valid. Make sure you have enough cards for the draft."
-        )
+        if draft.status != DraftStatus.PREPARING.value:
+            raise ValueError("Draft already started.")
+
+        # check if settings make sense
+        # current players * packs per player * cards per pack <= total cards
+        if len(
+            draft.participants
+        ) * draft.settings.packs_per_player * draft.settings.cards_per_pack > len(
+            draft.cards
+        ):
+            raise ValueError(
+                "Draft settings are not valid. Make sure you have enough cards for the draft."
+            )
 
-    # create cards for packs
-    copied_cardpool = await draft.cards.all()
-    shuffle(copied_cardpool)
-    pack_cards = [
-        copied_cardpool[i : i + draft.settings.cards_per_pack]
-        for i in range(
-            0,
-            draft.settings.cards_per_pack
-            * draft.settings.packs_per_player
-            * len(draft.participants),
+        # create cards for packs, spread factions and card types evenly over the packs
+        await card_catalog.load(draft.cards)
+        draft.pack_seed = random.getrandbits(32)
+        pack_cards = collate_packs(
+            draft.cards,
+            draft.settings.packs_per_player * len(draft.participants),
             draft.settings.cards_per_pack,
+            draft.pack_seed,
+        )
+        logging.info(
+            f"COLLATE - {len(pack_cards)} packs for draft {draft.name} with seed {draft.pack_seed}"
         )
-    ]
 
-    # create packs
-    for cards in pack_cards:
-        new_pack = await Pack.create(draft=draft)
-        await new_pack.cards.add(*cards)
-        await new_pack.save()
+        # create packs
+        pack_ids = []
+        for cards in pack_cards:
+            new_pack = await Pack.create(draft=draft)
+            await new_pack.cards.add(*cards)
+            await new_pack.save()
+            pack_ids.append(new_pack.id)
 
-    draft.status = DraftStatus.RUNNING.value
-    draft.notification_channel_id = channel_id
-    await draft.save()
+        # seat the participants and work out who holds which pack in every round
+        seating = sorted(participant.id for participant in draft.participants)
+        schedule = PassingSchedule.build(
+            seating, pack_ids, draft.settings.cards_per_pack
+        )
+        draft.schedule = schedule.to_json()
+
+        # every round can at most take the full thinking time before auto picking
+        draft.mark_running(
+            timedelta(seconds=draft.settings.seconds_per_pick * schedule.total_rounds)
+        )
+        draft.notification_channel_id = channel_id
+        await draft.save()
+        state.status = draft.status
+        draft_names.set_status(draft.id, draft.status)
+        draft_listing.invalidate()
 
-    return "Draft started successfully. Have fun!", draft
+        return "Draft started successfully. Have fun!", draft
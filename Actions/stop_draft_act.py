@@ -1,5 +1,7 @@
 from tortoise.exceptions import DoesNotExist
 
+from Database import draft_listing, draft_state
+from Database.draft_names import draft_names
 from Database.Models.draft import Draft, DraftStatus
 from Database.draft_setup import get_or_create_user_by_discord_id
 
@@ -7,25 +9,29 @@ from Database.draft_setup import get_or_create_user_by_discord_id
 async def stop_draft(draft_name: str, user_discord_id: int):
     """Handle stop draft interaction."""
 
-    try:
-        draft = await Draft.get(name=draft_name)
-    except DoesNotExist:
-        raise ValueError("Draft does not exist.")
+    async with draft_state.draft_lock(draft_name) as state:
+        try:
+            draft = await Draft.get(name=draft_name)
+        except DoesNotExist:
+            raise ValueError("Draft does not exist.")
 
-    await draft.fetch_related("owner")
+        await draft.fetch_related("owner")
 
-    user = await get_or_create_user_by_discord_id(user_discord_id)
+        user = await get_or_create_user_by_discord_id(user_discord_id)
 
-    if user not in draft.owner:
-        raise ValueError("You are not the owner of this draft.")
+        if user not in draft.owner:
+            raise ValueError("You are not the owner of this draft.")
 
-    if draft.status == DraftStatus.PREPARING.value:
-        raise ValueError("Draft has not started yet.")
+        if draft.status in (DraftStatus.IMPORTING.value, DraftStatus.PREPARING.value):
+            raise ValueError("Draft has not started yet.")
 
-    if draft.status == DraftStatus.FINISHED.value:
-        raise ValueError("Draft already finished.")
+        if draft.status == DraftStatus.FINISHED.value:
+            raise ValueError("Draft already finished.")
 
-    draft.status = DraftStatus.FINISHED.value
-    await draft.save()
+        draft.mark_finished()
+        await draft.save()
+        state.status = draft.status
+        draft_names.set_status(draft.id, draft.status)
+        draft_listing.invalidate()
 
-    return "Draft stopped successfully.", draft
+        return "Draft stopped successfully.", draft
@@ -1,7 +1,15 @@
+import io
+import json
 import logging
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
+
+from Database.draft_archive import get_archived_drafts
+from Utils.banlist import banlist
+from Utils.command_sync import command_sync
+
+BANLIST_CHECK_INTERVAL_SECONDS = 30
 
 
 class NoOwnerError(commands.CommandError):
@@ -13,6 +21,17 @@ class AdminCog(commands.Cog):
         logging.info("Loading Cog: admin_cog.py")
         self.bot = bot
 
+    async def cog_load(self):
+        self.watch_banlist.start()
+
+    async def cog_unload(self):
+        self.watch_banlist.cancel()
+
+    # picks up edits made to the banlist file by hand
+    @tasks.loop(seconds=BANLIST_CHECK_INTERVAL_SECONDS)
+    async def watch_banlist(self):
+        banlist.reload_if_changed()
+
     async def cog_check(self, ctx):
         if not await self.bot.is_owner(ctx.author):
             raise NoOwnerError("You are not strong enough for my potions.")
@@ -24,31 +43,49 @@ class AdminCog(commands.Cog):
             await ctx.send(error)
 
     @commands.command()
-    async def sync(self, ctx):
+    async def sync(self, ctx, force: bool = False):
         await ctx.send("Wait for it...")
-        self.bot.tree.copy_global_to(guild=ctx.guild)
-        await self.bot.tree.sync(guild=ctx.guild)
-        await ctx.send("Synced!")
+        synced, _ = await command_sync.sync(self.bot.tree, [ctx.guild], force=force)
+        if synced:
+            await ctx.send("Synced!")
+        else:
+            await ctx.send(
+                "Commands haven't changed since the last sync, skipped. Use `!sync true` to sync anyway."
+            )
 
     @commands.command()
     async def clear_sync(self, ctx):
         self.bot.tree.clear_commands(guild=ctx.guild)
         await self.bot.tree.sync(guild=ctx.guild)
+        command_sync.forget(ctx.guild)
         await ctx.send("Cleared!")
 
     @commands.command()
-    async def ban(self, user: discord.User):
-        with open("Data/banlist.txt", "a") as f:
-            f.write(str(user.id) + "\n")
+    async def ban(self, ctx, user: discord.User):
+        if await banlist.ban(user.id):
+            await ctx.send(f"Banned {user}.")
+        else:
+            await ctx.send(f"{user} is already banned.")
+
+    @commands.command()
+    async def unban(self, ctx, user: discord.User):
+        if await banlist.unban(user.id):
+            await ctx.send(f"Unbanned {user}.")
+        else:
+            await ctx.send(f"{user} is not banned.")
 
     @commands.command()
-    async def unban(self, user: discord.User):
-        with open("Data/banlist.txt", "r") as f:
-            lines = f.readlines()
-        with open("Data/banlist.txt", "w") as f:
-            for line in lines:
-                if line.strip("\n") != str(user.id):
-                    f.write(line)
+    async def archived(self, ctx, *, draft_name: str):
+        records = await get_archived_drafts(draft_name)
+        if not records:
+            await ctx.send("No archived draft with that name.")
+            return
+
+        file = io.BytesIO(json.dumps(records, indent=2).encode())
+        await ctx.send(
+            f"Found {len(records)} archived runs of **{draft_name}**.",
+            file=discord.File(file, filename=f"{draft_name}.json"),
+        )
 
     @commands.command()
     async def shutdown(self, ctx):
@@ -0,0 +1,44 @@
+# cog for saving and listing cubes
+import logging
+
+from discord import app_commands, Interaction, Attachment
+from discord.ext import commands
+
+import Actions.save_cube_act
+from Messages import show_all_cubes_msg
+
+
+class CubeCog(commands.Cog):
+    def __init__(self, bot):
+        logging.info("Loading Cog: cube_cog.py")
+        self.bot = bot
+
+    @app_commands.command(
+        name="save_cube", description="Save a cardpool to reuse it for future drafts"
+    )
+    @app_commands.describe(
+        cube_name="The name you want to pick the cube by",
+        cardpool="The cardpool .txt, .csv or .json file, same format as for /create_draft",
+    )
+    async def save_cube(
+        self, interaction: Interaction, cube_name: str, cardpool: Attachment
+    ):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            response = await Actions.save_cube_act.save_cube(
+                cube_name, cardpool, interaction.user.id
+            )
+        except ValueError as e:
+            await interaction.followup.send(str(e), ephemeral=True)
+            return
+
+        await interaction.followup.send(response, ephemeral=True)
+
+    @app_commands.command(name="show_cubes", description="Show all saved cubes")
+    async def show_cubes(self, interaction: Interaction):
+        message = await show_all_cubes_msg.get_message()
+        await interaction.response.send_message(**message)
+
+
+async def setup(bot):  # an extension must have a setup function
+    await bot.add_cog(CubeCog(bot))  # adding a cog
@@ -1,12 +1,14 @@
 # cog for starting and running a draft
 import asyncio
+import io
 import logging
-from datetime import datetime
+from typing import Dict, List, Optional
 
 import discord
 from discord import app_commands, Interaction, Attachment
 from discord.ext import commands, tasks
 
+import Actions.edit_cardpool_act
 import Actions.join_draft_act
 import Actions.leave_draft_act
 import Actions.start_draft_act
@@ -14,15 +16,46 @@ import Actions.stop_draft_act
 import Actions.submit_deck_act
 from Actions import create_draft_act
 
-from Database.Models.draft import Draft, DraftStatus
+from Database import draft_listing, draft_state
+from Database.draft_names import draft_names
+from Database.deck_export import DeckFormat, get_deck_lists
+from Database.draft_archive import archive_drafts
+from Database.draft_cleanup import purge_expired_drafts
+from Database.Models.draft import Draft, DraftStatus, PickMode
 from Database.Models.pack import Pack
 from Database.Models.user import User
+from Messages.card_embeds import card_embeds
+from Messages.player_pick_msg import PreparedPack
 from Messages import (
     finished_draft_global_msg,
     player_pick_msg,
     show_all_drafts_msg,
     open_draft_msg,
 )
+from Utils import contact_sheet
+from Utils.import_queue import draft_priority
+from Utils.passing_schedule import PassingSchedule
+from constants import EXPIRY_CHECK_INTERVAL_MINUTES
+
+
+def text_file(text: str, filename: str) -> discord.File:
+    """Attachment straight from memory, nothing touches the disk."""
+    return discord.File(io.BytesIO(text.encode()), filename=filename)
+
+
+def draft_name_autocomplete(*statuses: DraftStatus):
+    """Autocomplete of draft names with one of the statuses, every draft if none are given."""
+
+    async def autocomplete(
+        interaction: Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        await draft_names.ensure_loaded()
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in draft_names.suggest(current, statuses)
+        ]
+
+    return autocomplete
 
 
 class DraftCog(commands.Cog):
@@ -30,13 +63,16 @@ class DraftCog(commands.Cog):
         logging.info("Loading Cog: draft_cog.py")
         self.bot = bot
 
-    async def draft_step(self, draft_name: str):
-        """Handles the draft loop."""
+    async def draft_step(
+        self, draft_name: str, prepared: Optional[Dict[int, PreparedPack]] = None
+    ):
+        """Handles the draft loop, prepared holds packs of this round rendered ahead of time by seat."""
+        prepared = prepared or {}
 
         # Get the draft and its settings
         draft = await Draft.get(name=draft_name)
-        await draft.fetch_related("settings", "participants", "packs")
-        settings, participants = draft.settings, draft.participants
+        await draft.fetch_related("settings")
+        settings = draft.settings
 
         # check if draft is still running
         if draft.status != DraftStatus.RUNNING.value:
@@ -45,98 +81,137 @@ class DraftCog(commands.Cog):
 
         # TODO: you should illustrate this process with a diagram
 
-        # fetch a pack for each player
-        logging.info(
-            f"FETCH - Packs for {len(participants)} players in draft {draft_name}"
-        )
-        packs = await Pack.filter(draft=draft).limit(len(participants))
-        # shift packs
-        cycle_index = draft.rounds_completed % len(participants)
-        packs = packs[cycle_index:] + packs[:cycle_index]
-        # log packs
-        for pack in packs:
-            await pack.fetch_related("cards")
-            logging.info(f"FETCH - Pack {pack.id} contains {len(pack.cards)} cards")
-
-        # Send an interaction view panel and notification to each participant
-        views = []
-        for participant, pack in zip(participants, packs):
-            # Send an interaction view panel to the participant with their current pack
+        # seats and the pack each of them holds this round come from the schedule
+        schedule = PassingSchedule.from_json(draft.schedule)
+        # seats are resolved by user id, not by who currently participates in the draft
+        users = {user.id: user for user in await User.filter(id__in=schedule.seating)}
+        participants = [users[user_id] for user_id in schedule.seating]
+        pack_ids = schedule.packs_for(draft.rounds_completed)
+        pack_index = f"{schedule.pack_round(draft.rounds_completed) + 1}/{settings.packs_per_player}"
+
+        # cardpool imports hold their inserts until the packs are out
+        async with draft_priority.priority():
+            # packs that weren't prepared during the last round are fetched now
+            missing = [
+                seat for seat in range(len(participants)) if seat not in prepared
+            ]
+            if missing:
+                logging.info(
+                    f"FETCH - Packs for {len(missing)} players in draft {draft_name}"
+                )
+                fetched = await player_pick_msg.prepare_packs(
+                    [pack_ids[seat] for seat in missing]
+                )
+                prepared.update(zip(missing, fetched))
+
+            # Send an interaction view panel to every participant at once
             logging.info(
-                f"SEND - Pack to user <{participant.discord_id}> in draft {draft_name} and awaiting response..."
+                f"SEND - Packs to {len(participants)} players in draft {draft_name} and awaiting responses..."
             )
-            message = await player_pick_msg.get_message(
-                pack,
-                f"{int((draft.rounds_completed) / settings.cards_per_pack) +1}/{settings.packs_per_player}",
+            messages = [
+                player_pick_msg.build_message(
+                    prepared[seat], pack_index, PickMode(settings.pick_mode)
+                )
+                for seat in range(len(participants))
+            ]
+            responses = await asyncio.gather(
+                *[
+                    self.bot.get_user(participant.discord_id).send(**message)
+                    for participant, message in zip(participants, messages)
+                ]
             )
-            out = await self.bot.get_user(participant.discord_id).send(**message)
-            message["view"].response = out
-            views.append(message["view"])
-
-        # Create a list of tasks to wait for the participants to pick a card
-        # TODO: consider using asyncio.gather -> collect responses
-        pick_tasks = [
-            asyncio.wait_for(view.pick_event.wait(), timeout=settings.seconds_per_pick)
-            for view in views
-        ]
-
-        # Wait for all tasks to complete or for the timeout to expire
+            views = []
+            for message, response in zip(messages, responses):
+                message["view"].response = response
+                views.append(message["view"])
+
+        # while the players think, the next round is rendered pick by pick
+        next_round = asyncio.create_task(
+            self.prepare_next_round(schedule, draft.rounds_completed, views)
+        )
         try:
-            await asyncio.gather(*pick_tasks)
-        except asyncio.TimeoutError:
-            # Handle the timeout error if any of the tasks didn't complete within the specified time
-            for view, participant in zip(views, participants):
-                if not view.pick_event.is_set():
+            # Create a list of tasks to wait for the participants to pick a card
+            # TODO: consider using asyncio.gather -> collect responses
+            pick_tasks = [
+                asyncio.wait_for(
+                    view.pick_event.wait(), timeout=settings.seconds_per_pick
+                )
+                for view in views
+            ]
+
+            # Wait for all tasks to complete or for the timeout to expire
+            try:
+                await asyncio.gather(*pick_tasks)
+            except asyncio.TimeoutError:
+                # Handle the timeout error if any of the tasks didn't complete within the specified time
+                for view, participant in zip(views, participants):
+                    if not view.pick_event.is_set():
+                        logging.info(
+                            f"TIMEOUT - Auto picking for user <{participant.discord_id}>"
+                        )
+                        await view.auto_pick()
+
+            async with draft_priority.priority():
+                # pick selected cards, by id so the order cards were shown in doesn't matter
+                packs = await Pack.filter(id__in=pack_ids).prefetch_related("cards")
+                packs_by_id = {pack.id: pack for pack in packs}
+                for view, participant, pack_id in zip(views, participants, pack_ids):
+                    pack = packs_by_id[pack_id]
+                    card = next(
+                        card
+                        for card in pack.cards
+                        if card.id == view.picked_card.card_id
+                    )
+                    await participant.deck.add(card)
+                    await pack.cards.remove(card)
                     logging.info(
-                        f"TIMEOUT - Auto picking for user <{participant.discord_id}>"
+                        f"PICK - User <{participant.discord_id}> picked card {view.picked_card.name} in draft {draft_name}"
                     )
-                    await view.auto_pick()
-            pass
-
-        # pick selected cards
-        for view, participant, pack in zip(views, participants, packs):
-            await pack.fetch_related("cards")
-            card = pack.cards[view.current_card_index]
-            await participant.deck.add(card)
-            await pack.cards.remove(card)
-            logging.info(
-                f"PICK - User <{participant.discord_id}> picked card {card.name} in draft {draft_name}"
-            )
 
-            # delete pack if empty
-            if (
-                len(pack.cards) == 1
-            ):  # hacky way to check if pack is empty, but it works
-                logging.info(
-                    f"DELETE - pack {pack} in draft {draft_name} because it is empty"
-                )
-                await pack.delete()
+                    # delete pack if empty
+                    if schedule.is_last_pick(draft.rounds_completed):
+                        logging.info(
+                            f"DELETE - pack {pack} in draft {draft_name} because it is empty"
+                        )
+                        await pack.delete()
+
+            next_prepared = await next_round
+        except BaseException:
+            next_round.cancel()
+            raise
 
         # after all participants have picked
         # - check if draft is finished
-        rounds_remaining = (
-            settings.packs_per_player * settings.cards_per_pack * len(participants) - 1
-        )
+        rounds_remaining = schedule.total_rounds - 1
         if draft.rounds_completed >= rounds_remaining:
             logging.info(
                 f"FINISH - Draft {draft_name} has finished after {draft.rounds_completed+1} rounds"
             )
-            draft.status = DraftStatus.FINISHED.value
+            draft.mark_finished()
             await draft.save()
+            draft_state.forget(draft.id)
+            draft_names.set_status(draft.id, draft.status)
+            draft_listing.invalidate()
+            logging.info(
+                f"CACHE - Card embeds hit rate {card_embeds.hit_rate:.0%} with {len(card_embeds)} cards cached"
+            )
 
             # TODO: this is just a placeholder for now, need to be prettier, probably needs to be a separate function like 'notify_participants'
             # notify participants that the draft has finished
             message = "The draft has finished! Take your time brewing and let me know with `/submit_deck` (**not in DMs!**) when you're ready. Here is your cardlist:\n"
-            for participant in participants:
-                cards = await participant.deck.all()
-                deck_string = "1 " + "\n1 ".join([card.link for card in cards])
-                with open("Data/output_deck.txt", "w") as file:
-                    file.write(deck_string)
-
-                with open("Data/output_deck.txt", "rb") as file:
-                    await self.bot.get_user(participant.discord_id).send(
-                        message, file=discord.File("Data/output_deck.txt")
+            deck_lists = await get_deck_lists(draft)
+            await asyncio.gather(
+                *[
+                    self.bot.get_user(participant.discord_id).send(
+                        message,
+                        file=text_file(
+                            deck_lists.get(participant.discord_id, ""),
+                            f"{draft.name} deck.txt",
+                        ),
                     )
+                    for participant in participants
+                ]
+            )
 
             # notify global channel that draft has finished
             message = await finished_draft_global_msg.get_message(draft)
@@ -153,30 +228,79 @@ class DraftCog(commands.Cog):
             logging.info(
                 f"CONTINUE - Draft {draft_name} is continuing with round {draft.rounds_completed+1}/{rounds_remaining+1}"
             )
-            await self.draft_step(draft.name)
+            await self.draft_step(draft.name, next_prepared)
+
+    async def prepare_next_round(
+        self, schedule: PassingSchedule, draft_round: int, views: list
+    ) -> Dict[int, PreparedPack]:
+        """Render every seat's next pack as soon as the seat passing it has picked."""
+        next_round = draft_round + 1
+        if next_round >= schedule.total_rounds:
+            return {}
+
+        # a new pack round opens fresh packs, this round's picks don't matter for them
+        if schedule.is_last_pick(draft_round):
+            prepared = await player_pick_msg.prepare_packs(
+                schedule.packs_for(next_round)
+            )
+            return dict(enumerate(prepared))
+
+        holders = {
+            pack_id: seat
+            for seat, pack_id in enumerate(schedule.packs_for(draft_round))
+        }
+
+        async def prepare_seat(seat: int):
+            view = views[holders[schedule.pack_for(next_round, seat)]]
+            await view.pick_event.wait()
+            return seat, await player_pick_msg.prepare(view.remaining_cards)
 
-    # cleanup worker that deletes drafts that have finished every monday
-    @tasks.loop(hours=24)
+        return dict(
+            await asyncio.gather(
+                *[prepare_seat(seat) for seat in range(len(schedule.seating))]
+            )
+        )
+
+    async def cog_load(self):
+        self.cleanup_drafts.start()
+
+    async def cog_unload(self):
+        self.cleanup_drafts.cancel()
+
+    # cleanup worker that deletes drafts shortly after their time to live ran out
+    @tasks.loop(minutes=EXPIRY_CHECK_INTERVAL_MINUTES)
     async def cleanup_drafts(self):
-        """Cleans up drafts that have finished."""
-        if datetime.utcnow().weekday() == 0:  # 0 is Monday, 1 is Tuesday, etc.
-            logging.info("CLEANUP - Running cleanup_drafts task...")
-            drafts = await Draft.filter(status=DraftStatus.FINISHED.value)
-            for draft in drafts:
-                logging.info(f"CLEANUP - Deleting draft {draft.name}")
-                await draft.delete()
+        """Cleans up drafts that have expired."""
+        await purge_expired_drafts()
 
     @app_commands.command(name="create_draft")
     async def create_draft(self, interaction: Interaction):
         await create_draft_act.create_draft_dis(interaction)
 
     @app_commands.command(name="show_all_drafts", description="Show all drafts")
-    async def show_all_drafts(self, interaction: Interaction):
-        message = await show_all_drafts_msg.get_message()
+    @app_commands.describe(status="Only show drafts with this status")
+    @app_commands.choices(
+        status=[
+            app_commands.Choice(name=status.value, value=status.value)
+            for status in DraftStatus
+            if status != DraftStatus.IMPORTING
+        ]
+    )
+    async def show_all_drafts(
+        self,
+        interaction: Interaction,
+        status: Optional[app_commands.Choice[str]] = None,
+    ):
+        message = await show_all_drafts_msg.get_message(
+            status and DraftStatus(status.value)
+        )
         await interaction.response.send_message(**message)
+        if "view" in message:
+            message["view"].response = await interaction.original_response()
 
     @app_commands.command(name="show_draft", description="Show a draft")
     @app_commands.describe(draft_name="The name of the draft you want to show")
+    @app_commands.autocomplete(draft_name=draft_name_autocomplete())
     async def show_draft(self, interaction: Interaction, draft_name: str):
         # create draft messages for channel
         message = await open_draft_msg.get_message(
@@ -187,6 +311,9 @@ class DraftCog(commands.Cog):
 
     @app_commands.command(name="join_draft", description="Join a draft")
     @app_commands.describe(draft_name="The name of the draft you want to join")
+    @app_commands.autocomplete(
+        draft_name=draft_name_autocomplete(DraftStatus.PREPARING)
+    )
     async def join_draft(self, interaction: Interaction, draft_name: str):
         try:
             response = await Actions.join_draft_act.join_draft(
@@ -200,6 +327,9 @@ class DraftCog(commands.Cog):
 
     @app_commands.command(name="leave_draft", description="Leave a draft")
     @app_commands.describe(draft_name="The name of the draft you want to leave")
+    @app_commands.autocomplete(
+        draft_name=draft_name_autocomplete(DraftStatus.PREPARING)
+    )
     async def leave_draft(self, interaction: Interaction, draft_name: str):
         try:
             response = await Actions.leave_draft_act.leave_draft(
@@ -213,6 +343,9 @@ class DraftCog(commands.Cog):
 
     @app_commands.command(name="start_draft", description="Start a draft")
     @app_commands.describe(draft_name="The name of the draft you want to start")
+    @app_commands.autocomplete(
+        draft_name=draft_name_autocomplete(DraftStatus.PREPARING)
+    )
     async def start_draft(self, interaction: Interaction, draft_name: str):
         """Starts a draft."""
         await interaction.response.defer()
@@ -243,14 +376,22 @@ Good luck and have fun!"""
         for participant in draft.participants:
             await self.bot.get_user(participant.discord_id).send(message)
 
-        # delay the start of the draft to give participants time to read the message
-        await asyncio.sleep(seconds_delay)
+        # delay the start of the draft to give participants time to read the message,
+        # the first round is rendered and the card images are cached in the meantime
+        contact_sheet.prefetch(card.link for card in draft.cards)
+        prepared, _ = await asyncio.gather(
+            player_pick_msg.prepare_packs(
+                PassingSchedule.from_json(draft.schedule).packs_for(0)
+            ),
+            asyncio.sleep(seconds_delay),
+        )
 
         # run the draft
-        await self.draft_step(draft.name)
+        await self.draft_step(draft.name, dict(enumerate(prepared)))
 
     @app_commands.command(name="stop_draft", description="Stop a draft")
     @app_commands.describe(draft_name="The name of the draft you want to stop")
+    @app_commands.autocomplete(draft_name=draft_name_autocomplete(DraftStatus.RUNNING))
     async def stop_draft(self, interaction: Interaction, draft_name: str):
         """Stops a draft."""
         try:
@@ -271,6 +412,99 @@ The draft **{draft.name}** has been stopped by the host. If you have any questio
 
         await self.bot.get_channel(draft.notification_channel_id).send(message)
 
+    @app_commands.command(
+        name="add_cards", description="Add cards to a draft's cardpool"
+    )
+    @app_commands.describe(
+        draft_name="The name of the draft you want to change",
+        cards="Card names, links or uids separated by ';'",
+    )
+    @app_commands.autocomplete(
+        draft_name=draft_name_autocomplete(DraftStatus.PREPARING)
+    )
+    async def add_cards(self, interaction: Interaction, draft_name: str, cards: str):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            response = await Actions.edit_cardpool_act.add_cards(
+                draft_name, interaction.user.id, cards
+            )
+        except ValueError as e:
+            await interaction.followup.send(str(e), ephemeral=True)
+            return
+
+        await interaction.followup.send(response, ephemeral=True)
+
+    @app_commands.command(
+        name="remove_cards", description="Remove cards from a draft's cardpool"
+    )
+    @app_commands.describe(
+        draft_name="The name of the draft you want to change",
+        cards="Card names, links or uids separated by ';'",
+    )
+    @app_commands.autocomplete(
+        draft_name=draft_name_autocomplete(DraftStatus.PREPARING)
+    )
+    async def remove_cards(self, interaction: Interaction, draft_name: str, cards: str):
+        try:
+            response = await Actions.edit_cardpool_act.remove_cards(
+                draft_name, interaction.user.id, cards
+            )
+        except ValueError as e:
+            await interaction.response.send_message(str(e), ephemeral=True)
+            return
+
+        await interaction.response.send_message(response, ephemeral=True)
+
+    @app_commands.command(
+        name="replace_card", description="Swap a card in a draft's cardpool"
+    )
+    @app_commands.describe(
+        draft_name="The name of the draft you want to change",
+        old_card="Name, link or uid of the card to take out",
+        new_card="Name, link or uid of the card to put in",
+    )
+    @app_commands.autocomplete(
+        draft_name=draft_name_autocomplete(DraftStatus.PREPARING)
+    )
+    async def replace_card(
+        self, interaction: Interaction, draft_name: str, old_card: str, new_card: str
+    ):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            response = await Actions.edit_cardpool_act.replace_card(
+                draft_name, interaction.user.id, old_card, new_card
+            )
+        except ValueError as e:
+            await interaction.followup.send(str(e), ephemeral=True)
+            return
+
+        await interaction.followup.send(response, ephemeral=True)
+
+    @app_commands.command(
+        name="export_deck",
+        description="Get your cardlist of a finished draft again",
+    )
+    @app_commands.describe(deck_format="How the cards should be listed")
+    async def export_deck(self, interaction: Interaction, deck_format: DeckFormat):
+        participant = await User.get_or_none(
+            discord_id=interaction.user.id
+        ).prefetch_related("participates_in_draft")
+        draft = participant and participant.participates_in_draft
+        if not draft or draft.status != DraftStatus.FINISHED.value:
+            await interaction.response.send_message(
+                "You are not part of a finished draft.", ephemeral=True
+            )
+            return
+
+        deck_lists = await get_deck_lists(draft, deck_format)
+        await interaction.response.send_message(
+            file=text_file(
+                deck_lists.get(interaction.user.id, ""),
+                f"{draft.name} deck ({deck_format.value}).txt",
+            ),
+            ephemeral=True,
+        )
+
     @app_commands.command(
         name="submit_deck",
         description="Submit your decklist after the draft has finished",
@@ -305,10 +539,8 @@ The draft **{draft.name}** has been stopped by the host. If you have any questio
             for participant in participants:
                 # if the decklist is too long, send it as a file
                 if len(participant.deck_string) > 2000:
-                    with open("Data/decklist.txt", "w") as f:
-                        f.write(participant.deck_string)
                     await channel.send(
-                        file=discord.File(f"Data/decklist.txt"),
+                        file=text_file(participant.deck_string, "decklist.txt"),
                         content=f"deck by <@{participant.discord_id}>",
                     )
                 else:
@@ -319,7 +551,8 @@ The draft **{draft.name}** has been stopped by the host. If you have any questio
                         + "```"
                     )
 
-            # delete the draft
+            # archive and delete the draft
+            await archive_drafts([draft.id])
             logging.info(f"DELETE - Draft {draft.name} has been deleted")
             await draft.delete()
 
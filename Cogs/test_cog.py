@@ -7,7 +7,6 @@ from discord import app_commands, Interaction
 from discord.ext import commands
 
 from Actions.join_draft_act import join_draft
-from Database.Models.card import Card
 from Database.Models.draft import Draft
 from Database.Models.pack import Pack
 from Database.Models.user import User
@@ -68,9 +67,7 @@ class TestCog(commands.GroupCog, name="test"):
         # create test draft
         draft = await create_draft(**DRAFT_OPTIONS)
 
-        cards = []
-        for card in random.sample(CARDS_LIST_LONG, 8):
-            cards.append(await Card.create(**card))
+        cards = await get_cards_from_data(random.sample(CARDS_LIST_LONG, 8), draft)
 
         pack = await Pack.create(draft=draft)
         await pack.cards.add(*cards)
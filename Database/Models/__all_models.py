@@ -3,3 +3,5 @@ from .draft import *
 from .settings import *
 from .pack import *
 from .card import *
+from .catalog_card import *
+from .cube import *
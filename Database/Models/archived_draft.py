@@ -0,0 +1,14 @@
+from tortoise import Model, fields
+
+
+class ArchivedDraft(Model):
+    """Compressed snapshot of a finished draft, kept in the archive database."""
+
+    name = fields.CharField(max_length=30, index=True)
+    finished_at = fields.DatetimeField(null=True)
+    archived_at = fields.DatetimeField(auto_now_add=True)
+    # zlib compressed json, see Database/draft_archive.py
+    data = fields.BinaryField()
+
+    class Meta:
+        app = "archive"
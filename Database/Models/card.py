@@ -1,14 +1,39 @@
+from typing import Optional
+
 from tortoise import Model, fields
 
+from Database import card_catalog
+
 
 class Card(Model):
-    """Card model."""
+    """A card in a draft's cardpool, name and link live in the shared catalog."""
 
-    name = fields.CharField(max_length=30)
-    link = fields.CharField(max_length=90)
+    catalog_card: fields.ForeignKeyRelation["CatalogCard"] = fields.ForeignKeyField(
+        "models.CatalogCard", related_name="memberships", on_delete=fields.RESTRICT
+    )
     draft: fields.ForeignKeyRelation["Draft"] = fields.ForeignKeyField(
         "models.Draft", related_name="cards", on_delete=fields.CASCADE, null=True
     )
 
-    class Meta:
-        unique_together = ("draft", "link")
+    # set by card_catalog.load(), the cache may evict the entry while the card is still in use
+    catalog_entry: Optional[card_catalog.CatalogEntry] = None
+
+    def _catalog(self) -> card_catalog.CatalogEntry:
+        return self.catalog_entry or card_catalog.get(self.catalog_card_id)
+
+    # call card_catalog.load() for the cards before reading these
+    @property
+    def name(self) -> str:
+        return self._catalog().name
+
+    @property
+    def link(self) -> str:
+        return self._catalog().link
+
+    @property
+    def faction(self) -> str:
+        return self._catalog().faction
+
+    @property
+    def card_type(self) -> str:
+        return self._catalog().card_type
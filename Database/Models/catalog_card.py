@@ -0,0 +1,11 @@
+from tortoise import Model, fields
+
+
+class CatalogCard(Model):
+    """A card as known to the bot, shared by every draft that uses it."""
+
+    name = fields.CharField(max_length=30)
+    link = fields.CharField(max_length=90, unique=True)
+    # captured at import so packs can be balanced, unknown for cards imported before that
+    faction = fields.CharField(max_length=30, null=True)
+    card_type = fields.CharField(max_length=30, null=True)
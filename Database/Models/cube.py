@@ -0,0 +1,28 @@
+from tortoise import Model, fields
+from tortoise.fields import ReverseRelation
+
+
+class Cube(Model):
+    """A resolved cardpool saved for reuse, saving different cards under the same name adds a version."""
+
+    name = fields.CharField(max_length=30)
+    version = fields.IntField(default=1)
+    # sha256 over the sorted card links, tells whether a save changed anything
+    content_hash = fields.CharField(max_length=64)
+    owner_discord_id = fields.BigIntField()
+    created_at = fields.DatetimeField(auto_now_add=True)
+    cards: ReverseRelation["CubeCard"]
+
+    class Meta:
+        unique_together = ("name", "version")
+
+
+class CubeCard(Model):
+    """A card in a saved cube."""
+
+    cube: fields.ForeignKeyRelation[Cube] = fields.ForeignKeyField(
+        "models.Cube", related_name="cards", on_delete=fields.CASCADE
+    )
+    catalog_card: fields.ForeignKeyRelation["CatalogCard"] = fields.ForeignKeyField(
+        "models.CatalogCard", related_name="cube_cards", on_delete=fields.RESTRICT
+    )
@@ -1,12 +1,15 @@
+from datetime import timedelta
+
 from discord.ext import tasks
 from enum import Enum
 
 from tortoise.fields import ReverseRelation
 from tortoise.models import Model
-from tortoise import fields
+from tortoise import fields, timezone
 
 from Database.Models.card import Card
 from Database.Models.settings import Settings
+from constants import FINISHED_DRAFT_TTL, RUNNING_DRAFT_GRACE
 
 
 class PickType(Enum):
@@ -16,9 +19,18 @@ class PickType(Enum):
     BLUEPRINT = "blueprint"
 
 
+class PickMode(Enum):
+    """How players pick from their pack."""
+
+    BUTTONS = "buttons"
+    MENU = "menu"
+
+
 class DraftStatus(Enum):
     """Draft status enum."""
 
+    # the cardpool is still being imported, the draft is hidden until it's done
+    IMPORTING = "importing"
     PREPARING = "preparing"
     RUNNING = "running"
     FINISHED = "finished"
@@ -37,12 +49,38 @@ class Draft(Model):
     max_participants = fields.IntField(min_value=4, max_value=10)
     rounds_completed = fields.IntField(default=0)
     notification_channel_id = fields.BigIntField(null=True)
+    # seed the packs were collated with, the same seed and cardpool give the same packs
+    pack_seed = fields.BigIntField(null=True)
+    # seats and the packs they open, see Utils/passing_schedule.py
+    schedule = fields.JSONField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    started_at = fields.DatetimeField(null=True)
+    finished_at = fields.DatetimeField(null=True)
+    # the cleanup task picks drafts off this index once it's in the past
+    expires_at = fields.DatetimeField(null=True, index=True)
+
+    def mark_running(self, expected_duration: timedelta):
+        """Stamp the start and keep the draft alive for as long as its picks can take."""
+        self.status = DraftStatus.RUNNING.value
+        self.started_at = timezone.now()
+        self.expires_at = self.started_at + expected_duration + RUNNING_DRAFT_GRACE
+
+    def mark_finished(self):
+        """Stamp the end and leave the participants time to submit their decks."""
+        self.status = DraftStatus.FINISHED.value
+        self.finished_at = timezone.now()
+        self.expires_at = self.finished_at + FINISHED_DRAFT_TTL
 
     async def delete(self, *args, **kwargs):
         # clear participants' deck_strings
-        await self.fetch_related("participants")
-        for participant in self.participants:
-            participant.deck_string = None
-            await participant.save()
+        await self.participants.all().update(deck_string=None)
 
         await super().delete(*args, **kwargs)
+
+        # imported here, these modules need this model
+        from Database import draft_listing, draft_state
+        from Database.draft_names import draft_names
+
+        draft_listing.invalidate()
+        draft_state.forget(self.id)
+        draft_names.remove(self.id)
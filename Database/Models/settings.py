@@ -8,9 +8,10 @@ class Settings(Model):
     packs_per_player = fields.IntField()
     cards_per_pack = fields.IntField()
     seconds_per_pick = fields.IntField()
+    pick_mode = fields.CharField(max_length=30, default="buttons")
     draft: fields.OneToOneRelation["Draft"] = fields.OneToOneField(
         "models.Draft", related_name="settings", on_delete=fields.CASCADE
     )
 
     def __str__(self):
-        return f"{self.pick_type} - {self.packs_per_player} - {self.cards_per_pack} - {self.seconds_per_pick}"
+        return f"{self.pick_type} - {self.packs_per_player} - {self.cards_per_pack} - {self.seconds_per_pick} - {self.pick_mode}"
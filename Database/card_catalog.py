@@ -0,0 +1,109 @@
+# in-memory view of the shared card catalog, so rendering a pack doesn't join against it every round
+import logging
+from collections import OrderedDict, namedtuple
+from typing import Dict, Iterable, List
+
+from Database.Models.catalog_card import CatalogCard
+
+CATALOG_CACHE_SIZE = 4096
+
+CatalogEntry = namedtuple("CatalogEntry", ["name", "link", "faction", "card_type"])
+
+_entries: "OrderedDict[int, CatalogEntry]" = OrderedDict()
+
+
+def _entry(catalog_card: CatalogCard) -> CatalogEntry:
+    return CatalogEntry(
+        catalog_card.name,
+        catalog_card.link,
+        catalog_card.faction,
+        catalog_card.card_type,
+    )
+
+
+def _remember(catalog_card_id: int, entry: CatalogEntry):
+    _entries[catalog_card_id] = entry
+    _entries.move_to_end(catalog_card_id)
+    while len(_entries) > CATALOG_CACHE_SIZE:
+        _entries.popitem(last=False)
+
+
+def get(catalog_card_id: int) -> CatalogEntry:
+    """Cached catalog entry, raises KeyError if it isn't cached (anymore)."""
+    try:
+        entry = _entries[catalog_card_id]
+    except KeyError:
+        raise KeyError(
+            f"Catalog card {catalog_card_id} is not loaded, await card_catalog.load() first."
+        )
+    _entries.move_to_end(catalog_card_id)
+    return entry
+
+
+async def load(cards: Iterable):
+    """Load the catalog entries of these cards and pin them on the cards."""
+    cards = list(cards)
+    entries = await load_ids(card.catalog_card_id for card in cards)
+    # pinned entries outlive an eviction from the cache while the cards are in use
+    for card in cards:
+        card.catalog_entry = entries[card.catalog_card_id]
+
+
+async def load_ids(catalog_card_ids: Iterable[int]) -> Dict[int, CatalogEntry]:
+    """Catalog entries by id, only the ones that aren't cached are queried."""
+    entries = {}
+    missing = set()
+    for catalog_card_id in set(catalog_card_ids):
+        if catalog_card_id in _entries:
+            entries[catalog_card_id] = get(catalog_card_id)
+        else:
+            missing.add(catalog_card_id)
+
+    if missing:
+        for catalog_card in await CatalogCard.filter(id__in=missing):
+            entries[catalog_card.id] = _entry(catalog_card)
+            _remember(catalog_card.id, entries[catalog_card.id])
+
+    return entries
+
+
+async def add_cards(cards: List[dict]) -> List[int]:
+    """Catalog ids for card data, only cards the catalog hasn't seen yet are inserted."""
+    links = {card["link"]: card for card in cards}
+
+    catalog_cards = await CatalogCard.filter(link__in=links.keys())
+    new_links = links.keys() - {catalog_card.link for catalog_card in catalog_cards}
+    if new_links:
+        logging.info(f"CATALOG - Adding {len(new_links)} new cards")
+        await CatalogCard.bulk_create(
+            [
+                CatalogCard(
+                    name=links[link]["name"],
+                    link=link,
+                    faction=links[link].get("faction"),
+                    card_type=links[link].get("card_type"),
+                )
+                for link in new_links
+            ],
+            ignore_conflicts=True,
+        )
+        catalog_cards += await CatalogCard.filter(link__in=new_links)
+
+    # cards imported before attributes were captured pick them up on their next import
+    outdated = [
+        catalog_card
+        for catalog_card in catalog_cards
+        if catalog_card.faction is None and links[catalog_card.link].get("faction")
+    ]
+    for catalog_card in outdated:
+        catalog_card.faction = links[catalog_card.link]["faction"]
+        catalog_card.card_type = links[catalog_card.link].get("card_type")
+    if outdated:
+        await CatalogCard.bulk_update(outdated, fields=["faction", "card_type"])
+
+    ids: Dict[str, int] = {}
+    for catalog_card in catalog_cards:
+        ids[catalog_card.link] = catalog_card.id
+        _remember(catalog_card.id, _entry(catalog_card))
+
+    return [ids[card["link"]] for card in cards]
@@ -0,0 +1,77 @@
+import hashlib
+import logging
+from typing import List
+
+from tortoise.functions import Count
+
+from Database import card_catalog
+from Database.Models.card import Card
+from Database.Models.cube import Cube, CubeCard
+from Database.Models.draft import Draft
+
+
+def _content_hash(cards: list) -> str:
+    links = sorted(card["link"] for card in cards)
+    return hashlib.sha256("\n".join(links).encode()).hexdigest()
+
+
+async def save_cube(name: str, owner_discord_id: int, cards: list) -> Cube:
+    """Save resolved card data as the newest version of a cube, unchanged content keeps the current version."""
+    content_hash = _content_hash(cards)
+
+    latest = await Cube.filter(name=name).order_by("-version").first()
+    if latest:
+        if latest.owner_discord_id != owner_discord_id:
+            raise ValueError("A cube with this name belongs to someone else.")
+        if latest.content_hash == content_hash:
+            return latest
+
+    catalog_card_ids = await card_catalog.add_cards(cards)
+
+    cube = await Cube.create(
+        name=name,
+        version=latest.version + 1 if latest else 1,
+        content_hash=content_hash,
+        owner_discord_id=owner_discord_id,
+    )
+    await CubeCard.bulk_create(
+        [
+            CubeCard(cube=cube, catalog_card_id=catalog_card_id)
+            for catalog_card_id in catalog_card_ids
+        ]
+    )
+    logging.info(f"CUBE - Saved {len(cards)} cards as {cube.name} v{cube.version}")
+
+    return cube
+
+
+async def get_cube(name: str) -> Cube:
+    """Newest version of a saved cube."""
+    cube = await Cube.filter(name=name).order_by("-version").first()
+    if not cube:
+        raise ValueError("Cube does not exist.")
+    return cube
+
+
+async def get_latest_cubes() -> List[Cube]:
+    """Newest version of every saved cube, annotated with its card_count."""
+    cubes = await Cube.all().annotate(card_count=Count("cards")).order_by("name")
+    latest = {}
+    for cube in cubes:
+        if cube.name not in latest or cube.version > latest[cube.name].version:
+            latest[cube.name] = cube
+    return list(latest.values())
+
+
+async def add_cube_to_draft(cube: Cube, draft: Draft) -> int:
+    """Copy a saved cube into the draft's cardpool without touching the api."""
+    catalog_card_ids = await CubeCard.filter(cube=cube).values_list(
+        "catalog_card_id", flat=True
+    )
+    await Card.bulk_create(
+        [
+            Card(catalog_card_id=catalog_card_id, draft=draft)
+            for catalog_card_id in catalog_card_ids
+        ]
+    )
+    return len(catalog_card_ids)
@@ -1,21 +1,165 @@
 import logging
+import os
+
 from tortoise import Tortoise
 
+from constants import FINISHED_DRAFT_TTL, PREPARING_DRAFT_TTL
+
+# bump this when a model or index changes and add the statements that bring an older database up to date,
+# fresh databases are created from the models directly and skip the migrations.
+# tables and indexes are only created when the version changes, not on every start
+SCHEMA_VERSION = 7
+
+MIGRATIONS = {
+    # draft lifecycle timestamps and expiry queue
+    1: [
+        'ALTER TABLE "draft" ADD COLUMN "created_at" TIMESTAMP',
+        'ALTER TABLE "draft" ADD COLUMN "started_at" TIMESTAMP',
+        'ALTER TABLE "draft" ADD COLUMN "finished_at" TIMESTAMP',
+        'ALTER TABLE "draft" ADD COLUMN "expires_at" TIMESTAMP',
+        'CREATE INDEX IF NOT EXISTS "idx_draft_expires_at" ON "draft" ("expires_at")',
+        # same format tortoise writes, expiry is compared as text
+        """UPDATE "draft" SET "created_at" = strftime('%Y-%m-%d %H:%M:%S', 'now') || '+00:00'""",
+        f"""UPDATE "draft" SET "expires_at" = strftime('%Y-%m-%d %H:%M:%S', 'now', '+{PREPARING_DRAFT_TTL.days} days') || '+00:00' WHERE "status" = 'preparing'""",
+        f"""UPDATE "draft" SET "expires_at" = strftime('%Y-%m-%d %H:%M:%S', 'now', '+{FINISHED_DRAFT_TTL.days} days') || '+00:00' WHERE "status" != 'preparing'""",
+    ],
+    # cards reference the shared catalog instead of carrying their own name and link,
+    # sqlite can't drop the old columns so the table is rebuilt with the same ids
+    2: [
+        "PRAGMA foreign_keys = OFF",
+        """CREATE TABLE IF NOT EXISTS "catalogcard" (
+            "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+            "name" VARCHAR(30) NOT NULL,
+            "link" VARCHAR(90) NOT NULL UNIQUE
+        )""",
+        'INSERT OR IGNORE INTO "catalogcard" ("name", "link") SELECT "name", "link" FROM "card" ORDER BY "id"',
+        """CREATE TABLE "card_new" (
+            "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+            "catalog_card_id" INT NOT NULL REFERENCES "catalogcard" ("id") ON DELETE RESTRICT,
+            "draft_id" INT REFERENCES "draft" ("id") ON DELETE CASCADE
+        )""",
+        """INSERT INTO "card_new" ("id", "catalog_card_id", "draft_id")
+            SELECT "card"."id", "catalogcard"."id", "card"."draft_id"
+            FROM "card" JOIN "catalogcard" ON "catalogcard"."link" = "card"."link"
+        """,
+        'DROP TABLE "card"',
+        'ALTER TABLE "card_new" RENAME TO "card"',
+        "PRAGMA foreign_keys = ON",
+    ],
+    # saved cubes, new tables only and those are created from the models
+    3: [],
+    # card attributes for pack collation and the seed packs were collated with
+    4: [
+        'ALTER TABLE "catalogcard" ADD COLUMN "faction" VARCHAR(30)',
+        'ALTER TABLE "catalogcard" ADD COLUMN "card_type" VARCHAR(30)',
+        'ALTER TABLE "draft" ADD COLUMN "pack_seed" BIGINT',
+    ],
+    # precomputed passing schedule of running drafts
+    5: [
+        'ALTER TABLE "draft" ADD COLUMN "schedule" JSON',
+    ],
+    # per draft pick ui
+    6: [
+        """ALTER TABLE "settings" ADD COLUMN "pick_mode" VARCHAR(30) NOT NULL DEFAULT 'buttons'""",
+    ],
+    # timestamps an earlier version of the first migration wrote with a 'T', tortoise writes a space
+    7: [
+        f"""UPDATE "draft" SET "{column}" = replace("{column}", 'T', ' ') WHERE "{column}" LIKE '____-__-__T%'"""
+        for column in ("created_at", "started_at", "finished_at", "expires_at")
+    ],
+}
+
+# tortoise doesn't index foreign keys on sqlite, without these every cascade
+# from deleting a draft, pack or card scans the whole child table
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS "idx_user_participates" ON "user" ("participates_in_draft_id")',
+    'CREATE INDEX IF NOT EXISTS "idx_pack_draft" ON "pack" ("draft_id")',
+    'CREATE INDEX IF NOT EXISTS "idx_card_draft" ON "card" ("draft_id")',
+    'CREATE INDEX IF NOT EXISTS "idx_card_catalog_card" ON "card" ("catalog_card_id")',
+    'CREATE INDEX IF NOT EXISTS "idx_cubecard_cube" ON "cubecard" ("cube_id")',
+    'CREATE INDEX IF NOT EXISTS "idx_draft_user_draft" ON "draft_user" ("draft_id")',
+    'CREATE INDEX IF NOT EXISTS "idx_draft_user_user" ON "draft_user" ("user_id")',
+    'CREATE INDEX IF NOT EXISTS "idx_user_card_user" ON "user_card" ("user_id")',
+    'CREATE INDEX IF NOT EXISTS "idx_user_card_card" ON "user_card" ("card_id")',
+    'CREATE INDEX IF NOT EXISTS "idx_pack_card_pack" ON "pack_card" ("pack_id")',
+    'CREATE INDEX IF NOT EXISTS "idx_pack_card_card" ON "pack_card" ("card_id")',
+]
+
 
-async def init(path: str = "Database/database.db"):
+async def init(path: str = "Database/database.db", archive_path: str = None):
 
     logging.info("Connecting to database...")
 
+    # finished drafts are archived into a separate file so the live tables stay small
+    archive_path = archive_path or os.path.splitext(path)[0] + "_archive.db"
+
     await Tortoise.init(
-        db_url=f"sqlite://{path}",
-        modules={
-            "models": [
-                "Database.Models.user",
-                "Database.Models.draft",
-                "Database.Models.pack",
-                "Database.Models.card",
-                "Database.Models.settings",
-            ]
-        },
+        config={
+            "connections": {
+                "default": f"sqlite://{path}",
+                "archive": f"sqlite://{archive_path}",
+            },
+            "apps": {
+                "models": {
+                    "models": [
+                        "Database.Models.user",
+                        "Database.Models.draft",
+                        "Database.Models.pack",
+                        "Database.Models.card",
+                        "Database.Models.catalog_card",
+                        "Database.Models.cube",
+                        "Database.Models.settings",
+                    ],
+                    "default_connection": "default",
+                },
+                "archive": {
+                    "models": ["Database.Models.archived_draft"],
+                    "default_connection": "archive",
+                },
+            },
+        }
     )
+    connection = Tortoise.get_connection("default")
+    await _enable_incremental_vacuum(connection)
+
+    # tables and indexes of databases at the current schema version are already in place
+    archive_connection = Tortoise.get_connection("archive")
+    version = await _schema_version(connection)
+    if min(version, await _schema_version(archive_connection)) >= SCHEMA_VERSION:
+        logging.info(f"Database schema version {version} is up to date")
+        return
+
+    await _migrate(connection, version)
     await Tortoise.generate_schemas()
+    await connection.execute_script(";\n".join(INDEXES))
+
+    # stamped last, an interrupted setup is repeated on the next start
+    for stamped in (connection, archive_connection):
+        await stamped.execute_script(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+async def _schema_version(connection) -> int:
+    result = await connection.execute_query_dict("PRAGMA user_version")
+    return result[0]["user_version"]
+
+
+async def _enable_incremental_vacuum(connection):
+    """Let cleanups hand freed pages back to the filesystem a few at a time."""
+    result = await connection.execute_query_dict("PRAGMA auto_vacuum")
+    if result[0]["auto_vacuum"] == 2:  # 2 is INCREMENTAL
+        return
+
+    # auto_vacuum only takes effect after a full VACUUM, this happens once per database file
+    logging.info("Switching database to incremental vacuum...")
+    await connection.execute_script("PRAGMA auto_vacuum = INCREMENTAL; VACUUM;")
+
+
+async def _migrate(connection, version: int):
+    """Bring a database created by an older version of the models up to date."""
+    _, tables = await connection.execute_query(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'draft'"
+    )
+    if tables:
+        for next_version in range(version + 1, SCHEMA_VERSION + 1):
+            logging.info(f"Migrating database to schema version {next_version}...")
+            await connection.execute_script(";\n".join(MIGRATIONS[next_version]))
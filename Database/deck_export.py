@@ -0,0 +1,88 @@
+# deck lists of a finished draft, built in memory from one query for every participant
+# a finished draft's decks don't change anymore, so each format is rendered once per draft
+import logging
+import re
+from collections import OrderedDict, defaultdict
+from enum import Enum
+from typing import Dict, List
+
+from Database import card_catalog
+from Database.Models.draft import Draft
+from Database.Models.user import User
+from Utils.collective_api import uid_regex
+
+DECK_EXPORT_CACHE_SIZE = 32
+
+
+class DeckFormat(Enum):
+    """How cards are written in an exported deck list."""
+
+    LINKS = "links"
+    NAMES = "names"
+    UIDS = "uids"
+
+
+class _DraftDecks:
+    def __init__(self, decks: Dict[int, List[int]]):
+        # catalog card ids per participant's discord id
+        self.decks = decks
+        self.formatted: Dict[DeckFormat, Dict[int, str]] = {}
+
+
+_exports: "OrderedDict[int, _DraftDecks]" = OrderedDict()
+
+
+def _format_card(entry: card_catalog.CatalogEntry, deck_format: DeckFormat) -> str:
+    if deck_format == DeckFormat.NAMES:
+        return entry.name
+    if deck_format == DeckFormat.UIDS:
+        uid = re.search(uid_regex, entry.link)
+        return uid.group(0) if uid else entry.link
+    return entry.link
+
+
+async def _load_decks(draft: Draft) -> _DraftDecks:
+    rows = (
+        await User.filter(participates_in_draft=draft, deck__draft_id=draft.id)
+        .order_by("deck__id")
+        .values_list("discord_id", "deck__catalog_card_id")
+    )
+    decks = defaultdict(list)
+    for discord_id, catalog_card_id in rows:
+        decks[discord_id].append(catalog_card_id)
+    logging.info(f"EXPORT - Loaded {len(rows)} picks of draft {draft.name}")
+    return _DraftDecks(dict(decks))
+
+
+async def get_deck_lists(
+    draft: Draft, deck_format: DeckFormat = DeckFormat.LINKS
+) -> Dict[int, str]:
+    """Deck list of every participant of a finished draft by discord id, in the format submit_deck accepts."""
+    exports = _exports.get(draft.id)
+    if exports is None:
+        exports = _exports[draft.id] = await _load_decks(draft)
+        while len(_exports) > DECK_EXPORT_CACHE_SIZE:
+            _exports.popitem(last=False)
+    else:
+        _exports.move_to_end(draft.id)
+
+    if deck_format not in exports.formatted:
+        # cards may have left the catalog cache since the last format was rendered
+        entries = await card_catalog.load_ids(
+            catalog_card_id
+            for deck in exports.decks.values()
+            for catalog_card_id in deck
+        )
+        exports.formatted[deck_format] = {
+            discord_id: "\n".join(
+                f"1 {_format_card(entries[catalog_card_id], deck_format)}"
+                for catalog_card_id in deck
+            )
+            for discord_id, deck in exports.decks.items()
+        }
+    return exports.formatted[deck_format]
+
+
+def forget(draft_id: int):
+    """Drop a draft's cached decks, e.g. once it's deleted."""
+    _exports.pop(draft_id, None)
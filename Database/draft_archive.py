@@ -0,0 +1,98 @@
+import json
+import logging
+import zlib
+from typing import Dict, List
+
+from Database import card_catalog
+from Database.Models.archived_draft import ArchivedDraft
+from Database.Models.draft import Draft
+from Database.Models.user import User
+
+
+def _serialize(draft: Draft, users: Dict[int, User]) -> dict:
+    # the seating the draft was played with, drafts that never started have none
+    if draft.schedule:
+        participants = [
+            users[user_id] for user_id in draft.schedule["seating"] if user_id in users
+        ]
+    else:
+        participants = sorted(draft.participants, key=lambda user: user.id)
+
+    return {
+        "name": draft.name,
+        "description": draft.description,
+        "status": draft.status,
+        "created_at": draft.created_at and draft.created_at.isoformat(),
+        "started_at": draft.started_at and draft.started_at.isoformat(),
+        "finished_at": draft.finished_at and draft.finished_at.isoformat(),
+        "rounds_completed": draft.rounds_completed,
+        "settings": {
+            "pick_type": draft.settings.pick_type,
+            "packs_per_player": draft.settings.packs_per_player,
+            "cards_per_pack": draft.settings.cards_per_pack,
+            "seconds_per_pick": draft.settings.seconds_per_pick,
+        },
+        "owners": [user.discord_id for user in draft.owner],
+        "seating": [user.discord_id for user in participants],
+        "picks": {
+            str(user.discord_id): [
+                [card.name, card.link]
+                for card in sorted(user.deck, key=lambda card: card.id)
+                if card.draft_id == draft.id
+            ]
+            for user in participants
+        },
+        "decks": {str(user.discord_id): user.deck_string for user in participants},
+    }
+
+
+def _compress(record: dict) -> bytes:
+    return zlib.compress(json.dumps(record, separators=(",", ":")).encode(), 9)
+
+
+def _decompress(data: bytes) -> dict:
+    return json.loads(zlib.decompress(data))
+
+
+async def archive_drafts(draft_ids: List[int]):
+    """Store a compressed snapshot of each draft in the archive database."""
+    if not draft_ids:
+        return
+
+    drafts = await Draft.filter(id__in=draft_ids).prefetch_related(
+        "settings", "owner", "participants__deck"
+    )
+    users = {
+        participant.id: participant
+        for draft in drafts
+        for participant in draft.participants
+    }
+    # seated players that moved on to another draft since still have their picks
+    moved_ids = {
+        user_id
+        for draft in drafts
+        if draft.schedule
+        for user_id in draft.schedule["seating"]
+    } - users.keys()
+    if moved_ids:
+        for user in await User.filter(id__in=moved_ids).prefetch_related("deck"):
+            users[user.id] = user
+
+    await card_catalog.load(card for user in users.values() for card in user.deck)
+    await ArchivedDraft.bulk_create(
+        [
+            ArchivedDraft(
+                name=draft.name,
+                finished_at=draft.finished_at,
+                data=_compress(_serialize(draft, users)),
+            )
+            for draft in drafts
+        ]
+    )
+    logging.info(f"ARCHIVE - Archived {len(drafts)} drafts")
+
+
+async def get_archived_drafts(name: str) -> List[dict]:
+    """All archived runs of a draft name, newest first."""
+    archived = await ArchivedDraft.filter(name=name).order_by("-archived_at", "-id")
+    return [_decompress(entry.data) for entry in archived]
@@ -0,0 +1,72 @@
+import logging
+from typing import List
+
+from tortoise import Tortoise, timezone
+from tortoise.transactions import in_transaction
+
+from Database import deck_export, draft_listing, draft_state
+from Database.draft_names import draft_names
+from Database.draft_archive import archive_drafts
+from Database.Models.card import Card
+from Database.Models.draft import Draft, DraftStatus
+from Database.Models.pack import Pack
+from Database.Models.user import User
+
+# sqlite limits the number of variables per statement, stay well below it
+PURGE_CHUNK_SIZE = 500
+
+# free pages handed back to the filesystem per purge, keeps the lock short
+VACUUM_PAGES_PER_PURGE = 2000
+
+
+async def purge_drafts(draft_ids: List[int]):
+    """Delete drafts and everything hanging off them with a few set-based statements."""
+    if not draft_ids:
+        return
+
+    for i in range(0, len(draft_ids), PURGE_CHUNK_SIZE):
+        chunk = draft_ids[i : i + PURGE_CHUNK_SIZE]
+        async with in_transaction("default") as connection:
+            # participants keep their account, only the draft specific data is cleared
+            await User.filter(participates_in_draft_id__in=chunk).using_db(
+                connection
+            ).update(deck_string=None)
+
+            # pack_card and user_card rows go with their packs and cards (ON DELETE CASCADE)
+            await Pack.filter(draft_id__in=chunk).using_db(connection).delete()
+            await Card.filter(draft_id__in=chunk).using_db(connection).delete()
+
+            # settings and owners cascade, participants are set to NULL
+            await Draft.filter(id__in=chunk).using_db(connection).delete()
+
+        for draft_id in chunk:
+            deck_export.forget(draft_id)
+            draft_state.forget(draft_id)
+            draft_names.remove(draft_id)
+        draft_listing.invalidate()
+        logging.info(f"CLEANUP - Purged {len(chunk)} drafts")
+
+    await Tortoise.get_connection("default").execute_script(
+        f"PRAGMA incremental_vacuum({VACUUM_PAGES_PER_PURGE})"
+    )
+
+
+async def purge_expired_drafts():
+    """Delete every draft whose time to live ran out."""
+    expired = await Draft.filter(expires_at__lte=timezone.now()).values_list(
+        "id", "status"
+    )
+    if not expired:
+        return
+
+    logging.info(f"CLEANUP - {len(expired)} drafts expired")
+
+    # keep the pick history of drafts that actually ran
+    await archive_drafts(
+        [
+            draft_id
+            for draft_id, status in expired
+            if status == DraftStatus.FINISHED.value
+        ]
+    )
+    await purge_drafts([draft_id for draft_id, _ in expired])
@@ -0,0 +1,55 @@
+# overview of every draft for /show_all_drafts, built from one grouped query instead of loading each draft
+# the overview is kept for a few seconds and dropped whenever a draft is created, joined, left, started, stopped or deleted
+import logging
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+from tortoise.functions import Count
+
+from Database.Models.draft import Draft, DraftStatus
+
+DRAFT_LISTING_TTL_SECONDS = 30
+
+DraftSummary = namedtuple(
+    "DraftSummary", ["name", "status", "participant_count", "max_participants"]
+)
+
+# summaries per status filter, None holds every draft
+_listings: Dict[Optional[str], Tuple[float, List[DraftSummary]]] = {}
+
+
+async def _load_summaries(status: Optional[str]) -> List[DraftSummary]:
+    # drafts still importing their cardpool aren't listed
+    drafts = (
+        Draft.exclude(status=DraftStatus.IMPORTING.value)
+        if status is None
+        else Draft.filter(status=status)
+    )
+    rows = (
+        await drafts.annotate(participant_count=Count("participants"))
+        .group_by("id")
+        .order_by("-created_at", "-id")
+        .values_list("name", "status", "participant_count", "max_participants")
+    )
+    logging.info(f"LISTING - Loaded {len(rows)} drafts with status {status or 'any'}")
+    return [DraftSummary(*row) for row in rows]
+
+
+async def get_draft_summaries(
+    status: Optional[DraftStatus] = None,
+) -> List[DraftSummary]:
+    """Every draft with its participant count, newest first, optionally only those with the given status."""
+    key = status and status.value
+    cached = _listings.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    summaries = await _load_summaries(key)
+    _listings[key] = (time.monotonic() + DRAFT_LISTING_TTL_SECONDS, summaries)
+    return summaries
+
+
+def invalidate():
+    """Drop every cached overview, the next listing is read from the database."""
+    _listings.clear()
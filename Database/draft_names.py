@@ -0,0 +1,86 @@
+# draft names in memory for autocomplete, suggestions never touch the database
+# names are kept sorted by their lowercase form, all names with a prefix are one slice found with bisect.
+# drafts are added, removed and moved between statuses as they change, the database is only read once
+import bisect
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from Database.Models.draft import Draft, DraftStatus
+
+# discord shows at most 25 autocomplete choices
+MAX_SUGGESTIONS = 25
+
+
+class DraftNameIndex:
+    """Sorted draft names with their status, for prefix lookups."""
+
+    def __init__(self):
+        self.loaded = False
+        # (lowercase name, name), sorted
+        self._keys: List[Tuple[str, str]] = []
+        self._status: Dict[str, str] = {}
+        self._names_by_id: Dict[int, str] = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    async def ensure_loaded(self):
+        if self.loaded:
+            return
+        rows = await Draft.all().values_list("id", "name", "status")
+        for draft_id, name, status in rows:
+            # drafts that changed while loading are already up to date
+            if draft_id not in self._names_by_id:
+                self.add(draft_id, name, status)
+        self.loaded = True
+        logging.info(f"NAMES - Indexed {len(rows)} draft names")
+
+    def add(self, draft_id: int, name: str, status: str = DraftStatus.PREPARING.value):
+        self.remove(draft_id)
+        bisect.insort(self._keys, (name.lower(), name))
+        self._status[name] = status
+        self._names_by_id[draft_id] = name
+
+    def remove(self, draft_id: int):
+        name = self._names_by_id.pop(draft_id, None)
+        if name is None:
+            return
+        index = bisect.bisect_left(self._keys, (name.lower(), name))
+        del self._keys[index]
+        del self._status[name]
+
+    def set_status(self, draft_id: int, status: str):
+        name = self._names_by_id.get(draft_id)
+        if name is not None:
+            self._status[name] = status
+
+    def suggest(
+        self,
+        prefix: str,
+        statuses: Optional[Iterable[DraftStatus]] = None,
+        limit: int = MAX_SUGGESTIONS,
+    ) -> List[str]:
+        """Names starting with the prefix, ignoring case, optionally only drafts with one of the statuses.
+
+        Drafts still importing are only suggested if asked for.
+        """
+        prefix = prefix.lower()
+        allowed = {status.value for status in statuses} if statuses else None
+
+        suggestions = []
+        index = bisect.bisect_left(self._keys, (prefix,))
+        while index < len(self._keys) and len(suggestions) < limit:
+            key, name = self._keys[index]
+            if not key.startswith(prefix):
+                break
+            if (
+                self._status[name] in allowed
+                if allowed is not None
+                else self._status[name] != DraftStatus.IMPORTING.value
+            ):
+                suggestions.append(name)
+            index += 1
+        return suggestions
+
+
+draft_names = DraftNameIndex()
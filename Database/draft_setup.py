@@ -1,18 +1,39 @@
 import logging
 
+from tortoise import timezone
+from tortoise.transactions import in_transaction
+
+from Database import card_catalog, draft_listing, draft_state
+from Database.draft_names import draft_names
 from Database.Models.card import Card
-from Database.Models.draft import Draft, PickType
+from Database.Models.draft import Draft, DraftStatus, PickMode, PickType
 from Database.Models.settings import Settings
 from Database.Models.user import User
+from constants import PREPARING_DRAFT_TTL
 
 
 async def get_cards_from_data(cards: list, draft: Draft) -> list:
-    """Get cards from object."""
-    new_cards = []
-    for card in cards:
-        card = await Card.create(name=card["name"], link=card["link"], draft=draft)
-        await card.save()
-        new_cards.append(card)
+    """Add cards from objects to the draft's cardpool, reusing known catalog entries."""
+    catalog_card_ids = await card_catalog.add_cards(cards)
+
+    # bulk_create doesn't hand out ids on sqlite, the rows after the last id before the insert
+    # are the ones just added. the transaction holds the connection, no other import slips in between
+    async with in_transaction("default") as connection:
+        last_card = await Card.all().using_db(connection).order_by("-id").first()
+        await Card.bulk_create(
+            [
+                Card(catalog_card_id=catalog_card_id, draft=draft)
+                for catalog_card_id in catalog_card_ids
+            ],
+            using_db=connection,
+        )
+        new_cards = (
+            await Card.filter(draft=draft, id__gt=last_card.id if last_card else 0)
+            .using_db(connection)
+            .order_by("id")
+        )
+
+    await card_catalog.load(new_cards)
     return new_cards
 
 
@@ -25,6 +46,8 @@ async def create_draft(
     cards_per_pack: int,
     seconds_per_pick: int,
     max_participants: int,
+    pick_mode: PickMode = PickMode.BUTTONS,
+    status: DraftStatus = DraftStatus.PREPARING,
 ) -> Draft:
     owner = await get_or_create_user_by_discord_id(owner_discord_id)
 
@@ -32,6 +55,8 @@ async def create_draft(
         name=name,
         description=description,
         max_participants=max_participants,
+        status=status.value,
+        expires_at=timezone.now() + PREPARING_DRAFT_TTL,
     )
     await new_draft.owner.add(owner)
     await new_draft.save()
@@ -41,13 +66,25 @@ async def create_draft(
         packs_per_player=packs_per_player,
         cards_per_pack=cards_per_pack,
         seconds_per_pick=seconds_per_pick,
+        pick_mode=pick_mode.value,
         draft=new_draft,
     )
     await settings.save()
+    draft_listing.invalidate()
+    draft_names.add(new_draft.id, new_draft.name, new_draft.status)
 
     return new_draft
 
 
+async def finish_import(draft: Draft):
+    """Open a draft created as importing once its cardpool is in."""
+    draft.status = DraftStatus.PREPARING.value
+    await draft.save(update_fields=["status"])
+    draft_state.forget(draft.id)
+    draft_names.set_status(draft.id, draft.status)
+    draft_listing.invalidate()
+
+
 async def get_or_create_user_by_discord_id(discord_id: int) -> User:
     user = await User.get_or_none(discord_id=discord_id)
 
@@ -0,0 +1,83 @@
+# join, leave, start and stop of a draft run one at a time behind the draft's lock
+# the lock holder checks against a cached copy of the draft, so a burst of joins only writes to the database
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Set
+
+from tortoise.exceptions import DoesNotExist
+
+from Database.Models.draft import Draft
+
+
+class DraftState:
+    """What the mutating draft actions check against, only valid while loaded."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.lock = asyncio.Lock()
+        # callers holding or waiting for the lock
+        self.users = 0
+        self.loaded = False
+        self.draft_id = None
+        self.status = None
+        self.max_participants = 0
+        self.participants: Set[int] = set()
+
+    async def load(self):
+        draft = await Draft.get(name=self.name)
+        self.draft_id = draft.id
+        self.status = draft.status
+        self.max_participants = draft.max_participants
+        self.participants = set(
+            await draft.participants.all().values_list("discord_id", flat=True)
+        )
+        self.loaded = True
+
+
+_states: Dict[str, DraftState] = {}
+
+
+def _drop_unused(state: DraftState):
+    # a lock someone holds or waits for has to stay, otherwise two callers could hold the draft at once
+    if not state.loaded and not state.users and _states.get(state.name) is state:
+        del _states[state.name]
+
+
+@asynccontextmanager
+async def draft_lock(draft_name: str):
+    """Hold the draft's lock, raises ValueError if the draft doesn't exist."""
+    state = _states.get(draft_name)
+    if state is None:
+        state = _states[draft_name] = DraftState(draft_name)
+
+    state.users += 1
+    try:
+        async with state.lock:
+            if not state.loaded:
+                try:
+                    await state.load()
+                except DoesNotExist:
+                    raise ValueError("Draft does not exist.")
+                logging.info(
+                    f"STATE - Loaded draft {draft_name} with {len(state.participants)} participants"
+                )
+            try:
+                yield state
+            except ValueError:
+                raise
+            except Exception:
+                # the action may have stopped halfway, don't trust the copy anymore
+                state.loaded = False
+                raise
+    finally:
+        state.users -= 1
+        _drop_unused(state)
+
+
+def forget(draft_id: int):
+    """Reload the draft on its next action, e.g. once it changed outside of its lock."""
+    for state in list(_states.values()):
+        if state.draft_id == draft_id:
+            state.loaded = False
+            _drop_unused(state)
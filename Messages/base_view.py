@@ -0,0 +1,10 @@
+from discord import ui, Interaction
+
+from Utils import banlist
+
+
+class BaseView(ui.View):
+    """View whose buttons and menus can't be used by banned users."""
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        return await banlist.allows(interaction)
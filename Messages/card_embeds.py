@@ -0,0 +1,62 @@
+# card embeds shared by every pick message, a card's fields are worked out once no matter how often it's passed
+# templates are immutable tuples, every render builds a fresh embed from them to stamp a header and footer on.
+# Embed.copy() round trips through to_dict(), building directly is several times faster.
+# lookups don't await, so drafts running side by side can't interleave inside the cache
+from collections import OrderedDict, namedtuple
+
+from discord import Embed
+
+import constants
+
+CARD_EMBED_CACHE_SIZE = 1024
+
+CardTemplate = namedtuple("CardTemplate", ["title", "url", "image_url"])
+
+
+class CardEmbedCache:
+    """Bounded LRU of per-card embed templates, keyed by catalog card id."""
+
+    def __init__(self, maxsize: int = CARD_EMBED_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._templates: "OrderedDict[int, CardTemplate]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._templates)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _add(self, card_id: int, name: str, link: str) -> CardTemplate:
+        template = CardTemplate(name, link, link)
+        self._templates[card_id] = template
+        while len(self._templates) > self.maxsize:
+            self._templates.popitem(last=False)
+        return template
+
+    def warm(self, card_id: int, name: str, link: str):
+        """Build the template ahead of time, not counted as a lookup."""
+        if card_id not in self._templates:
+            self._add(card_id, name, link)
+
+    def render(self, card_id: int, name: str, link: str) -> Embed:
+        """Fresh embed of the card, header and footer can be set without touching the cache."""
+        template = self._templates.get(card_id)
+        if template is None:
+            self.misses += 1
+            template = self._add(card_id, name, link)
+        else:
+            self.hits += 1
+            self._templates.move_to_end(card_id)
+
+        embed = Embed(
+            title=template.title, url=template.url, color=constants.EMBED_COLOR
+        )
+        embed.set_image(url=template.image_url)
+        return embed
+
+
+card_embeds = CardEmbedCache()
@@ -2,11 +2,12 @@ import discord
 from discord import ui, Interaction
 
 from Actions import create_draft_act
+from Messages.base_view import BaseView
 from Messages import show_all_drafts_msg, explain_msg
 from constants import EMBED_COLOR
 
 
-class View(ui.View):
+class View(BaseView):
     def __init__(self, embed: discord.Embed):
         self.embed = embed
         self.response = None
@@ -23,6 +24,8 @@ class View(ui.View):
     async def show_all_drafts(self, interaction: Interaction, _):
         message = await show_all_drafts_msg.get_message()
         await interaction.response.send_message(**message)
+        if "view" in message:
+            message["view"].response = await interaction.original_response()
 
     # button to create a draft
     @ui.button(label="Create Draft \N{RAISED HAND}", style=discord.ButtonStyle.primary)
@@ -9,6 +9,7 @@ def settings_field(settings: Settings):
             f"packs per player: **{settings.packs_per_player}**\n"
             f"cards per pack: **{settings.cards_per_pack}**\n"
             f"time per pick: **{settings.seconds_per_pick}** seconds\n"
+            f"picking: **{settings.pick_mode}**\n"
         ),
     }
 
@@ -1,11 +1,18 @@
+import asyncio
+import logging
+
 import discord
 from discord import ui, Interaction
 
 import Actions.join_draft_act
+from Messages.base_view import BaseView
 from Messages.message_utils import settings_field, players_field
 from Database.Models.draft import Draft
 from constants import EMBED_COLOR
 
+# joins within this window are folded into a single edit of the open draft message
+REFRESH_WINDOW_SECONDS = 2.0
+
 
 class Embed(discord.Embed):
     def __init__(self, interaction: Interaction, draft, **kwargs):
@@ -31,15 +38,60 @@ class Embed(discord.Embed):
         self.add_field(**settings_field(draft.settings))
 
         # players list
+        self.players_field_index = len(self.fields)
         self.add_field(**players_field(draft))
 
+    async def refresh_players(self):
+        """Re-read the participants, title, author and settings are kept as they are."""
+        await self.draft.fetch_related("participants")
+        self.set_field_at(self.players_field_index, **players_field(self.draft))
+
+
+class Refresher:
+    """Coalesces refresh requests for one message, edits it at most once per window."""
+
+    def __init__(self, embed: Embed, window: float = REFRESH_WINDOW_SECONDS):
+        self.embed = embed
+        self.window = window
+        self.message = None
+        self.edits = 0
+        self._dirty = False
+        self._task = None
+
+    def request(self, message: discord.Message):
+        self.message = message
+        self._dirty = True
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
 
-class View(ui.View):
-    def __init__(self, draft: Draft):
+    async def wait(self):
+        if self._task:
+            await self._task
+
+    async def _run(self):
+        try:
+            # requests coming in while editing get their own window afterwards
+            while self._dirty:
+                await asyncio.sleep(self.window)
+                self._dirty = False
+                await self.embed.refresh_players()
+                await self.message.edit(embed=self.embed)
+                self.edits += 1
+        except Exception:
+            logging.exception(
+                f"REFRESH - Could not refresh draft message of {self.embed.draft.name}"
+            )
+        finally:
+            self._task = None
+
+
+class View(BaseView):
+    def __init__(self, draft: Draft, embed: Embed):
         super().__init__()
         url = "https://collectivedeck.codes/brew"
 
         self.draft = draft
+        self.refresher = Refresher(embed)
 
         # Link buttons cannot be made with the decorator
         # Therefore we have to manually create one.
@@ -57,20 +109,19 @@ class View(ui.View):
             await interaction.response.send_message(str(e), ephemeral=True)
             return
 
-        # update the embed
-        await self.draft.fetch_related("participants")
-        new_embed = Embed(interaction, self.draft)
-        await interaction.response.edit_message(embed=new_embed, view=self)
+        await interaction.response.send_message(response, ephemeral=True)
 
-        # await interaction.response.send_message(f"{interaction.user.mention} joined the draft!")
+        # the player list catches up once the burst of joins is over
+        self.refresher.request(interaction.message)
 
 
 async def get_message(draft_name, interaction):
     draft = await Draft.get(name=draft_name).prefetch_related(
         "owner", "participants", "settings"
     )
+    embed = Embed(interaction, draft)
 
     return {
-        "embed": Embed(interaction, draft),
-        "view": View(draft),
+        "embed": embed,
+        "view": View(draft, embed),
     }
@@ -1,104 +1,252 @@
 import asyncio
-from collections import deque
-from typing import List
+import io
+from collections import namedtuple
+from typing import List, Optional
 
 import discord
 from discord import ui, Interaction, Embed
 
 import constants
+from Database import card_catalog
 from Database.Models.pack import Pack
+from Database.Models.draft import PickMode
+from Messages.base_view import BaseView
+from Messages.card_embeds import card_embeds
+from Utils import contact_sheet
 
+# discord limits
+MAX_SELECT_OPTIONS = 25
+MAX_GALLERY_EMBEDS = 10
 
-class View(ui.View):
-    def __init__(self, pack: Pack, embeds: List[Embed]):
-        self._embeds = embeds
-        self._queue = deque(embeds)
-        self._initial = embeds[0]
+SHEET_FILENAME = "pack.jpg"
+
+# a card as the pick views need it, card_id is the row that gets picked
+PackCard = namedtuple("PackCard", ["card_id", "catalog_card_id", "name", "link"])
+
+# a pack rendered ahead of time, see prepare()
+PreparedPack = namedtuple("PreparedPack", ["cards", "sheet"])
+
+
+class PickView(BaseView):
+    """Shared state of the pick views, subclasses add the controls."""
+
+    def __init__(self, cards: List[PackCard], pack_index: str):
+        # embeds are only built for the card that is shown
+        self._cards = cards
+        self._pack_index = pack_index
         self._current_card_index = 0
-        self._len = len(embeds)
+        self._len = len(cards)
         self.response = None
-        self.pack = pack
         self._pick_event = asyncio.Event()
+        # fixed once the pick is made, the next seat's pack is built from it
+        self._picked_index: Optional[int] = None
+        # a contact sheet of the whole pack is attached to the message
+        self.has_sheet = False
 
         super().__init__(timeout=60 * 3)
 
+    def _embed(self, index: int) -> Embed:
+        card = self._cards[index]
+        embed = card_embeds.render(card.catalog_card_id, card.name, card.link)
+        embed.description = f"Pack {self._pack_index} - Card {index + 1}/{self._len}"
+        return embed
+
     @property
     def initial(self) -> Embed:
-        return self._initial
+        return self._embed(0)
 
     @property
     def current_card_index(self) -> int:
         return self._current_card_index
 
+    @property
+    def picked_card(self) -> PackCard:
+        return self._cards[self._pick_index]
+
+    @property
+    def remaining_cards(self) -> List[PackCard]:
+        """What's left of the pack for the next seat once the pick is made."""
+        return [
+            card for index, card in enumerate(self._cards) if index != self._pick_index
+        ]
+
+    @property
+    def _pick_index(self) -> int:
+        if self._picked_index is not None:
+            return self._picked_index
+        return self._current_card_index
+
     @property
     def pick_event(self) -> asyncio.Event:
         return self._pick_event
 
-    async def auto_pick(self):
+    def _make_pick(self, index: int) -> bool:
+        """Fix the picked card and stop the view, False if a card was picked already."""
+        if self._picked_index is not None:
+            return False
+        self._picked_index = index
+        self.stop()
         for child in self.children:
             child.disabled = True
+        self._pick_event.set()
+        return True
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        # clicks that arrive after the pick would change a pack that's already passed on
+        if self._picked_index is not None:
+            await interaction.response.send_message(
+                "You already picked a card from this pack.", ephemeral=True
+            )
+            return False
+        return await super().interaction_check(interaction)
+
+    async def auto_pick(self):
+        # the current card counts as picked, the next round can be prepared
+        if not self._make_pick(self._current_card_index):
+            return
 
-        new_embed = self._queue[0]
+        new_embed = self._embed(self._picked_index)
         new_embed.set_footer(
             text="This card has been picked automatically because you took too long to pick!"
         )
 
-        await self.response.edit(view=self, embed=new_embed)
-
-    @ui.button(emoji="\N{LEFTWARDS BLACK ARROW}")
-    async def previous_embed(self, interaction: Interaction, _):
-        self._queue.rotate(1)
-        self._current_card_index = (self._current_card_index - 1) % self._len
-        await interaction.response.edit_message(embed=self._queue[0])
+        await self.response.edit(view=self, embeds=[new_embed], attachments=[])
 
-    @ui.button(label="Pick this card \N{DIRECT HIT}", style=discord.ButtonStyle.primary)
-    async def pick_card(self, interaction: Interaction, _):
-        try:
-            self._pick_event.set()
-        except ValueError as e:
-            await interaction.response.send_message(str(e), ephemeral=True)
+    async def _pick(self, interaction: Interaction, index: Optional[int] = None):
+        # "you picked this" message, all buttons disabled
+        if not self._make_pick(self._current_card_index if index is None else index):
+            await interaction.response.send_message(
+                "You already picked a card from this pack.", ephemeral=True
+            )
             return
 
-        # update the embed
-        # "you picked this" message, disable all buttons
+        new_embed = self._embed(self._picked_index)
+        new_embed.set_footer(text="You picked this card!")
+        await interaction.response.edit_message(
+            embeds=[new_embed], view=self, attachments=[]
+        )
 
-        self._pick_event.set()
 
-        # disable all buttons
-        for child in self.children:
-            child.disabled = True
+class View(PickView):
+    """One card at a time, paged with arrow buttons."""
 
-        new_embed = self._queue[0]
-        new_embed.set_footer(text="You picked this card!")
-        await interaction.response.edit_message(embed=new_embed, view=self)
+    @ui.button(emoji="\N{LEFTWARDS BLACK ARROW}")
+    async def previous_embed(self, interaction: Interaction, _):
+        self._current_card_index = (self._current_card_index - 1) % self._len
+        await interaction.response.edit_message(
+            embed=self._embed(self._current_card_index)
+        )
 
-        self.stop()
+    @ui.button(label="Pick this card \N{DIRECT HIT}", style=discord.ButtonStyle.primary)
+    async def pick_card(self, interaction: Interaction, _):
+        await self._pick(interaction)
 
     @ui.button(emoji="\N{BLACK RIGHTWARDS ARROW}")
     async def next_embed(self, interaction: Interaction, _):
-        self._queue.rotate(-1)
         self._current_card_index = (self._current_card_index + 1) % self._len
-        await interaction.response.edit_message(embed=self._queue[0])
+        await interaction.response.edit_message(
+            embed=self._embed(self._current_card_index)
+        )
 
 
-async def get_message(pack: Pack, pack_index: str = "1/1"):
-    await pack.fetch_related("cards")
-    cards = await pack.cards
+class MenuView(PickView):
+    """The whole pack at once, a pick is a single select interaction."""
+
+    def __init__(self, cards: List[PackCard], pack_index: str):
+        super().__init__(cards, pack_index)
+        self.card_select.options = [
+            discord.SelectOption(
+                label=card.name[:100], value=str(index), description=f"Card {index + 1}"
+            )
+            for index, card in enumerate(cards)
+        ]
+
+    def gallery(self) -> List[Embed]:
+        """Every card of the pack, as a list of links once the pack is too big for one message."""
+        if self._len <= MAX_GALLERY_EMBEDS and not self.has_sheet:
+            return [self._embed(index) for index in range(self._len)]
 
-    embeds = []
-    for index, card in enumerate(cards):
         embed = Embed(
-            title=card.name,
-            url=card.link,
-            description=f"Pack {pack_index} - Card {index + 1}/{len(cards)}",
+            title=f"Pack {self._pack_index} - {self._len} cards",
+            description="\n".join(
+                f"{index + 1}. [{card.name}]({card.link})"
+                for index, card in enumerate(self._cards)
+            ),
             color=constants.EMBED_COLOR,
         )
-        embed.set_image(url=card.link)
-        embeds.append(embed)
+        if self.has_sheet:
+            embed.set_image(url=f"attachment://{SHEET_FILENAME}")
+        return [embed]
+
+    @ui.select(placeholder="Pick a card \N{DIRECT HIT}")
+    async def card_select(self, interaction: Interaction, select: ui.Select):
+        await self._pick(interaction, int(select.values[0]))
+
 
-    view = View(pack, embeds)
+def _pack_cards(pack: Pack) -> List[PackCard]:
+    return [
+        PackCard(card.id, card.catalog_card_id, card.name, card.link)
+        for card in pack.cards
+    ]
 
-    return {
-        "embed": view.initial,
-        "view": view,
-    }
+
+async def get_pack_cards(pack: Pack) -> List[PackCard]:
+    await pack.fetch_related("cards")
+    await card_catalog.load(pack.cards)
+    return _pack_cards(pack)
+
+
+async def prepare(cards: List[PackCard]) -> PreparedPack:
+    """Do the slow parts of a pick message ahead of time, the message itself is built on send."""
+    for card in cards:
+        card_embeds.warm(card.catalog_card_id, card.name, card.link)
+    sheet = await contact_sheet.get_pack_sheet([card.link for card in cards])
+    return PreparedPack(cards, sheet)
+
+
+async def prepare_packs(pack_ids: List[int]) -> List[PreparedPack]:
+    """Prepared packs in the order of pack_ids, fetched with one query for all cards."""
+    packs = await Pack.filter(id__in=pack_ids).prefetch_related("cards")
+    await card_catalog.load(card for pack in packs for card in pack.cards)
+    packs_by_id = {pack.id: pack for pack in packs}
+
+    return await asyncio.gather(
+        *[prepare(_pack_cards(packs_by_id[pack_id])) for pack_id in pack_ids]
+    )
+
+
+def build_message(
+    prepared: PreparedPack,
+    pack_index: str = "1/1",
+    pick_mode: PickMode = PickMode.BUTTONS,
+) -> dict:
+    cards, sheet = prepared
+
+    # select menus hold at most 25 options, bigger packs fall back to the buttons
+    if pick_mode == PickMode.MENU and len(cards) <= MAX_SELECT_OPTIONS:
+        view = MenuView(cards, pack_index)
+    else:
+        view = View(cards, pack_index)
+    view.has_sheet = sheet is not None
+
+    message = {"view": view}
+    if isinstance(view, MenuView):
+        message["embeds"] = view.gallery()
+    else:
+        message["embed"] = view.initial
+    if sheet:
+        message["file"] = discord.File(io.BytesIO(sheet), filename=SHEET_FILENAME)
+
+    return message
+
+
+async def get_message(
+    pack: Pack,
+    pack_index: str = "1/1",
+    pick_mode: PickMode = PickMode.BUTTONS,
+    prepared: Optional[PreparedPack] = None,
+):
+    if prepared is None:
+        prepared = await prepare(await get_pack_cards(pack))
+
+    return build_message(prepared, pack_index, pick_mode)
@@ -0,0 +1,22 @@
+import discord
+
+from Database.cube_setup import get_latest_cubes
+from constants import EMBED_COLOR
+
+
+async def get_message():
+    cubes = await get_latest_cubes()
+    embed = discord.Embed(title="Saved cubes", color=EMBED_COLOR)
+
+    if not cubes:
+        embed.description = "No saved cubes yet. Save one with `/save_cube`!"
+
+    # discord caps embeds at 25 fields
+    for cube in cubes[:25]:
+        embed.add_field(
+            name=cube.name,
+            value=f"version {cube.version} - {cube.card_count} cards - by <@{cube.owner_discord_id}>",
+            inline=False,
+        )
+
+    return {"embed": embed}
@@ -1,21 +1,75 @@
+from math import ceil
+from typing import Optional
+
 import discord
+from discord import ui, Interaction
 
-from Database.Models.draft import Draft
+from Database.Models.draft import DraftStatus
+from Database.draft_listing import get_draft_summaries
+from Messages.base_view import BaseView
 from constants import EMBED_COLOR
 
+# well below discord's 25 fields per embed, keeps a page readable
+DRAFTS_PER_PAGE = 10
+
+
+class View(BaseView):
+    def __init__(self, status: Optional[DraftStatus], page: int, page_count: int):
+        self.status = status
+        self.page = page
+        self.response = None
+        super().__init__()
+
+        self.previous_page.disabled = page <= 0
+        self.next_page.disabled = page >= page_count - 1
+
+    async def _show_page(self, interaction: Interaction, page: int):
+        message = await get_message(self.status, page)
+        if "view" in message:
+            message["view"].response = self.response
+        self.stop()
+        await interaction.response.edit_message(
+            embed=message["embed"], view=message.get("view")
+        )
+
+    @ui.button(
+        label="\N{BLACK LEFT-POINTING TRIANGLE}", style=discord.ButtonStyle.secondary
+    )
+    async def previous_page(self, interaction: Interaction, _):
+        await self._show_page(interaction, self.page - 1)
+
+    @ui.button(
+        label="\N{BLACK RIGHT-POINTING TRIANGLE}", style=discord.ButtonStyle.secondary
+    )
+    async def next_page(self, interaction: Interaction, _):
+        await self._show_page(interaction, self.page + 1)
+
+    async def on_timeout(self):
+        if self.response:
+            await self.response.edit(view=None)
 
-async def get_message():
-    drafts = await Draft.all()
-    embed = discord.Embed(title="All drafts", color=EMBED_COLOR)
+
+async def get_message(status: Optional[DraftStatus] = None, page: int = 0):
+    drafts = await get_draft_summaries(status)
+    page_count = max(1, ceil(len(drafts) / DRAFTS_PER_PAGE))
+    # the listing may have shrunk since the page was opened
+    page = min(max(page, 0), page_count - 1)
+
+    title = f"{status.value.capitalize()} drafts" if status else "All drafts"
+    embed = discord.Embed(title=title, color=EMBED_COLOR)
 
     if not drafts:
         embed.description = "No drafts found. Create one with `/create_draft`!"
 
-    for draft in drafts:
+    for draft in drafts[page * DRAFTS_PER_PAGE : (page + 1) * DRAFTS_PER_PAGE]:
         embed.add_field(
             name=draft.name,
-            value=f"Status: {draft.status}",
+            value=f"Status: {draft.status} - {draft.participant_count}/{draft.max_participants} players",
             inline=False,
         )
 
+    if page_count > 1:
+        embed.set_footer(text=f"Page {page + 1}/{page_count} - {len(drafts)} drafts")
+        return {"embed": embed, "view": View(status, page, page_count)}
+
     return {"embed": embed}
@@ -0,0 +1,83 @@
+# allocation benchmark for the pick messages of a full draft, not collected by pytest
+# run with: python -m Tests.benchmark_player_pick [players] [packs_per_player] [cards_per_pack]
+import asyncio
+import sys
+import tracemalloc
+
+from discord import Embed
+
+import constants
+from Messages.card_embeds import card_embeds
+from Messages.player_pick_msg import PackCard, View
+
+
+def _pack(size: int, offset: int):
+    return [
+        PackCard(
+            offset + i,
+            offset + i,
+            f"Card {offset + i}",
+            f"https://files.collective.gg/p/cards/{offset + i}-s.png",
+        )
+        for i in range(size)
+    ]
+
+
+def _eager(cards, pack_index):
+    # what get_message used to do, the view plus one embed per card up front
+    view = View(cards, pack_index)
+    embeds = []
+    for index, (_, _, name, link) in enumerate(cards):
+        embed = Embed(
+            title=name,
+            url=link,
+            description=f"Pack {pack_index} - Card {index + 1}/{len(cards)}",
+            color=constants.EMBED_COLOR,
+        )
+        embed.set_image(url=link)
+        embeds.append(embed)
+    return view, embeds
+
+
+def _lazy(cards, pack_index):
+    view = View(cards, pack_index)
+    return view, view.initial
+
+
+def _measure(render, players: int, packs_per_player: int, cards_per_pack: int):
+    tracemalloc.start()
+    rounds = 0
+    for pack_round in range(packs_per_player):
+        for pick in range(cards_per_pack):
+            # every round's messages are alive at the same time until everyone has picked
+            messages = [
+                render(
+                    _pack(cards_per_pack - pick, seat * cards_per_pack),
+                    f"{pack_round + 1}/{packs_per_player}",
+                )
+                for seat in range(players)
+            ]
+            del messages
+            rounds += 1
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rounds, peak
+
+
+async def main(players: int = 10, packs_per_player: int = 3, cards_per_pack: int = 15):
+    for label, render in (("eager", _eager), ("lazy", _lazy)):
+        rounds, peak = _measure(render, players, packs_per_player, cards_per_pack)
+        print(f"{label:>5}: {rounds} rounds, peak {peak / 1024:.1f} KiB")
+
+    print(
+        f"card embed cache: {len(card_embeds)} templates, hit rate {card_embeds.hit_rate:.0%}"
+    )
+
+    # the first round has the largest packs
+    print(
+        f"embeds in the first round: eager {players * cards_per_pack}, lazy {players}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:])))
@@ -0,0 +1,73 @@
+import os
+
+import discord
+
+from Utils import banlist as banlist_module
+from Utils.banlist import BANNED_MESSAGE, Banlist
+
+
+async def test_bans_are_kept_in_memory_and_on_disk(tmp_path):
+    path = str(tmp_path / "Data" / "banlist.txt")
+    banlist = Banlist(path)
+    banlist.load()
+    assert len(banlist) == 0, "A missing file is an empty banlist"
+
+    assert await banlist.ban(123)
+    assert await banlist.ban(456)
+    assert not await banlist.ban(123), "Banning twice changes nothing"
+    assert 123 in banlist and 789 not in banlist
+
+    assert await banlist.unban(123)
+    assert not await banlist.unban(123)
+    with open(path) as file:
+        assert file.read() == "456\n"
+
+    reloaded = Banlist(path)
+    reloaded.load()
+    assert 456 in reloaded and 123 not in reloaded
+
+
+async def test_banlist_is_reloaded_after_manual_edits(tmp_path):
+    path = tmp_path / "banlist.txt"
+    path.write_text("111\n")
+    banlist = Banlist(str(path))
+    banlist.load()
+
+    banlist.reload_if_changed()
+    assert 111 in banlist
+
+    path.write_text("111\n222\n\n")
+    # make sure the edit is visible even on coarse filesystem timestamps
+    mtime = os.stat(path).st_mtime + 1
+    os.utime(path, (mtime, mtime))
+
+    banlist.reload_if_changed()
+    assert 222 in banlist
+
+
+class FakeInteraction:
+    def __init__(self, user_id, interaction_type):
+        self.user = discord.Object(user_id)
+        self.type = interaction_type
+        self.response = self
+        self.sent = []
+
+    async def send_message(self, content, **kwargs):
+        self.sent.append(content)
+
+
+async def test_banned_users_are_turned_away(tmp_path, monkeypatch):
+    banlist = Banlist(str(tmp_path / "banlist.txt"))
+    await banlist.ban(123)
+    monkeypatch.setattr(banlist_module, "banlist", banlist)
+
+    click = FakeInteraction(456, discord.InteractionType.component)
+    assert await banlist_module.allows(click) and not click.sent
+
+    click = FakeInteraction(123, discord.InteractionType.component)
+    assert not await banlist_module.allows(click)
+    assert click.sent == [BANNED_MESSAGE]
+
+    typing = FakeInteraction(123, discord.InteractionType.autocomplete)
+    assert not await banlist_module.allows(typing)
+    assert not typing.sent, "Autocomplete can't be answered with a message"
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from Tests.test_constants import INPUT_FILE_LINES
+from Utils.cardpool_import import CardpoolEntry, EntryKind, card_count, parse_cardpool
+
+UID = "9803f3b0-2b61-11eb-a0f9-41a57384b22e"
+LINK = f"https://files.collective.gg/p/cards/{UID}-s.png"
+
+
+def test_can_parse_plain_lines():
+    entries = parse_cardpool("\n".join(INPUT_FILE_LINES))
+
+    assert len(entries) == len(INPUT_FILE_LINES)
+    assert [entry.kind for entry in entries] == [EntryKind.LINK] * 3 + [
+        EntryKind.NAME
+    ] * 3 + [EntryKind.UID] * 3
+    assert entries[0].key == "9803f3b0-2b61-11eb-a0f9-41a57384b22e"
+    assert entries[3] == CardpoolEntry(EntryKind.NAME, "Red Leaf Warshaman", 1)
+
+
+def test_can_parse_counts_and_dedupe():
+    text = f"""
+# comment
+2 Red Leaf Warshaman
+1x Red Leaf Warshaman
+Wanda Walsh, CPA
+{LINK}
+3 {UID}
+"""
+    entries = parse_cardpool(text)
+
+    assert entries == [
+        CardpoolEntry(EntryKind.NAME, "Red Leaf Warshaman", 3),
+        CardpoolEntry(EntryKind.NAME, "Wanda Walsh, CPA", 1),
+        CardpoolEntry(EntryKind.LINK, UID, 4),
+    ], "Links and uids of the same card should share one entry"
+    assert card_count(entries) == 8
+
+
+def test_can_parse_csv():
+    text = f'Name,Count\nRed Leaf Warshaman,2\n"Wanda Walsh, CPA",1\n{LINK},\n'
+    entries = parse_cardpool(text, "cube.csv")
+
+    assert entries == [
+        CardpoolEntry(EntryKind.NAME, "Red Leaf Warshaman", 2),
+        CardpoolEntry(EntryKind.NAME, "Wanda Walsh, CPA", 1),
+        CardpoolEntry(EntryKind.LINK, UID, 1),
+    ]
+
+
+def test_can_parse_json():
+    text = json.dumps(
+        {
+            "cards": [
+                "Red Leaf Warshaman",
+                {"name": "Huntsman's Return", "count": 2},
+                {"uid": UID, "name": "Wanda Walsh, CPA"},
+            ]
+        }
+    )
+    entries = parse_cardpool(text)
+
+    assert entries == [
+        CardpoolEntry(EntryKind.NAME, "Red Leaf Warshaman", 1),
+        CardpoolEntry(EntryKind.NAME, "Huntsman's Return", 2),
+        CardpoolEntry(EntryKind.UID, UID, 1),
+    ]
+
+
+def test_zero_counts_are_rejected():
+    with pytest.raises(ValueError):
+        parse_cardpool(json.dumps([{"name": "Red Leaf Warshaman", "count": 0}]))
+
+    with pytest.raises(ValueError):
+        parse_cardpool("name,count\nRed Leaf Warshaman,0", "cube.csv")
+
+    with pytest.raises(ValueError):
+        parse_cardpool("0 Red Leaf Warshaman")
+
+
+def test_bracketed_lines_are_not_json():
+    entries = parse_cardpool("[Promo] Red Leaf Warshaman\nWanda Walsh, CPA")
+
+    assert entries == [
+        CardpoolEntry(EntryKind.NAME, "[Promo] Red Leaf Warshaman", 1),
+        CardpoolEntry(EntryKind.NAME, "Wanda Walsh, CPA", 1),
+    ]
+
+
+def test_rejects_broken_files():
+    with pytest.raises(ValueError):
+        parse_cardpool("[not json", "cube.json")
+
+    with pytest.raises(ValueError):
+        parse_cardpool("name,count\nRed Leaf Warshaman,lots", "cube.csv")
@@ -0,0 +1,72 @@
+import discord
+from discord import app_commands
+
+from Utils.command_sync import CommandSync
+
+GUILDS = [discord.Object(1), discord.Object(2)]
+
+
+def _tree(monkeypatch, synced):
+    tree = app_commands.CommandTree(discord.Client(intents=discord.Intents.none()))
+
+    @tree.command(name="show_all_drafts", description="Show all drafts")
+    async def show_all_drafts(interaction: discord.Interaction):
+        pass
+
+    async def sync(guild=None):
+        synced.append(guild.id)
+
+    monkeypatch.setattr(tree, "sync", sync)
+    return tree
+
+
+async def test_unchanged_commands_are_not_synced(tmp_path, monkeypatch):
+    path = str(tmp_path / "command_sync.json")
+    synced = []
+    tree = _tree(monkeypatch, synced)
+
+    done, skipped = await CommandSync(path).sync(tree, GUILDS)
+    assert (len(done), len(skipped)) == (2, 0)
+
+    # a restart with the same commands
+    done, skipped = await CommandSync(path).sync(_tree(monkeypatch, synced), GUILDS)
+    assert (done, skipped) == ([], GUILDS)
+    assert synced == [1, 2]
+
+    @tree.command(name="show_draft", description="Show a draft")
+    async def show_draft(interaction: discord.Interaction, draft_name: str):
+        pass
+
+    state = CommandSync(path)
+    done, _ = await state.sync(tree, GUILDS[:1])
+    assert done == GUILDS[:1], "A new command should be synced"
+    assert synced == [1, 2, 1]
+
+    state.forget(GUILDS[0])
+    done, _ = await state.sync(tree, GUILDS[:1])
+    assert done == GUILDS[:1], "Forgotten guilds are synced again"
+
+    done, _ = await state.sync(tree, GUILDS[1:], force=True)
+    assert done == GUILDS[1:]
+
+
+async def test_failed_guilds_are_synced_again(tmp_path, monkeypatch):
+    path = str(tmp_path / "command_sync.json")
+    synced = []
+    tree = _tree(monkeypatch, synced)
+
+    class Response:
+        status = 403
+        reason = "Forbidden"
+
+    async def sync(guild=None):
+        if guild.id == 1:
+            raise discord.Forbidden(Response(), "Missing Access")
+        synced.append(guild.id)
+
+    monkeypatch.setattr(tree, "sync", sync)
+    done, skipped = await CommandSync(path).sync(tree, GUILDS)
+    assert (done, skipped) == (GUILDS[1:], []), "Other guilds should still be synced"
+
+    done, skipped = await CommandSync(path).sync(_tree(monkeypatch, synced), GUILDS)
+    assert (done, skipped) == (GUILDS[:1], GUILDS[1:]), "The failed guild is retried"
@@ -0,0 +1,41 @@
+from Database.Models.draft import DraftStatus
+from Database.draft_names import DraftNameIndex
+
+PREPARING = DraftStatus.PREPARING
+RUNNING = DraftStatus.RUNNING
+
+
+def _index():
+    index = DraftNameIndex()
+    index.add(1, "Cube Night", PREPARING.value)
+    index.add(2, "cube classics", RUNNING.value)
+    index.add(3, "Cubist", PREPARING.value)
+    index.add(4, "Pauper Cube", PREPARING.value)
+    return index
+
+
+def test_names_are_suggested_by_prefix():
+    index = _index()
+
+    assert index.suggest("cub") == ["cube classics", "Cube Night", "Cubist"]
+    assert index.suggest("CUBE ") == ["cube classics", "Cube Night"]
+    assert index.suggest("") == ["cube classics", "Cube Night", "Cubist", "Pauper Cube"]
+    assert index.suggest("cube", limit=1) == ["cube classics"]
+    assert index.suggest("x") == []
+
+
+def test_suggestions_follow_status_changes():
+    index = _index()
+
+    assert index.suggest("cub", [PREPARING]) == ["Cube Night", "Cubist"]
+    assert index.suggest("cub", [RUNNING]) == ["cube classics"]
+
+    index.set_status(1, RUNNING.value)
+    index.remove(3)
+    index.remove(3)
+    assert index.suggest("cub", [PREPARING]) == []
+    assert index.suggest("cub", [PREPARING, RUNNING]) == ["cube classics", "Cube Night"]
+
+    index.add(4, "Peasant Cube", PREPARING.value)
+    assert index.suggest("p") == ["Peasant Cube"], "Renamed draft replaces its old name"
+    assert len(index) == 3
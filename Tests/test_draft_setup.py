@@ -1,19 +1,32 @@
 import asyncio
 import logging
 import platform
+import re
+from datetime import timedelta
 
 import pytest
+from tortoise import timezone
 
+import Actions.edit_cardpool_act
 import Actions.join_draft_act
 import Actions.leave_draft_act
 import Actions.start_draft_act
-from Database import database
+from Cogs.draft_cog import DraftCog
+from Database import card_catalog, database, draft_listing, draft_state
+from Database.Models.catalog_card import CatalogCard
 from Database.Models.card import Card
 from Database.Models.draft import PickType, DraftStatus, Draft
+from Database.Models.pack import Pack
 from Database.Models.settings import Settings
 from Database.Models.user import User
+from Database.cube_setup import add_cube_to_draft, get_cube, save_cube
+from Database.deck_export import DeckFormat, get_deck_lists
+from Database.draft_archive import archive_drafts, get_archived_drafts
+from Database.draft_cleanup import purge_drafts, purge_expired_drafts
+from Database.draft_names import draft_names
 from Database.draft_setup import (
     create_draft,
+    finish_import,
     get_cards_from_data,
     get_or_create_user_by_discord_id,
 )
@@ -25,7 +38,12 @@ from Tests.test_constants import (
     INPUT_FILE_LINES_LONG,
     CARDS_LIST_LONG,
 )
-from Utils.collective_api import get_card_data
+from Messages import open_draft_msg, player_pick_msg, show_all_drafts_msg
+from Utils import cardpool_pipeline
+from Utils.cardpool_import import EntryKind, parse_cardpool
+from Utils.collective_api import ApiError, uid_regex
+from Utils.passing_schedule import PassingSchedule
+from constants import PREPARING_DRAFT_TTL
 
 if platform.system() == "Windows":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -37,13 +55,6 @@ if platform.system() == "Windows":
 # TODO: test for gibberish strings, probably covered by above
 
 
-@pytest.mark.skip
-async def test_can_get_cardpool():
-    """Test if we can get a cardpool from the collective api."""
-    result = await get_card_data(INPUT_FILE_LINES)
-    assert result == OUTPUT_CARD_OBJECTS
-
-
 @pytest.fixture(autouse=True)
 async def initialize_database():
     """Create a database connection for testing."""
@@ -57,6 +68,72 @@ async def initialize_database():
     await database.Tortoise._drop_databases()
 
 
+# @pytest.mark.skip
+async def test_schema_is_only_generated_when_it_changed(monkeypatch):
+    generated = []
+    generate_schemas = database.Tortoise.generate_schemas
+
+    async def count_generations(*args, **kwargs):
+        generated.append(True)
+        return await generate_schemas(*args, **kwargs)
+
+    monkeypatch.setattr(database.Tortoise, "generate_schemas", count_generations)
+
+    # restart on the database the fixture created
+    await database.Tortoise.close_connections()
+    await database.init("Tests/test_database.db")
+    assert generated == [], "An up to date schema shouldn't be generated again"
+
+    # a database from before the pick modes, with a timestamp an earlier first migration wrote
+    old_draft = await create_draft(**DRAFT_OPTIONS_TWO)
+    connection = database.Tortoise.get_connection("default")
+    await connection.execute_script(
+        f"""UPDATE "draft" SET "expires_at" = '2030-01-02T03:04:05+00:00' WHERE "id" = {old_draft.id}"""
+    )
+    await connection.execute_script("PRAGMA user_version = 5")
+    await connection.execute_script('ALTER TABLE "settings" DROP COLUMN "pick_mode"')
+    await database.Tortoise.close_connections()
+    await database.init("Tests/test_database.db")
+    assert generated == [True], "An older schema is migrated and generated"
+
+    draft = await create_draft(**DRAFT_OPTIONS)
+    await draft.fetch_related("settings")
+    assert draft.settings.pick_mode == "buttons"
+    await draft.delete()
+
+    _, rows = await database.Tortoise.get_connection("default").execute_query(
+        f'SELECT "expires_at" FROM "draft" WHERE "id" = {old_draft.id}'
+    )
+    assert rows[0][0] == "2030-01-02 03:04:05+00:00", "Timestamps use tortoise's format"
+    await old_draft.delete()
+
+
+# @pytest.mark.skip
+async def test_migrated_expired_drafts_are_purged():
+    draft = await create_draft(**DRAFT_OPTIONS)
+    fresh_draft = await create_draft(**DRAFT_OPTIONS_TWO)
+
+    # expiry compares as text, migrated timestamps have to sort like the ones tortoise writes
+    connection = database.Tortoise.get_connection("default")
+    await connection.execute_script(
+        database.MIGRATIONS[1][-2]
+        .replace(f"+{PREPARING_DRAFT_TTL.days} days", "-1 hours")
+        .replace("'preparing'", f"'preparing' AND \"id\" = {draft.id}")
+    )
+    _, rows = await connection.execute_query(
+        f'SELECT "expires_at" FROM "draft" WHERE "id" = {draft.id}'
+    )
+    assert rows[0][0][10] == " ", "Migrated timestamps use tortoise's format"
+
+    await purge_expired_drafts()
+    assert (
+        await Draft.filter(id=draft.id).count() == 0
+    ), "Expired draft should be purged"
+    assert await Draft.filter(id=fresh_draft.id).count() == 1
+
+    await fresh_draft.delete()
+
+
 # @pytest.mark.skip
 async def test_can_create_draft():
 
@@ -217,4 +294,616 @@ async def test_can_start_draft():
         len(pack.cards) == draft.settings.cards_per_pack for pack in draft.packs
     ), "Packs should have cards"
 
+    schedule = PassingSchedule.from_json(draft.schedule)
+    assert sorted(schedule.seating) == sorted(p.id for p in draft.participants)
+    assert schedule.total_rounds == (
+        DRAFT_OPTIONS["packs_per_player"] * DRAFT_OPTIONS["cards_per_pack"]
+    ), "Every pack is picked empty, regardless of the number of players"
+    assert sorted(
+        pack_id
+        for draft_round in range(0, schedule.total_rounds, schedule.cards_per_pack)
+        for pack_id in schedule.packs_for(draft_round)
+    ) == sorted(pack.id for pack in draft.packs), "Every pack is opened once"
+
+    other_draft = await create_draft(**DRAFT_OPTIONS_TWO)
+    with pytest.raises(ValueError):
+        await Actions.join_draft_act.join_draft(
+            other_draft.name, participants[1].discord_id
+        ), "Seated players can't leave a running draft by joining another"
+    assert await User.filter(participates_in_draft=draft).count() == len(participants)
+
+    await other_draft.delete()
+    await draft.delete()
+
+
+# @pytest.mark.skip
+async def test_can_purge_drafts():
+    draft1 = await create_draft(**DRAFT_OPTIONS)
+    draft2 = await create_draft(**DRAFT_OPTIONS_TWO)
+
+    await get_cards_from_data(CARDS_LIST_LONG, draft1)
+    await get_cards_from_data(OUTPUT_CARD_OBJECTS, draft2)
+
+    user_ids = [DRAFT_OPTIONS["owner_discord_id"], 456, 789]
+    for user_id in user_ids:
+        await Actions.join_draft_act.join_draft(draft1.name, user_id)
+    await Actions.start_draft_act.start_draft(draft1.name, user_ids[0], 123)
+
+    # pretend the first participant already picked and submitted
+    user = await User.get(discord_id=user_ids[0])
+    await user.deck.add(*(await Card.filter(draft=draft1).limit(3)))
+    user.deck_string = "1 Some Card"
+    await user.save()
+
+    await purge_drafts([draft1.id])
+
+    assert await Draft.get_or_none(id=draft1.id) is None, "Draft should be deleted"
+    assert len(await Card.filter(draft_id=draft1.id)) == 0, "Cards should be deleted"
+    assert len(await Pack.filter(draft_id=draft1.id)) == 0, "Packs should be deleted"
+    assert (
+        await Settings.get_or_none(draft_id=draft1.id) is None
+    ), "Settings should be deleted"
+
+    user = await User.get(discord_id=user_ids[0])
+    assert user.deck_string is None, "Deck string should be cleared"
+    assert user.participates_in_draft_id is None, "User should have left the draft"
+    assert len(await user.deck.all()) == 0, "Deck should be empty"
+
+    assert len(await Card.filter(draft=draft2)) == len(
+        OUTPUT_CARD_OBJECTS
+    ), "Other drafts should not be touched"
+
+    await draft2.delete()
+
+
+# @pytest.mark.skip
+async def test_expired_drafts_are_purged():
+    draft1 = await create_draft(**DRAFT_OPTIONS)
+    draft2 = await create_draft(**DRAFT_OPTIONS_TWO)
+
+    assert draft1.created_at is not None, "Creation should be stamped"
+    assert draft1.expires_at > timezone.now(), "New drafts should expire later"
+
+    draft1.mark_finished()
+    draft1.expires_at = timezone.now() - timedelta(minutes=1)
+    await draft1.save()
+
+    await purge_expired_drafts()
+
+    assert await Draft.get_or_none(id=draft1.id) is None, "Expired draft is deleted"
+    assert await Draft.get_or_none(id=draft2.id) is not None, "Other draft is kept"
+
+    await draft2.delete()
+
+
+# @pytest.mark.skip
+async def test_can_list_drafts():
+    draft_listing.invalidate()
+    draft1 = await create_draft(**DRAFT_OPTIONS)
+    await Actions.join_draft_act.join_draft(draft1.name, 123)
+    await Actions.join_draft_act.join_draft(draft1.name, 456)
+
+    for i in range(25):
+        await Draft.create(
+            name=f"Listed Draft {i}",
+            description="",
+            max_participants=8,
+            status=DraftStatus.RUNNING.value,
+        )
+    draft_listing.invalidate()
+
+    summaries = await draft_listing.get_draft_summaries()
+    assert len(summaries) == 26, "Every draft should be listed"
+    assert summaries[-1] == (
+        draft1.name,
+        DraftStatus.PREPARING.value,
+        2,
+        draft1.max_participants,
+    ), "Participants should be counted, oldest draft last"
+
+    running = await draft_listing.get_draft_summaries(DraftStatus.RUNNING)
+    assert len(running) == 25, "Should filter by status"
+
+    assert (
+        await draft_listing.get_draft_summaries() is summaries
+    ), "Listing should be cached"
+    await Actions.leave_draft_act.leave_draft(draft1.name, 123)
+    summaries = await draft_listing.get_draft_summaries()
+    assert summaries[-1].participant_count == 1, "Leaving should refresh the listing"
+
+    message = await show_all_drafts_msg.get_message(DraftStatus.RUNNING, page=2)
+    assert len(message["embed"].fields) == 5, "Last page holds the remaining drafts"
+    assert message["view"].next_page.disabled, "Can't page past the end"
+    assert not message["view"].previous_page.disabled, "Can page back"
+
+    message = await show_all_drafts_msg.get_message(DraftStatus.PREPARING)
+    assert "view" not in message, "A single page needs no buttons"
+
+    await Draft.filter(name__startswith="Listed Draft").delete()
+    await draft1.delete()
+
+
+# @pytest.mark.skip
+async def test_importing_draft_is_hidden_until_imported():
+    draft_listing.invalidate()
+    await draft_names.ensure_loaded()
+    draft = await create_draft(**DRAFT_OPTIONS, status=DraftStatus.IMPORTING)
+
+    assert draft.name not in [
+        summary.name for summary in await draft_listing.get_draft_summaries()
+    ], "An importing draft should not be listed"
+    assert draft.name not in draft_names.suggest(draft.name), "Nor suggested"
+    with pytest.raises(ValueError, match="still loading"):
+        await Actions.join_draft_act.join_draft(draft.name, 123)
+    with pytest.raises(ValueError, match="still loading"):
+        await Actions.start_draft_act.start_draft(
+            draft.name, DRAFT_OPTIONS["owner_discord_id"], 1
+        )
+
+    await get_cards_from_data(CARDS_LIST_LONG, draft)
+    await finish_import(draft)
+
+    assert draft.name in [
+        summary.name for summary in await draft_listing.get_draft_summaries()
+    ]
+    assert draft.name in draft_names.suggest(draft.name)
+    await Actions.join_draft_act.join_draft(draft.name, 123)
+    assert (await Draft.get(id=draft.id)).status == DraftStatus.PREPARING.value
+
+    await draft.delete()
+
+
+# @pytest.mark.skip
+async def test_can_archive_draft():
+    draft = await create_draft(**DRAFT_OPTIONS)
+    await get_cards_from_data(CARDS_LIST_LONG, draft)
+
+    user_ids = [DRAFT_OPTIONS["owner_discord_id"], 456]
+    for user_id in user_ids:
+        await Actions.join_draft_act.join_draft(draft.name, user_id)
+    await Actions.start_draft_act.start_draft(draft.name, user_ids[0], 123)
+
+    user = await User.get(discord_id=user_ids[1])
+    picks = await Card.filter(draft=draft).order_by("id").limit(2)
+    await card_catalog.load(picks)
+    await user.deck.add(*picks)
+    user.deck_string = "1 Some Card"
+    await user.save()
+
+    draft = await Draft.get(id=draft.id)
+    # any seating the draft was played with, not one derived from the participants
+    draft.schedule["seating"].reverse()
+    seated = {
+        user.id: user.discord_id for user in await User.filter(discord_id__in=user_ids)
+    }
+    seating = [seated[user_id] for user_id in draft.schedule["seating"]]
+    draft.mark_finished()
+    await draft.save()
+
+    await archive_drafts([draft.id])
+    await purge_drafts([draft.id])
+
+    records = await get_archived_drafts(DRAFT_OPTIONS["name"])
+    assert len(records) == 1, "Should find the archived draft by name"
+
+    record = records[0]
+    assert record["settings"]["cards_per_pack"] == DRAFT_OPTIONS["cards_per_pack"]
+    assert (
+        record["seating"] == seating
+    ), "Seats should follow the draft's stored seating"
+    assert record["picks"][str(user_ids[1])] == [
+        [card.name, card.link] for card in picks
+    ]
+    assert record["decks"][str(user_ids[1])] == "1 Some Card"
+    assert record["decks"][str(user_ids[0])] is None
+
+    assert await get_archived_drafts("non-existant-draft") == []
+
+
+# @pytest.mark.skip
+async def test_drafts_share_catalog_cards():
+    draft1 = await create_draft(**DRAFT_OPTIONS)
+    draft2 = await create_draft(**DRAFT_OPTIONS_TWO)
+
+    cards1 = await get_cards_from_data(OUTPUT_CARD_OBJECTS, draft1)
+    catalog_size = await CatalogCard.all().count()
+    cards2 = await get_cards_from_data(OUTPUT_CARD_OBJECTS, draft2)
+
+    assert catalog_size == len(OUTPUT_CARD_OBJECTS)
+    assert (
+        await CatalogCard.all().count() == catalog_size
+    ), "Repeated cards should not grow the catalog"
+    assert [card.catalog_card_id for card in cards1] == [
+        card.catalog_card_id for card in cards2
+    ]
+    assert [{"name": card.name, "link": card.link} for card in cards2] == (
+        OUTPUT_CARD_OBJECTS
+    )
+
+    await draft1.delete()
+    assert len(await Card.filter(draft=draft2)) == len(
+        OUTPUT_CARD_OBJECTS
+    ), "Deleting a draft should keep other drafts' cards"
+    assert await CatalogCard.all().count() == catalog_size, "Catalog should be kept"
+
+    await draft2.delete()
+
+
+# @pytest.mark.skip
+async def test_loaded_cards_survive_catalog_eviction(monkeypatch):
+    monkeypatch.setattr(card_catalog, "CATALOG_CACHE_SIZE", 2)
+    draft1 = await create_draft(**DRAFT_OPTIONS)
+    draft2 = await create_draft(**DRAFT_OPTIONS_TWO)
+
+    # both imports at once, each gets back exactly its own cards
+    cards1, cards2 = await asyncio.gather(
+        get_cards_from_data(CARDS_LIST_LONG, draft1),
+        get_cards_from_data(OUTPUT_CARD_OBJECTS, draft2),
+    )
+    assert [card.link for card in cards1] == [card["link"] for card in CARDS_LIST_LONG]
+    assert [card.link for card in cards2] == [
+        card["link"] for card in OUTPUT_CARD_OBJECTS
+    ]
+
+    cards = await Card.filter(draft=draft1).order_by("id")
+    await card_catalog.load(cards)
+    assert [card.name for card in cards] == [card["name"] for card in CARDS_LIST_LONG]
+
+    await draft1.delete()
+    await draft2.delete()
+
+
+# @pytest.mark.skip
+async def test_can_create_draft_from_saved_cube():
+    owner_id = DRAFT_OPTIONS["owner_discord_id"]
+
+    cube = await save_cube("Test Cube", owner_id, OUTPUT_CARD_OBJECTS)
+    assert cube.version == 1
+
+    same_cube = await save_cube("Test Cube", owner_id, OUTPUT_CARD_OBJECTS[::-1])
+    assert same_cube.id == cube.id, "Same cards should not add a version"
+
+    new_cube = await save_cube("Test Cube", owner_id, CARDS_LIST_LONG)
+    assert new_cube.version == 2, "Changed cards should add a version"
+
+    with pytest.raises(ValueError):
+        await save_cube("Test Cube", 123, OUTPUT_CARD_OBJECTS)
+
+    with pytest.raises(ValueError):
+        await get_cube("non-existant-cube")
+
+    draft = await create_draft(**DRAFT_OPTIONS)
+    cube = await get_cube("Test Cube")
+    assert cube.id == new_cube.id, "Should pick the newest version"
+
+    assert await add_cube_to_draft(cube, draft) == len(CARDS_LIST_LONG)
+
+    cards = await Card.filter(draft=draft).order_by("id")
+    await card_catalog.load(cards)
+    assert sorted(card.link for card in cards) == sorted(
+        card["link"] for card in CARDS_LIST_LONG
+    )
+
+    await draft.delete()
+
+
+async def _resolve_offline(session, entry, public_cards):
+    """Stand-in for the api lookup, links resolve to themselves."""
+    await asyncio.sleep(0)
+    if entry.kind == EntryKind.NAME:
+        raise ApiError(f"Could not find card in public list: {entry.key}")
+    return {"name": "Offline Card", "link": entry.key}
+
+
+# @pytest.mark.skip
+async def test_can_stream_cardpool_into_draft(monkeypatch):
+    async def no_public_cards(session):
+        return {}
+
+    monkeypatch.setattr(cardpool_pipeline, "get_public_cards", no_public_cards)
+    monkeypatch.setattr(cardpool_pipeline, "resolve_entry", _resolve_offline)
+    monkeypatch.setattr(cardpool_pipeline, "INSERT_BATCH_SIZE", 7)
+
+    draft = await create_draft(**DRAFT_OPTIONS)
+    lines = [card["link"] for card in CARDS_LIST_LONG]
+    entries = parse_cardpool("\n".join(lines + ["", "2 " + lines[0]]))
+    total = len(lines) + 2
+
+    reports = []
+
+    async def on_progress(progress):
+        reports.append((progress.resolved, progress.inserted))
+
+    inserted = await cardpool_pipeline.import_cardpool(
+        entries, draft, on_progress=on_progress
+    )
+
+    assert inserted == total, "Counted copies should be expanded"
+    assert len(await Card.filter(draft=draft)) == total
+    assert reports[-1] == (total, total), "Should report completion"
+
+    with pytest.raises(ApiError):
+        await cardpool_pipeline.import_cardpool(
+            entries + parse_cardpool("gibberish"), draft
+        )
+
+    await draft.delete()
+
+
+# @pytest.mark.skip
+async def test_can_edit_cardpool(monkeypatch):
+    lookups = []
+
+    async def get_entries_offline(entries):
+        lookups.extend(entries)
+        cards = {card["name"]: card for card in CARDS_LIST_LONG}
+        try:
+            return [cards[entry.key] for entry in entries for _ in range(entry.count)]
+        except KeyError as e:
+            raise ApiError(f"Could not find card in public list: {e}")
+
+    monkeypatch.setattr(
+        Actions.edit_cardpool_act, "get_entries_data", get_entries_offline
+    )
+
+    owner_id = DRAFT_OPTIONS["owner_discord_id"]
+    draft = await create_draft(**DRAFT_OPTIONS)
+    await get_cards_from_data(OUTPUT_CARD_OBJECTS, draft)
+
+    with pytest.raises(ValueError):
+        await Actions.edit_cardpool_act.add_cards(draft.name, 123, "Aspamalgam")
+
+    # cards already in the pool get another copy without a lookup
+    await Actions.edit_cardpool_act.add_cards(
+        draft.name,
+        owner_id,
+        f"aspamalgam; {OUTPUT_CARD_OBJECTS[0]['link']}; Framework",
+    )
+    assert [entry.key for entry in lookups] == ["Framework"]
+    assert await Card.filter(draft=draft).count() == len(OUTPUT_CARD_OBJECTS) + 3
+
+    await Actions.edit_cardpool_act.remove_cards(
+        draft.name, owner_id, "2 Aspamalgam; 00cb6290-61b4-11ed-82b4-833eed596c50"
+    )
+    assert await Card.filter(draft=draft).count() == len(OUTPUT_CARD_OBJECTS)
+
+    with pytest.raises(ValueError):
+        await Actions.edit_cardpool_act.remove_cards(draft.name, owner_id, "Aspamalgam")
+
+    lookups.clear()
+    await Actions.edit_cardpool_act.replace_card(
+        draft.name, owner_id, "Framework", "Grid Monitor"
+    )
+    assert [entry.key for entry in lookups] == ["Grid Monitor"]
+
+    with pytest.raises(ValueError):
+        await Actions.edit_cardpool_act.replace_card(
+            draft.name, owner_id, "Grid Monitor", "Not A Card"
+        )
+
+    cards = await Card.filter(draft=draft)
+    await card_catalog.load(cards)
+    names = {card.name for card in cards}
+    assert "Grid Monitor" in names, "Replaced card should be kept after a typo"
+    assert not names & {"Framework", "Aspamalgam", "Akai Twin-Blade"}
+    assert await Card.filter(draft=draft).count() == len(
+        OUTPUT_CARD_OBJECTS
+    ), "A failed replace should not remove the old card"
+
+    # a start that wins the lock closes the cardpool for edits already under way
+    async with draft_state.draft_lock(draft.name) as state:
+        edits = [
+            asyncio.create_task(
+                Actions.edit_cardpool_act.add_cards(draft.name, owner_id, "Framework")
+            ),
+            asyncio.create_task(
+                Actions.edit_cardpool_act.remove_cards(
+                    draft.name, owner_id, "Grid Monitor"
+                )
+            ),
+        ]
+        await asyncio.sleep(0.1)
+        await Draft.filter(id=draft.id).update(status=DraftStatus.RUNNING.value)
+        state.status = DraftStatus.RUNNING.value
+    for edit in edits:
+        with pytest.raises(ValueError):
+            await edit
+    assert await Card.filter(draft=draft).count() == len(OUTPUT_CARD_OBJECTS)
+
+    await draft.delete()
+
+
+class FakeMessage:
+    async def edit(self, **kwargs):
+        pass
+
+
+class FakeDiscordUser:
+    """Picks the last card of every pack the moment it arrives."""
+
+    def __init__(self):
+        self.packs = []
+        self.files = []
+
+    async def send(self, content=None, view=None, file=None, **kwargs):
+        if file is not None:
+            self.files.append(file.fp.read().decode())
+        if view is not None:
+            self.packs.append(len(view.remaining_cards) + 1)
+            view._make_pick(len(view.remaining_cards))
+        return FakeMessage()
+
+
+class FakeBot:
+    def __init__(self):
+        self.users = {}
+
+    def get_user(self, discord_id):
+        return self.users.setdefault(discord_id, FakeDiscordUser())
+
+    def get_channel(self, channel_id):
+        return FakeDiscordUser()
+
+
+# @pytest.mark.skip
+async def test_can_run_draft_with_prepared_rounds(monkeypatch):
+    fetched = []
+    prepare_packs = player_pick_msg.prepare_packs
+
+    async def count_fetches(pack_ids):
+        fetched.append(len(pack_ids))
+        return await prepare_packs(pack_ids)
+
+    monkeypatch.setattr(player_pick_msg, "prepare_packs", count_fetches)
+
+    draft = await create_draft(**DRAFT_OPTIONS)
+    await get_cards_from_data(CARDS_LIST_LONG, draft)
+    user_ids = [DRAFT_OPTIONS["owner_discord_id"], 456, 789]
+    for user_id in user_ids:
+        await Actions.join_draft_act.join_draft(draft.name, user_id)
+    await Actions.start_draft_act.start_draft(draft.name, user_ids[0], 123)
+
+    bot = FakeBot()
+    await DraftCog(bot).draft_step(draft.name)
+
+    packs_per_player, cards_per_pack = (
+        DRAFT_OPTIONS["packs_per_player"],
+        DRAFT_OPTIONS["cards_per_pack"],
+    )
+    assert (
+        fetched == [len(user_ids)] * packs_per_player
+    ), "Only fresh packs should be fetched, passed packs are prepared during picks"
+    for user_id in user_ids:
+        assert bot.users[user_id].packs == list(range(cards_per_pack, 0, -1)) * (
+            packs_per_player
+        )
+        user = await User.get(discord_id=user_id)
+        assert await user.deck.all().count() == packs_per_player * cards_per_pack
+
+        # the cardlist arrives as an in-memory file
+        (deck_list,) = bot.users[user_id].files
+        assert len(deck_list.splitlines()) == packs_per_player * cards_per_pack
+        assert all(line.startswith("1 https://") for line in deck_list.splitlines())
+
+    draft = await Draft.get(name=draft.name)
+    assert draft.status == DraftStatus.FINISHED.value
+    assert not await Pack.filter(draft=draft).exists()
+
+    names = await get_deck_lists(draft, DeckFormat.NAMES)
+    uids = await get_deck_lists(draft, DeckFormat.UIDS)
+    card_names = {card["name"] for card in CARDS_LIST_LONG}
+    for user_id in user_ids:
+        assert all(line[2:] in card_names for line in names[user_id].splitlines())
+        assert all(
+            re.fullmatch(uid_regex, line[2:]) for line in uids[user_id].splitlines()
+        )
+
+    await draft.delete()
+
+
+class FakeInteraction:
+    """Button click by a member, the message edits are counted."""
+
+    class Member:
+        nick = name = "Owner"
+        display_avatar = None
+
+    class Guild:
+        def get_member(self, discord_id):
+            return FakeInteraction.Member()
+
+    class Response:
+        def __init__(self):
+            self.sent = []
+
+        async def send_message(self, content, **kwargs):
+            self.sent.append(content)
+
+    class Message:
+        def __init__(self):
+            self.embeds = []
+
+        async def edit(self, embed=None, **kwargs):
+            self.embeds.append(embed.fields[-1].name)
+
+    def __init__(self, discord_id, message=None):
+        self.user = FakeDiscordUser()
+        self.user.id = discord_id
+        self.guild = self.Guild()
+        self.response = self.Response()
+        self.message = message
+
+
+# @pytest.mark.skip
+async def test_join_storm_is_coalesced_into_one_edit():
+    draft = await create_draft(**DRAFT_OPTIONS_TWO)
+
+    message = FakeInteraction.Message()
+    open_message = await open_draft_msg.get_message(
+        draft.name, FakeInteraction(DRAFT_OPTIONS_TWO["owner_discord_id"])
+    )
+    view = open_message["view"]
+    view.refresher.window = 0.05
+
+    clicks = [FakeInteraction(1000 + i, message) for i in range(6)]
+    await asyncio.gather(*(view.join_draft.callback(click) for click in clicks))
+    await view.refresher.wait()
+
+    assert all(
+        click.response.sent == ["You joined the draft successfully."]
+        for click in clicks
+    ), "Every click should be answered right away"
+    assert message.embeds == ["Players (6/8)"], "Joins should be folded into one edit"
+
+    await view.join_draft.callback(FakeInteraction(2000, message))
+    await view.refresher.wait()
+    assert message.embeds[-1] == "Players (7/8)", "Later joins get their own edit"
+
+    await draft.delete()
+
+
+async def _try(action, *args):
+    try:
+        return await action(*args)
+    except ValueError as e:
+        return str(e)
+
+
+# @pytest.mark.skip
+async def test_concurrent_joins_never_overfill_a_draft():
+    draft = await create_draft(**DRAFT_OPTIONS)
+    await get_cards_from_data(CARDS_LIST_LONG, draft)
+
+    join = Actions.join_draft_act.join_draft
+    results = await asyncio.gather(
+        *(_try(join, draft.name, 5000 + i % 250) for i in range(500))
+    )
+
+    assert results.count("You joined the draft successfully.") == 4
+    assert (
+        results.count("Draft is full.")
+        + results.count("You already joined this draft.")
+        == len(results) - 4
+    ), "Every other join should be turned away"
+    assert await User.filter(participates_in_draft=draft).count() == 4
+
+    # starting while a crowd is still knocking, nobody gets in after the packs are made
+    owner_id = DRAFT_OPTIONS["owner_discord_id"]
+    await Actions.leave_draft_act.leave_draft(draft.name, 5000)
+    results = await asyncio.gather(
+        _try(join, draft.name, owner_id),
+        _try(Actions.start_draft_act.start_draft, draft.name, owner_id, 123),
+        *(_try(join, draft.name, 6000 + i) for i in range(200)),
+    )
+    assert results[0] == "You joined the draft successfully."
+    assert results[1][0] == "Draft started successfully. Have fun!"
+    assert results[2:] == ["Draft is not accepting participants anymore."] * 200
+
+    await draft.fetch_related("participants", "packs")
+    assert len(draft.participants) == 4
+    assert len(draft.packs) == 4 * DRAFT_OPTIONS["packs_per_player"]
+    assert draft_names.suggest(draft.name, [DraftStatus.PREPARING]) == []
+    assert draft_names.suggest(draft.name, [DraftStatus.RUNNING]) == [draft.name]
+
     await draft.delete()
+    assert draft_names.suggest(draft.name) == [], "Deleted drafts aren't suggested"
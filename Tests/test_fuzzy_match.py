@@ -0,0 +1,40 @@
+import pytest
+
+from Tests.test_constants import CARDS_LIST_LONG, OUTPUT_CARD_OBJECTS
+from Utils.cardpool_import import check_names, parse_cardpool
+from Utils.collective_api import ApiError
+from Utils.fuzzy_match import CardNameIndex, get_name_index
+
+PUBLIC_CARDS = {card["name"]: card for card in OUTPUT_CARD_OBJECTS + CARDS_LIST_LONG}
+
+
+def test_can_suggest_names():
+    index = CardNameIndex(card["name"] for card in OUTPUT_CARD_OBJECTS)
+
+    assert index.suggest("Red Laef Warshamen")[0] == "Red Leaf Warshaman"
+    assert index.suggest("head chieftain dzikus")[0] == "Head Chieftain Dzikus"
+    assert index.suggest("Bumblebeem", limit=1) == ["Bumblebeam"]
+    assert index.suggest("zzzzzzzz") == [], "Unrelated names should not match"
+
+
+def test_index_is_built_once_per_catalog():
+    index = get_name_index(PUBLIC_CARDS)
+    assert get_name_index(dict(PUBLIC_CARDS)) is index
+
+    changed = {**PUBLIC_CARDS, "New Card": {"name": "New Card", "link": ""}}
+    assert get_name_index(changed) is not index
+
+
+def test_reports_all_missing_names_at_once():
+    entries = parse_cardpool(
+        "Red Laef Warshaman\nBumblebeam\nAkai Twin-Blaed\nzzzzzzzz"
+    )
+
+    with pytest.raises(ApiError) as error:
+        check_names(entries, PUBLIC_CARDS)
+
+    message = error.value.message
+    assert message.startswith("Could not find 3 cards")
+    assert "did you mean Red Leaf Warshaman" in message
+    assert "did you mean Akai Twin-Blade" in message
+    assert "**zzzzzzzz**" in message
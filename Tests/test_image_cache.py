@@ -0,0 +1,89 @@
+import io
+import os
+
+import pytest
+
+from Utils import contact_sheet, image_cache as image_cache_module
+from Utils.image_cache import ImageCache
+
+LINKS = [f"https://files.collective.gg/p/cards/{i}-s.png" for i in range(4)]
+
+
+@pytest.fixture
+def fixture_images(monkeypatch):
+    """Serve local bytes instead of downloading card images."""
+    images = {link: f"image {i}".encode() * 100 for i, link in enumerate(LINKS)}
+    # two links, one image
+    images["https://files.collective.gg/p/cards/copy-s.png"] = images[LINKS[0]]
+    downloads = []
+
+    async def download(session, link):
+        downloads.append(link)
+        return images.get(link)
+
+    monkeypatch.setattr(image_cache_module, "_download", download)
+    return images, downloads
+
+
+async def test_images_are_stored_by_content(tmp_path, fixture_images):
+    images, downloads = fixture_images
+    cache = ImageCache(str(tmp_path), max_bytes=10_000)
+
+    await cache.fill([*LINKS, "https://files.collective.gg/p/cards/copy-s.png"])
+    await cache.fill(LINKS)
+
+    assert len(downloads) == 5, "Cached links shouldn't be downloaded again"
+    assert await cache.digest_of(LINKS[0]) == await cache.digest_of(
+        "https://files.collective.gg/p/cards/copy-s.png"
+    )
+    assert cache.size == sum(len(images[link]) for link in LINKS)
+
+    with open(cache.get(await cache.digest_of(LINKS[1])), "rb") as file:
+        assert file.read() == images[LINKS[1]]
+
+    # the index survives a restart
+    assert await ImageCache(str(tmp_path)).digest_of(LINKS[2]) == await cache.digest_of(
+        LINKS[2]
+    )
+
+
+async def test_least_recently_used_images_are_evicted(tmp_path, fixture_images):
+    images, _ = fixture_images
+    cache = ImageCache(str(tmp_path), max_bytes=len(images[LINKS[0]]) * 3)
+
+    for link in LINKS[:3]:
+        await cache.fill([link])
+        digest = await cache.digest_of(link)
+        os.utime(cache.path(digest), (0, 0) if link == LINKS[0] else None)
+    await cache.fill([LINKS[3]])
+
+    assert cache.size <= cache.max_bytes
+    assert await cache.digest_of(LINKS[0]) is None, "Oldest image should be evicted"
+    assert await cache.digest_of(LINKS[3]) is not None
+
+
+async def test_can_render_pack_sheet(tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+
+    images = {}
+    for i, link in enumerate(LINKS):
+        output = io.BytesIO()
+        Image.new("RGB", (400, 560), (i * 60, 0, 0)).save(output, format="PNG")
+        images[link] = output.getvalue()
+
+    async def download(session, link):
+        return images[link]
+
+    monkeypatch.setattr(image_cache_module, "_download", download)
+    cache = ImageCache(str(tmp_path))
+
+    sheet = await contact_sheet.get_pack_sheet(LINKS, cache)
+    assert sheet is not None
+    with Image.open(io.BytesIO(sheet)) as rendered:
+        assert (
+            rendered.width
+            == 4 * (contact_sheet.THUMBNAIL_WIDTH + contact_sheet.SHEET_PADDING)
+            + contact_sheet.SHEET_PADDING
+        )
+
+    assert await contact_sheet.get_pack_sheet(LINKS, cache) == sheet
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from Utils.import_queue import ImportQueue, PriorityGate
+
+
+async def test_queue_limits_concurrent_imports():
+    queue = ImportQueue(workers=2, per_user=1)
+    running, peak = 0, 0
+    positions = {}
+
+    async def job():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "done"
+
+    def tracker(user_id):
+        async def on_queued(position):
+            positions.setdefault(user_id, []).append(position)
+
+        return on_queued
+
+    results = await asyncio.gather(
+        *[queue.run(user_id, job, on_queued=tracker(user_id)) for user_id in range(6)]
+    )
+
+    assert results == ["done"] * 6
+    assert peak == 2, "Should never run more imports than workers"
+    assert 0 not in positions and 1 not in positions, "First imports start right away"
+    assert positions[2] == [1]
+    # two imports finish together, so the line moves up by two
+    assert positions[5] == [4, 2], "Should be told whenever the line moves"
+    assert queue.running == 0 and queue.waiting == 0
+
+
+async def test_queue_limits_imports_per_user():
+    queue = ImportQueue(workers=2, per_user=1)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def job():
+        started.set()
+        await release.wait()
+
+    first = asyncio.create_task(queue.run(123, job))
+    await started.wait()
+
+    with pytest.raises(ValueError):
+        await queue.run(123, job)
+
+    release.set()
+    await first
+    await queue.run(123, job), "Should be able to import again afterwards"
+
+
+async def test_cancelled_imports_leave_the_line():
+    queue = ImportQueue(workers=1, per_user=1)
+    release = asyncio.Event()
+
+    async def job():
+        await release.wait()
+
+    first = asyncio.create_task(queue.run(1, job))
+    second = asyncio.create_task(queue.run(2, job))
+    third = asyncio.create_task(queue.run(3, job))
+    await asyncio.sleep(0)
+    assert queue.waiting == 2
+
+    second.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(first, third)
+    assert queue.waiting == 0 and queue.running == 0
+
+
+async def test_imports_wait_for_draft_rounds():
+    gate = PriorityGate()
+    order = []
+
+    async def draft_round():
+        async with gate.priority():
+            await asyncio.sleep(0.01)
+            order.append("round")
+
+    async def import_batch():
+        await asyncio.sleep(0)
+        await gate.wait_turn()
+        order.append("import")
+
+    await asyncio.gather(draft_round(), import_batch())
+    assert order == ["round", "import"]
+
+    await gate.wait_turn()  # open gates don't block
@@ -0,0 +1,76 @@
+import random
+import time
+from collections import Counter
+
+import pytest
+
+from Utils.pack_collation import collate_packs
+
+FACTIONS = ["Mind", "Strength", "Spirit", "Neutral"]
+TYPES = ["Unit", "Action", "Relic"]
+
+
+def make_cube(size: int, seed: int = 1):
+    rng = random.Random(seed)
+    # skewed on purpose, a plain shuffle would clump the rare factions and types
+    return [
+        (
+            card_id,
+            rng.choices(FACTIONS, weights=[5, 3, 1, 1])[0],
+            rng.choices(TYPES, weights=[6, 3, 1])[0],
+        )
+        for card_id in range(size)
+    ]
+
+
+def traits(card):
+    return card[1], card[2]
+
+
+def spread(packs, trait_index):
+    counts = [Counter(card[trait_index] for card in pack) for pack in packs]
+    values = {value for count in counts for value in count}
+    return max(
+        max(count[value] for count in counts) - min(count[value] for count in counts)
+        for value in values
+    )
+
+
+def test_can_collate_balanced_packs():
+    cube = make_cube(1000)
+
+    start = time.perf_counter()
+    packs = collate_packs(cube, 30, 15, seed=42, traits=traits)
+    elapsed = time.perf_counter() - start
+
+    assert len(packs) == 30
+    assert all(len(pack) == 15 for pack in packs)
+    assert len({card[0] for pack in packs for card in pack}) == 450
+
+    assert spread(packs, 1) <= 1, "Every faction should be dealt evenly"
+    assert spread(packs, 2) <= 2, "Card types should be spread after repair"
+    assert elapsed < 0.5
+
+
+def test_same_seed_gives_same_packs():
+    cube = make_cube(200)
+
+    assert collate_packs(cube, 8, 15, seed=7, traits=traits) == collate_packs(
+        cube, 8, 15, seed=7, traits=traits
+    )
+    assert collate_packs(cube, 8, 15, seed=7, traits=traits) != collate_packs(
+        cube, 8, 15, seed=8, traits=traits
+    )
+
+
+def test_collate_without_attributes():
+    cube = [(card_id, None, None) for card_id in range(100)]
+
+    packs = collate_packs(cube, 4, 10, seed=3, traits=traits)
+
+    assert [len(pack) for pack in packs] == [10] * 4
+
+
+def test_collate_needs_enough_cards():
+    with pytest.raises(ValueError):
+        collate_packs(make_cube(20), 4, 10, seed=3, traits=traits)
@@ -0,0 +1,44 @@
+import pytest
+
+from Utils.passing_schedule import PassingSchedule
+
+SEATING = [11, 12, 13, 14]
+PACK_IDS = list(range(100, 112))
+
+
+def test_packs_pass_left_then_right():
+    schedule = PassingSchedule.build(SEATING, PACK_IDS, cards_per_pack=5)
+
+    assert schedule.total_rounds == 15
+    assert schedule.packs_for(0) == [100, 101, 102, 103]
+    # first pack goes left, seat 1 gets the pack seat 0 opened
+    assert schedule.packs_for(1) == [103, 100, 101, 102]
+    assert schedule.packs_for(4) == [100, 101, 102, 103]
+    # second pack goes right
+    assert schedule.packs_for(5) == [104, 105, 106, 107]
+    assert schedule.packs_for(6) == [105, 106, 107, 104]
+    assert schedule.direction(0) == 1 and schedule.direction(5) == -1
+    assert schedule.direction(10) == 1
+
+
+def test_every_seat_holds_a_different_pack():
+    schedule = PassingSchedule.build(SEATING, PACK_IDS, cards_per_pack=5)
+
+    for draft_round in range(schedule.total_rounds):
+        assert len(set(schedule.packs_for(draft_round))) == len(SEATING)
+    assert [schedule.is_last_pick(r) for r in range(5)] == [False] * 4 + [True]
+
+
+def test_schedule_survives_json():
+    schedule = PassingSchedule.build(SEATING, PACK_IDS, cards_per_pack=5)
+
+    loaded = PassingSchedule.from_json(schedule.to_json())
+
+    assert [loaded.packs_for(r) for r in range(15)] == [
+        schedule.packs_for(r) for r in range(15)
+    ]
+
+
+def test_uneven_packs_are_rejected():
+    with pytest.raises(ValueError):
+        PassingSchedule.build(SEATING, PACK_IDS[:-1], cards_per_pack=5)
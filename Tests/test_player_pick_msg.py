@@ -0,0 +1,120 @@
+from discord import Embed
+
+from Messages.card_embeds import CardEmbedCache
+from Messages.player_pick_msg import MAX_GALLERY_EMBEDS, MenuView, PackCard, View
+
+CARDS = [
+    PackCard(
+        11, 90001, "Aspamalgam", "https://files.collective.gg/p/cards/aspamalgam-s.png"
+    ),
+    PackCard(
+        12, 90002, "Bumblebeam", "https://files.collective.gg/p/cards/bumblebeam-s.png"
+    ),
+]
+
+
+async def test_pick_view_builds_embeds_lazily():
+    view = View(CARDS, "1/3")
+
+    assert not any(isinstance(value, Embed) for value in vars(view).values())
+
+    embed = view.initial
+    assert embed.title == "Aspamalgam"
+    assert embed.description == "Pack 1/3 - Card 1/2"
+    assert embed.image.url == CARDS[0].link
+    assert view.initial is not embed, "Every render should be a fresh embed"
+
+
+async def test_card_embed_cache_hands_out_copies():
+    cache = CardEmbedCache(maxsize=2)
+
+    first = cache.render(*CARDS[0][1:])
+    first.set_footer(text="You picked this card!")
+    first.description = "Pack 1/3 - Card 1/2"
+
+    second = cache.render(*CARDS[0][1:])
+    assert second.footer.text is None and second.description is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.render(*CARDS[1][1:])
+    cache.render(
+        3, "Cloudburst", "https://files.collective.gg/p/cards/cloudburst-s.png"
+    )
+    assert len(cache) == 2
+    cache.render(*CARDS[0][1:])
+    assert cache.misses == 4, "Least recently used card should be evicted"
+    assert cache.hit_rate == 1 / 5
+
+
+async def test_menu_view_lists_the_whole_pack():
+    view = MenuView(CARDS, "2/3")
+
+    assert [option.label for option in view.card_select.options] == [
+        "Aspamalgam",
+        "Bumblebeam",
+    ]
+    assert [embed.title for embed in view.gallery()] == ["Aspamalgam", "Bumblebeam"]
+
+    big_pack = [
+        PackCard(
+            card_id,
+            card_id,
+            f"Card {card_id}",
+            f"https://files.collective.gg/p/cards/{card_id}-s.png",
+        )
+        for card_id in range(MAX_GALLERY_EMBEDS + 5)
+    ]
+    gallery = MenuView(big_pack, "1/3").gallery()
+    assert len(gallery) == 1, "Packs too big for one message are listed as links"
+    assert "[Card 14](" in gallery[0].description
+
+
+class FakeResponse:
+    def __init__(self):
+        self.edits = []
+        self.messages = []
+
+    async def edit_message(self, **kwargs):
+        self.edits.append(kwargs)
+
+    async def send_message(self, content=None, **kwargs):
+        self.messages.append(content)
+
+
+class FakeInteraction:
+    def __init__(self):
+        self.response = FakeResponse()
+
+
+async def test_pick_is_fixed_once_made():
+    view = MenuView(CARDS, "1/3")
+
+    await view._pick(FakeInteraction(), 0)
+    assert view.pick_event.is_set()
+    assert view.is_finished(), "A picked view should stop listening"
+
+    # a second select that slipped through before the view stopped
+    late = FakeInteraction()
+    await view._pick(late, 1)
+    assert late.response.edits == [] and late.response.messages
+    assert view.picked_card == CARDS[0]
+    assert view.remaining_cards == CARDS[1:], "The prepared pack shouldn't change"
+
+    assert not await view.interaction_check(FakeInteraction())
+
+
+async def test_auto_pick_is_fixed_once_made():
+    class FakeMessage:
+        async def edit(self, **kwargs):
+            pass
+
+    view = View(CARDS, "1/3")
+    view.response = FakeMessage()
+    await view.auto_pick()
+    assert view.is_finished()
+
+    # an arrow click can't move the pick anymore
+    assert not await view.interaction_check(FakeInteraction())
+    view._current_card_index = 1
+    assert view.picked_card == CARDS[0]
+    assert view.remaining_cards == CARDS[1:]
@@ -0,0 +1,93 @@
+# banned discord ids in memory, checking a user is a set lookup without touching the disk
+# the file keeps the bans across restarts, it's written atomically and re-read when someone edits it by hand
+import asyncio
+import logging
+import os
+from typing import FrozenSet, Optional
+
+import discord
+
+BANLIST_PATH = "Data/banlist.txt"
+
+BANNED_MESSAGE = "You are banned from using this bot."
+
+
+class Banlist:
+    """Set of banned discord ids backed by a file with one id per line."""
+
+    def __init__(self, path: str = BANLIST_PATH):
+        self.path = path
+        # replaced as a whole, checks never see a half applied change
+        self._ids: FrozenSet[int] = frozenset()
+        self._mtime: Optional[float] = None
+        self._write_lock = asyncio.Lock()
+
+    def __contains__(self, discord_id: int) -> bool:
+        return discord_id in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def load(self):
+        """Read the file, a missing file is an empty banlist."""
+        mtime = self._file_mtime()
+        ids = set()
+        if mtime is not None:
+            with open(self.path) as file:
+                ids = {int(line) for line in file if line.strip().isdigit()}
+        self._ids = frozenset(ids)
+        self._mtime = mtime
+        logging.info(f"BANLIST - Loaded {len(ids)} banned users")
+
+    def reload_if_changed(self):
+        if self._file_mtime() != self._mtime:
+            self.load()
+
+    def _write(self, ids: FrozenSet[int]) -> Optional[float]:
+        # write and swap, a crash mid write leaves the old banlist intact
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as file:
+            file.writelines(f"{discord_id}\n" for discord_id in sorted(ids))
+        os.replace(temp_path, self.path)
+        return self._file_mtime()
+
+    async def _save(self, ids: FrozenSet[int]):
+        self._mtime = await asyncio.to_thread(self._write, ids)
+        self._ids = ids
+
+    async def ban(self, discord_id: int) -> bool:
+        """Ban a user, False if they already were."""
+        async with self._write_lock:
+            if discord_id in self._ids:
+                return False
+            await self._save(self._ids | {discord_id})
+        return True
+
+    async def unban(self, discord_id: int) -> bool:
+        """Lift a ban, False if the user wasn't banned."""
+        async with self._write_lock:
+            if discord_id not in self._ids:
+                return False
+            await self._save(self._ids - {discord_id})
+        return True
+
+
+banlist = Banlist()
+
+
+async def allows(interaction: discord.Interaction) -> bool:
+    """Interaction check for app commands and components, banned users are told why nothing happens."""
+    if interaction.user.id not in banlist:
+        return True
+
+    # autocomplete can't be answered with a message
+    if interaction.type != discord.InteractionType.autocomplete:
+        await interaction.response.send_message(BANNED_MESSAGE, ephemeral=True)
+    return False
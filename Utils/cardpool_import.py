@@ -0,0 +1,254 @@
+# turns an uploaded cardpool into deduplicated, classified entries before any api work happens
+# supported formats:
+#   plain lines   - one card name, card link or card uid per line
+#   decklist      - '2 Card Name' or '2x Card Name'
+#   csv           - header with a name, link or uid column and an optional count column
+#   json          - a list (or {"cards": [...]}) of strings or objects with name/link/uid/count
+import asyncio
+import csv
+import io
+import json
+import re
+from collections import namedtuple
+from enum import Enum
+from typing import Iterable, List, Tuple
+
+import aiohttp
+
+from Utils.collective_api import (
+    ApiError,
+    get_card_by_name,
+    get_card_by_uid,
+    get_public_cards,
+    uid_regex,
+)
+from Utils.fuzzy_match import get_name_index
+
+# concurrent api lookups per import
+RESOLVE_CONCURRENCY = 8
+
+# cards listed in a missing cards error, keeps it below discord's message limit
+MAX_REPORTED_MISSES = 15
+
+
+class EntryKind(Enum):
+    """How a cardpool entry gets resolved."""
+
+    UID = "uid"
+    LINK = "link"
+    NAME = "name"
+
+
+# key is the uid for UID and LINK entries and the card name for NAME entries
+CardpoolEntry = namedtuple("CardpoolEntry", ["kind", "key", "count"])
+
+_UID_RE = re.compile(uid_regex)
+_LINK_RE = re.compile(r"https?://\S*?(" + uid_regex + r")")
+_COUNTED_LINE_RE = re.compile(r"^(\d{1,2})x?\s+(\S.*)$")
+
+_NAME_COLUMNS = ("name", "card", "card name")
+_LINK_COLUMNS = ("link", "url", "image", "imgurl")
+_UID_COLUMNS = ("uid", "id", "card id")
+_COUNT_COLUMNS = ("count", "quantity", "qty", "amount", "copies")
+
+
+def classify(value: str) -> Tuple[EntryKind, str]:
+    """Kind and lookup key of a single card reference."""
+    link = _LINK_RE.search(value)
+    if link:
+        return EntryKind.LINK, link.group(1)
+
+    uid = _UID_RE.search(value)
+    if uid:
+        return EntryKind.UID, uid.group(0)
+
+    return EntryKind.NAME, value.rstrip()
+
+
+def _merge(values: Iterable[Tuple[str, int]]) -> List[CardpoolEntry]:
+    # links and uids of the same card share one api lookup
+    counts, kinds = {}, {}
+    for value, count in values:
+        value = value.strip()
+        if not value:
+            continue
+        if count < 1:
+            raise ValueError(f"Invalid count for {value}: {count}")
+        kind, key = classify(value)
+        lookup = (kind == EntryKind.NAME, key)
+        counts[lookup] = counts.get(lookup, 0) + count
+        kinds.setdefault(lookup, kind)
+
+    return [
+        CardpoolEntry(kinds[lookup], lookup[1], count)
+        for lookup, count in counts.items()
+    ]
+
+
+def _parse_lines(text: str):
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith(("#", "//")):
+            continue
+
+        counted = _COUNTED_LINE_RE.match(line)
+        if counted:
+            yield counted.group(2), int(counted.group(1))
+        else:
+            yield line, 1
+
+
+def _pick(row: dict, columns) -> str:
+    # a count of 0 is a value too, only missing and empty cells are skipped
+    for column in columns:
+        if column in row and row[column] is not None and row[column] != "":
+            return str(row[column])
+    return ""
+
+
+def _count(row: dict) -> int:
+    count = _pick(row, _COUNT_COLUMNS)
+    if count == "":
+        return 1
+    try:
+        return int(count)
+    except ValueError:
+        raise ValueError(f"Invalid count: {count}")
+
+
+def _parse_rows(rows: Iterable[dict]):
+    for row in rows:
+        row = {str(key).strip().lower(): value for key, value in row.items()}
+        value = (
+            _pick(row, _LINK_COLUMNS)
+            or _pick(row, _UID_COLUMNS)
+            or _pick(row, _NAME_COLUMNS)
+        )
+        yield value, _count(row)
+
+
+def _parse_json(data):
+    if isinstance(data, dict):
+        data = data.get("cards", [])
+    if not isinstance(data, list):
+        raise ValueError("Json cardpool must be a list of cards.")
+
+    for item in data:
+        if isinstance(item, str):
+            yield item, 1
+        elif isinstance(item, dict):
+            yield from _parse_rows([item])
+        else:
+            raise ValueError(f"Invalid card in json: {item}")
+
+
+def _parse_csv(text: str):
+    reader = csv.DictReader(io.StringIO(text))
+    yield from _parse_rows(reader)
+
+
+def _is_csv_header(line: str) -> bool:
+    columns = {column.strip().lower() for column in line.split(",")}
+    return bool(columns & {*_NAME_COLUMNS, *_LINK_COLUMNS, *_UID_COLUMNS})
+
+
+def parse_cardpool(text: str, filename: str = "") -> List[CardpoolEntry]:
+    """Deduplicated entries of a cardpool in any supported format, raises ValueError if it can't be read."""
+    text = text.lstrip("\ufeff")
+    stripped = text.lstrip()
+    first_line = stripped.split("\n", 1)[0]
+
+    is_json = filename.endswith(".json")
+    if is_json:
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid json: {e}")
+    elif stripped.startswith(("[", "{")):
+        # a plain line may start with a bracket too, it's only json if it parses
+        try:
+            data = json.loads(text)
+            is_json = True
+        except json.JSONDecodeError:
+            pass
+
+    if is_json:
+        values = _parse_json(data)
+    elif filename.endswith(".csv") or (
+        "," in first_line and _is_csv_header(first_line)
+    ):
+        values = _parse_csv(stripped)
+    else:
+        values = _parse_lines(text)
+
+    return _merge(values)
+
+
+def card_count(entries: List[CardpoolEntry]) -> int:
+    return sum(entry.count for entry in entries)
+
+
+async def resolve_entry(
+    session: aiohttp.ClientSession, entry: CardpoolEntry, public_cards: dict
+) -> dict:
+    """Card data of an entry, names come from the public list and everything else from the api."""
+    if entry.kind == EntryKind.NAME:
+        return get_card_by_name(entry.key, public_cards)
+    return await get_card_by_uid(session, entry.key)
+
+
+def missing_cards_error(misses: List[CardpoolEntry], public_cards: dict) -> ApiError:
+    """One error listing every card that couldn't be found, names come with suggestions."""
+    index = get_name_index(public_cards)
+
+    lines = []
+    for entry in misses[:MAX_REPORTED_MISSES]:
+        if entry.kind == EntryKind.NAME:
+            suggestions = index.suggest(entry.key)
+            hint = f" - did you mean {', '.join(suggestions)}?" if suggestions else ""
+            lines.append(f"**{entry.key}**{hint}")
+        else:
+            lines.append(f"**{entry.key}** - no card with this id")
+    if len(misses) > MAX_REPORTED_MISSES:
+        lines.append(f"... and {len(misses) - MAX_REPORTED_MISSES} more")
+
+    return ApiError(f"Could not find {len(misses)} cards:\n" + "\n".join(lines))
+
+
+def check_names(entries: List[CardpoolEntry], public_cards: dict):
+    """Raise before any api work if names aren't in the public list."""
+    misses = [
+        entry
+        for entry in entries
+        if entry.kind == EntryKind.NAME and entry.key not in public_cards
+    ]
+    if misses:
+        raise missing_cards_error(misses, public_cards)
+
+
+async def get_entries_data(entries: List[CardpoolEntry]) -> list:
+    """Card data for every copy in the cardpool, each distinct card is looked up once."""
+    semaphore = asyncio.Semaphore(RESOLVE_CONCURRENCY)
+
+    async with aiohttp.ClientSession() as session:
+        public_cards = await get_public_cards(session)
+        check_names(entries, public_cards)
+
+        async def resolve(entry):
+            async with semaphore:
+                return await resolve_entry(session, entry, public_cards)
+
+        cards = await asyncio.gather(
+            *[resolve(entry) for entry in entries], return_exceptions=True
+        )
+
+    for card in cards:
+        if isinstance(card, BaseException) and not isinstance(card, ApiError):
+            raise card
+    misses = [
+        entry for entry, card in zip(entries, cards) if isinstance(card, ApiError)
+    ]
+    if misses:
+        raise missing_cards_error(misses, public_cards)
+
+    return [card for entry, card in zip(entries, cards) for _ in range(entry.count)]
@@ -0,0 +1,125 @@
+# streams a parsed cardpool into a draft: entries -> resolve -> batch -> insert
+# every stage runs as its own task connected by queues, so api lookups and db inserts overlap
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+import aiohttp
+
+from Database.Models.draft import Draft
+from Database.draft_setup import get_cards_from_data
+from Utils.cardpool_import import (
+    CardpoolEntry,
+    RESOLVE_CONCURRENCY,
+    card_count,
+    check_names,
+    missing_cards_error,
+    resolve_entry,
+)
+from Utils import contact_sheet
+from Utils.collective_api import ApiError, get_public_cards
+from Utils.import_queue import draft_priority
+
+INSERT_BATCH_SIZE = 50
+
+
+class ImportProgress:
+    def __init__(self, total: int):
+        self.total = total
+        self.resolved = 0
+        self.inserted = 0
+
+    @property
+    def done(self) -> bool:
+        return self.inserted == self.total
+
+
+async def import_cardpool(
+    entries: List[CardpoolEntry],
+    draft: Draft,
+    on_progress: Optional[Callable[[ImportProgress], Awaitable]] = None,
+) -> int:
+    """Resolve parsed cardpool entries and insert every copy into the draft, raises ApiError listing every card that couldn't be found."""
+    progress = ImportProgress(card_count(entries))
+
+    async def report():
+        if on_progress:
+            await on_progress(progress)
+
+    entry_queue = asyncio.Queue()
+    card_queue = asyncio.Queue(maxsize=INSERT_BATCH_SIZE * 2)
+    batch_queue = asyncio.Queue(maxsize=2)
+
+    async with aiohttp.ClientSession() as session:
+        public_cards = await get_public_cards(session)
+
+        # typos in names show up before a single api request is made
+        check_names(entries, public_cards)
+        misses = []
+
+        async def parse():
+            for entry in entries:
+                await entry_queue.put(entry)
+            for _ in range(RESOLVE_CONCURRENCY):
+                await entry_queue.put(None)
+
+        async def resolve():
+            while (entry := await entry_queue.get()) is not None:
+                try:
+                    card = await resolve_entry(session, entry, public_cards)
+                except ApiError:
+                    misses.append(entry)
+                    continue
+                for _ in range(entry.count):
+                    await card_queue.put(card)
+                progress.resolved += entry.count
+                await report()
+            await card_queue.put(None)
+
+        async def batch():
+            cards, finished_workers = [], 0
+            while finished_workers < RESOLVE_CONCURRENCY:
+                card = await card_queue.get()
+                if card is None:
+                    finished_workers += 1
+                else:
+                    cards.append(card)
+
+                if len(cards) >= INSERT_BATCH_SIZE or (
+                    cards and finished_workers == RESOLVE_CONCURRENCY
+                ):
+                    await batch_queue.put(cards)
+                    cards = []
+            await batch_queue.put(None)
+
+        async def insert():
+            while (cards := await batch_queue.get()) is not None:
+                await draft_priority.wait_turn()
+                await get_cards_from_data(cards, draft)
+                # images download in the background for the pack contact sheets
+                contact_sheet.prefetch(card["link"] for card in cards)
+                progress.inserted += len(cards)
+                await report()
+
+        stages = [
+            asyncio.create_task(stage)
+            for stage in [
+                parse(),
+                *[resolve() for _ in range(RESOLVE_CONCURRENCY)],
+                batch(),
+                insert(),
+            ]
+        ]
+        try:
+            await asyncio.gather(*stages)
+        except BaseException:
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            raise
+
+    if misses:
+        raise missing_cards_error(misses, public_cards)
+
+    logging.info(f"IMPORT - Added {progress.inserted} cards to draft {draft.name}")
+    return progress.inserted
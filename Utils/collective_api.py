@@ -1,79 +1,65 @@
-import asyncio
-import logging
-import re
 import aiohttp
-import requests
 
 uid_regex = "[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
 
+PUBLIC_CARDS_URL = "https://server.collective.gg/api/public-cards/"
+CARD_URL = "https://server.collective.gg/api/card/{}"
+
 
 class ApiError(Exception):
     def __init__(self, message):
         self.message = message
 
 
-async def get_card_data(draft_cardpool_lines):
-    public_cards = requests.get("https://server.collective.gg/api/public-cards/").json()
-
-    loaded_cardpool = []
-    tasks = []
-    results = []
-    async with aiohttp.ClientSession() as session:
-        logging.info(f"Loading {len(draft_cardpool_lines)} cards...")
-        for line in draft_cardpool_lines:
-            card_name, card_link = None, None
-            try:
-                card_id = re.search(uid_regex, line).group(0)
-            except AttributeError:
-                card_id = None
-
-            if card_id:
-                tasks.append(
-                    asyncio.create_task(
-                        session.get(f"https://server.collective.gg/api/card/{card_id}")
-                    )
-                )
-
-            else:
-                for public_card in public_cards["cards"]:
-                    if public_card["name"].rstrip() == line.rstrip():
-                        card_name = public_card["name"]
-                        card_link = public_card["imgurl"]
-                        break
-
-                if card_name and card_link:
-                    loaded_cardpool.append({"name": card_name, "link": card_link})
-                else:
-                    # cancel all tasks
-                    for task in tasks:
-                        task.cancel()
-
-                    raise ApiError(f"Could not find card in public list: {line}")
-
-        responses = await asyncio.gather(*tasks)
-        for response, line in zip(responses, draft_cardpool_lines):
-            if response.status != 200:
-                raise ApiError(f"Error loading line: **{line}**")
-            else:
-                results.append(await response.json())
-
-        for result in results:
-            card_json = result
-            card_name = card_json["card"]["name"]
-            card_id = card_json["card"]["UID"]
-
-            # create card_link
-            # suffix -m or -s is based on whether the card has externals
-            if len(card_json["externals"]) > 0:
-                externals_suffix = "-m"
-            else:
-                externals_suffix = "-s"
-
-            card_link = (
-                f"https://files.collective.gg/p/cards/{card_id}{externals_suffix}.png"
-            )
-
-            if card_name and card_link:
-                loaded_cardpool.append({"name": card_name, "link": card_link})
-
-    return loaded_cardpool
+def card_from_json(card_json: dict) -> dict:
+    card_name = card_json["card"]["name"]
+    card_id = card_json["card"]["UID"]
+
+    # create card_link
+    # suffix -m or -s is based on whether the card has externals
+    if len(card_json["externals"]) > 0:
+        externals_suffix = "-m"
+    else:
+        externals_suffix = "-s"
+
+    card_link = f"https://files.collective.gg/p/cards/{card_id}{externals_suffix}.png"
+
+    # attributes are only used to balance packs, cards without them still import
+    card_text = card_json["card"].get("Text") or {}
+
+    return {
+        "name": card_name,
+        "link": card_link,
+        "faction": card_text.get("Affinity"),
+        "card_type": card_text.get("ObjectType"),
+    }
+
+
+async def get_public_cards(session: aiohttp.ClientSession) -> dict:
+    """Public cards by name."""
+    async with session.get(PUBLIC_CARDS_URL) as response:
+        public_cards = await response.json()
+
+    return {
+        public_card["name"].rstrip(): {
+            "name": public_card["name"],
+            "link": public_card["imgurl"],
+            "faction": public_card.get("affinity"),
+            "card_type": public_card.get("type"),
+        }
+        for public_card in public_cards["cards"]
+    }
+
+
+async def get_card_by_uid(session: aiohttp.ClientSession, card_id: str) -> dict:
+    async with session.get(CARD_URL.format(card_id)) as response:
+        if response.status != 200:
+            raise ApiError(f"Error loading line: **{card_id}**")
+        return card_from_json(await response.json())
+
+
+def get_card_by_name(name: str, public_cards: dict) -> dict:
+    try:
+        return public_cards[name.rstrip()]
+    except KeyError:
+        raise ApiError(f"Could not find card in public list: {name}")
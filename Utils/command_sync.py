@@ -0,0 +1,94 @@
+# syncs the command tree to a guild only when its commands changed since the last sync
+# a hash of the payload discord would receive is stored per guild, unchanged guilds are skipped.
+# syncing is rate limited by discord, a deploy that doesn't touch any command costs no requests
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import discord
+from discord import app_commands
+
+COMMAND_SYNC_STATE_PATH = "Data/command_sync.json"
+
+
+def tree_hash(tree: app_commands.CommandTree, guild: discord.abc.Snowflake) -> str:
+    """Hash of the commands a sync would upload to the guild."""
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+        key=lambda command: (command["type"], command["name"]),
+    )
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class CommandSync:
+    """Last synced command hash per guild, kept in a local file."""
+
+    def __init__(self, path: str = COMMAND_SYNC_STATE_PATH):
+        self.path = path
+        self._hashes: Optional[Dict[str, str]] = None
+
+    def _load(self) -> Dict[str, str]:
+        if self._hashes is None:
+            try:
+                with open(self.path) as file:
+                    self._hashes = json.load(file)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._hashes = {}
+        return self._hashes
+
+    def _save(self):
+        # write and swap, a crash mid write leaves the old state intact
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self._hashes, file)
+        os.replace(temp_path, self.path)
+
+    def forget(self, guild: discord.abc.Snowflake):
+        """The guild's commands changed outside of a sync, e.g. they were cleared."""
+        if self._load().pop(str(guild.id), None) is not None:
+            self._save()
+
+    async def sync(
+        self,
+        tree: app_commands.CommandTree,
+        guilds: Iterable[discord.abc.Snowflake],
+        force: bool = False,
+    ) -> Tuple[List[discord.abc.Snowflake], List[discord.abc.Snowflake]]:
+        """Sync the guilds whose commands changed, returns the synced and the skipped guilds.
+
+        A guild that can't be synced is logged and left out of both, the others are still synced.
+        """
+        hashes = self._load()
+        synced, skipped, failed = [], [], []
+        for guild in guilds:
+            tree.copy_global_to(guild=guild)
+            digest = tree_hash(tree, guild)
+            if not force and hashes.get(str(guild.id)) == digest:
+                skipped.append(guild)
+                continue
+
+            try:
+                await tree.sync(guild=guild)
+            except discord.HTTPException:
+                # no hash is kept, the guild is tried again on the next start
+                logging.exception(f"SYNC - Could not sync commands to {guild}")
+                failed.append(guild)
+                continue
+            hashes[str(guild.id)] = digest
+            # saved per guild, a failing sync further down doesn't lose the ones that worked
+            self._save()
+            synced.append(guild)
+
+        logging.info(
+            f"SYNC - Synced commands to {len(synced)} guilds, skipped {len(skipped)} unchanged guilds, {len(failed)} failed"
+            + "".join(f"\n  skipped {guild}" for guild in skipped)
+        )
+        return synced, skipped
+
+
+command_sync = CommandSync()
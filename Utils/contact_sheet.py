@@ -0,0 +1,123 @@
+# renders a whole pack into one numbered image, so players see every card in a single attachment
+# Pillow is optional, without it pick messages are sent without a sheet and no images are cached
+import asyncio
+import importlib.util
+import io
+import logging
+from collections import OrderedDict
+from math import ceil
+from typing import Iterable, List, Optional, Sequence
+
+from Utils.image_cache import ImageCache, image_cache
+
+# Pillow itself is only imported for the first sheet, it's slow to import and not needed to start up
+PIL_INSTALLED = importlib.util.find_spec("PIL") is not None
+
+SHEET_COLUMNS = 5
+THUMBNAIL_WIDTH = 200
+SHEET_PADDING = 8
+SHEET_BACKGROUND = (47, 49, 54)
+
+# pack states whose sheet digest is remembered, the sheets themselves live in the image cache
+SHEET_INDEX_SIZE = 512
+
+_sheets: "OrderedDict[tuple, str]" = OrderedDict()
+_background_tasks = set()
+
+
+def available() -> bool:
+    return PIL_INSTALLED
+
+
+def render_contact_sheet(paths: Sequence[str]) -> bytes:
+    """Numbered grid of the images as a jpeg, raises RuntimeError without Pillow."""
+    if not available():
+        raise RuntimeError("Pillow is needed to render contact sheets.")
+    from PIL import Image, ImageDraw
+
+    thumbnails = []
+    for path in paths:
+        with Image.open(path) as image:
+            image = image.convert("RGBA")
+            height = round(image.height * THUMBNAIL_WIDTH / image.width)
+            thumbnails.append(image.resize((THUMBNAIL_WIDTH, height)))
+
+    columns = min(SHEET_COLUMNS, len(thumbnails))
+    rows = ceil(len(thumbnails) / columns)
+    cell_height = max(thumbnail.height for thumbnail in thumbnails)
+    sheet = Image.new(
+        "RGB",
+        (
+            columns * (THUMBNAIL_WIDTH + SHEET_PADDING) + SHEET_PADDING,
+            rows * (cell_height + SHEET_PADDING) + SHEET_PADDING,
+        ),
+        SHEET_BACKGROUND,
+    )
+    draw = ImageDraw.Draw(sheet)
+
+    for index, thumbnail in enumerate(thumbnails):
+        x = SHEET_PADDING + (index % columns) * (THUMBNAIL_WIDTH + SHEET_PADDING)
+        y = SHEET_PADDING + (index // columns) * (cell_height + SHEET_PADDING)
+        sheet.paste(thumbnail, (x, y), thumbnail)
+        # same numbers as the card list of the pick message
+        draw.rectangle((x, y, x + 28, y + 22), fill=(0, 0, 0))
+        draw.text((x + 6, y + 5), str(index + 1), fill=(255, 255, 255))
+
+    output = io.BytesIO()
+    sheet.save(output, format="JPEG", quality=85)
+    return output.getvalue()
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
+async def get_pack_sheet(
+    links: List[str], cache: ImageCache = image_cache
+) -> Optional[bytes]:
+    """Contact sheet of the cards in this order, rendered once per pack state, None if it can't be made."""
+    if not available() or not links:
+        return None
+
+    try:
+        digests = [await cache.digest_of(link) for link in links]
+        if not all(digests):
+            await cache.fill(links)
+            digests = [await cache.digest_of(link) for link in links]
+            if not all(digests):
+                return None
+
+        key = tuple(digests)
+        path = key in _sheets and cache.get(_sheets[key])
+        if path:
+            _sheets.move_to_end(key)
+            return await asyncio.to_thread(_read_file, path)
+
+        sheet = await asyncio.to_thread(
+            render_contact_sheet, [cache.path(digest) for digest in digests]
+        )
+        _sheets[key] = await cache.put(sheet)
+        while len(_sheets) > SHEET_INDEX_SIZE:
+            _sheets.popitem(last=False)
+        return sheet
+    except Exception:
+        # a missing sheet shouldn't hold up a draft
+        logging.exception("IMAGES - Could not render pack sheet")
+        return None
+
+
+def prefetch(links: Iterable[str]):
+    """Cache card images in the background, only when sheets can be rendered."""
+    if not available():
+        return
+
+    async def fill(links):
+        try:
+            await image_cache.fill(links)
+        except Exception:
+            logging.exception("IMAGES - Could not cache card images")
+
+    task = asyncio.create_task(fill(list(links)))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
@@ -0,0 +1,62 @@
+# trigram index over card names, suggests the closest names for typos in a cardpool
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+# share of trigrams two names need in common to be suggested
+MIN_SIMILARITY = 0.3
+
+
+def _trigrams(name: str) -> set:
+    padded = f"  {name.lower().strip()} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class CardNameIndex:
+    """Approximate name lookup, built once and queried per unresolved line."""
+
+    def __init__(self, names: Iterable[str]):
+        self._names: List[str] = list(dict.fromkeys(names))
+        self._gram_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+        for name_id, name in enumerate(self._names):
+            grams = _trigrams(name)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(name_id)
+
+    def __len__(self):
+        return len(self._names)
+
+    def suggest(self, name: str, limit: int = 3) -> List[str]:
+        """Closest known names, best match first."""
+        grams = _trigrams(name)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        scored: List[Tuple[float, str]] = []
+        for name_id, common in shared.items():
+            # jaccard similarity of the two trigram sets
+            similarity = common / (len(grams) + self._gram_counts[name_id] - common)
+            if similarity >= MIN_SIMILARITY:
+                scored.append((similarity, self._names[name_id]))
+
+        scored.sort(key=lambda score: -score[0])
+        return [known_name for _, known_name in scored[:limit]]
+
+
+_cached_index: Tuple[int, CardNameIndex] = (0, None)
+
+
+def get_name_index(public_cards: dict) -> CardNameIndex:
+    """Index over the public card names, rebuilt only when the public list changes."""
+    global _cached_index
+
+    version = hash(tuple(public_cards))
+    if _cached_index[0] != version or _cached_index[1] is None:
+        _cached_index = (
+            version,
+            CardNameIndex(card["name"] for card in public_cards.values()),
+        )
+    return _cached_index[1]
@@ -0,0 +1,200 @@
+# local copies of card images, stored by the sha256 of their content
+# an index maps card links to digests, so the same image behind two links is kept once.
+# the whole cache stays below max_bytes, the least recently used files go first.
+# file writes, directory scans and eviction run in a thread, only single stats happen on the event loop
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import aiohttp
+
+IMAGE_CACHE_DIR = "Data/image_cache"
+IMAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# eviction frees a bit more than needed, so it doesn't run on every new image
+EVICTION_TARGET = 0.9
+
+# concurrent downloads while filling the cache
+DOWNLOAD_CONCURRENCY = 8
+
+
+async def _download(session: aiohttp.ClientSession, link: str) -> Optional[bytes]:
+    async with session.get(link) as response:
+        if response.status != 200:
+            return None
+        return await response.read()
+
+
+class ImageCache:
+    """Content-addressed image files with size-based eviction."""
+
+    def __init__(
+        self, directory: str = IMAGE_CACHE_DIR, max_bytes: int = IMAGE_CACHE_MAX_BYTES
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index: Optional[Dict[str, str]] = None
+        self._size: Optional[int] = None
+        self._evicting = False
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, "index.json")
+
+    def _files(self):
+        for entry in os.scandir(self.directory):
+            if entry.is_dir():
+                yield from (
+                    file
+                    for file in os.scandir(entry.path)
+                    if file.name.endswith(".img")
+                )
+
+    def _scan(self) -> Tuple[Dict[str, str], int]:
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            with open(self._index_path) as file:
+                index = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            index = {}
+        return index, sum(file.stat().st_size for file in self._files())
+
+    async def load(self):
+        """Read the index and size of the cache once."""
+        if self._index is not None:
+            return
+        index, size = await asyncio.to_thread(self._scan)
+        # another caller may have loaded it in the meantime
+        if self._index is None:
+            self._index, self._size = index, size
+
+    def _save_index(self, index: Dict[str, str]):
+        # write and swap, a crash mid write leaves the old index intact
+        temp_path = self._index_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(index, file)
+        os.replace(temp_path, self._index_path)
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}.img")
+
+    @property
+    def size(self) -> int:
+        """Bytes cached, 0 until the cache is loaded."""
+        return self._size or 0
+
+    def get(self, digest: str) -> Optional[str]:
+        """Path of a cached file, marks it as recently used."""
+        path = self.path(digest)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    async def digest_of(self, link: str) -> Optional[str]:
+        """Digest of a link's image if it's still cached."""
+        await self.load()
+        digest = self._index.get(link)
+        if digest and os.path.exists(self.path(digest)):
+            return digest
+        return None
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> bool:
+        # returns whether the file is new, existing files are only marked as used
+        if os.path.exists(path):
+            os.utime(path)
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as file:
+            file.write(data)
+        os.replace(path + ".tmp", path)
+        return True
+
+    async def put(self, data: bytes) -> str:
+        """Store content and return its digest, identical content is stored once."""
+        await self.load()
+        digest = hashlib.sha256(data).hexdigest()
+        if await asyncio.to_thread(self._write, self.path(digest), data):
+            self._size += len(data)
+            if self._size > self.max_bytes and not self._evicting:
+                await self._evict()
+        return digest
+
+    def _evict_files(self, size: int, target: float) -> Tuple[Set[str], int]:
+        # oldest files first until the cache is below the target, returns the evicted digests and bytes freed
+        files = sorted(
+            ((file, file.stat()) for file in self._files()),
+            key=lambda file: file[1].st_mtime,
+        )
+        evicted, freed = set(), 0
+        for file, stat in files:
+            if size - freed <= target:
+                break
+            os.remove(file.path)
+            freed += stat.st_size
+            evicted.add(file.name[: -len(".img")])
+        return evicted, freed
+
+    async def _evict(self):
+        self._evicting = True
+        try:
+            evicted, freed = await asyncio.to_thread(
+                self._evict_files, self._size, self.max_bytes * EVICTION_TARGET
+            )
+        finally:
+            self._evicting = False
+        self._size -= freed
+
+        self._index = {
+            link: digest
+            for link, digest in self._index.items()
+            if digest not in evicted
+        }
+        logging.info(
+            f"IMAGES - Evicted {len(evicted)} images, {self._size} bytes cached"
+        )
+
+    async def fetch(self, session: aiohttp.ClientSession, link: str) -> Optional[str]:
+        """Digest of a link's image, downloaded if it isn't cached."""
+        digest = await self.digest_of(link)
+        if digest:
+            return digest
+
+        try:
+            data = await _download(session, link)
+        except aiohttp.ClientError:
+            logging.exception(f"IMAGES - Could not download {link}")
+            return None
+        if data is None:
+            return None
+
+        digest = await self.put(data)
+        self._index[link] = digest
+        return digest
+
+    async def fill(self, links: Iterable[str]):
+        """Download every image that isn't cached yet."""
+        missing = [link for link in set(links) if not await self.digest_of(link)]
+        if not missing:
+            return
+
+        semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+
+        async with aiohttp.ClientSession() as session:
+
+            async def fetch(link):
+                async with semaphore:
+                    await self.fetch(session, link)
+
+            await asyncio.gather(*[fetch(link) for link in missing])
+
+        await asyncio.to_thread(self._save_index, dict(self._index))
+        logging.info(f"IMAGES - Cached {len(missing)} card images")
+
+
+image_cache = ImageCache()
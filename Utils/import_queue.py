@@ -0,0 +1,112 @@
+# admission control for cardpool imports
+# imports hammer the collective api and write a lot to sqlite, so only a few run at a time
+# and running drafts get to use the database first
+import asyncio
+import contextlib
+import logging
+from collections import Counter, deque
+from typing import Awaitable, Callable, Optional
+
+MAX_CONCURRENT_IMPORTS = 2
+MAX_IMPORTS_PER_USER = 1
+
+
+class ImportQueue:
+    """First come first served queue that runs at most `workers` imports at once."""
+
+    def __init__(
+        self,
+        workers: int = MAX_CONCURRENT_IMPORTS,
+        per_user: int = MAX_IMPORTS_PER_USER,
+    ):
+        self.workers = workers
+        self.per_user = per_user
+        self._waiting = deque()
+        self._running = 0
+        self._per_user = Counter()
+        self._changed = asyncio.Condition()
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    async def run(
+        self,
+        user_id: int,
+        job: Callable[[], Awaitable],
+        on_queued: Optional[Callable[[int], Awaitable]] = None,
+    ):
+        """Wait for a free worker, then run the job, on_queued is told the position whenever it changes."""
+        if self._per_user[user_id] >= self.per_user:
+            raise ValueError(
+                "You already have a cardpool import running, please wait for it to finish."
+            )
+
+        self._per_user[user_id] += 1
+        ticket = object()
+        self._waiting.append(ticket)
+        try:
+            last_position = None
+            while True:
+                async with self._changed:
+                    if self._running < self.workers and self._waiting[0] is ticket:
+                        self._waiting.popleft()
+                        self._running += 1
+                        break
+
+                    position = self._waiting.index(ticket) + 1
+                    if position == last_position:
+                        await self._changed.wait()
+                        continue
+
+                # report outside the lock, a slow dm shouldn't hold up the queue
+                last_position = position
+                if on_queued:
+                    await on_queued(position)
+
+            try:
+                return await job()
+            finally:
+                async with self._changed:
+                    self._running -= 1
+                    self._changed.notify_all()
+        finally:
+            self._per_user[user_id] -= 1
+            if ticket in self._waiting:
+                # cancelled while waiting, the ones behind move up
+                self._waiting.remove(ticket)
+                async with self._changed:
+                    self._changed.notify_all()
+
+
+class PriorityGate:
+    """Draft rounds hold the gate while they touch the database, imports wait for it to open."""
+
+    def __init__(self):
+        self._holders = 0
+        self._open = asyncio.Event()
+        self._open.set()
+
+    @contextlib.asynccontextmanager
+    async def priority(self):
+        self._holders += 1
+        self._open.clear()
+        try:
+            yield
+        finally:
+            self._holders -= 1
+            if not self._holders:
+                self._open.set()
+
+    async def wait_turn(self):
+        if not self._open.is_set():
+            logging.info("IMPORT - Waiting for running drafts")
+            await self._open.wait()
+
+
+import_queue = ImportQueue()
+draft_priority = PriorityGate()
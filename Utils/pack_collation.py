@@ -0,0 +1,107 @@
+# builds the packs of a draft so factions and card types spread evenly over them
+#   deal   - sample the cards that get drafted, sort them by faction and type and deal them
+#            round robin, every pack ends up with its share of each faction give or take one
+#   repair - swap cards of the same faction between packs until card types are spread too
+# everything runs off one seeded rng, the same seed and cardpool always give the same packs
+import random
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Hashable, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# (faction, card type) of a card
+Traits = Tuple[Hashable, Hashable]
+
+
+def card_traits(card) -> Traits:
+    """Faction and type of a card, call card_catalog.load() for the cards first."""
+    return card.faction, card.card_type
+
+
+def _sort_key(traits: Traits):
+    # cards without attributes share a group instead of breaking the sort
+    return tuple("" if trait is None else str(trait) for trait in traits)
+
+
+def _deal(
+    cards: List[T], traits: Dict[int, Traits], pack_count: int
+) -> List[List[int]]:
+    order = sorted(range(len(cards)), key=lambda i: _sort_key(traits[i]))
+    packs = [[] for _ in range(pack_count)]
+    for position, card_index in enumerate(order):
+        packs[position % pack_count].append(card_index)
+    return packs
+
+
+def _repair(packs: List[List[int]], traits: Dict[int, Traits]):
+    # every swap lowers the sum of squared type counts, so this always finishes
+    type_counts = [Counter(traits[i][1] for i in pack) for pack in packs]
+    slots = []
+    for pack in packs:
+        by_traits = defaultdict(list)
+        for position, card_index in enumerate(pack):
+            by_traits[traits[card_index]].append(position)
+        slots.append(by_traits)
+    card_types = {card_type for counts in type_counts for card_type in counts}
+
+    swapped = True
+    while swapped:
+        swapped = False
+        for card_type in card_types:
+            most = max(range(len(packs)), key=lambda p: type_counts[p][card_type])
+            least = min(range(len(packs)), key=lambda p: type_counts[p][card_type])
+            if type_counts[most][card_type] - type_counts[least][card_type] < 2:
+                continue
+
+            for (faction, other_type), positions in slots[least].items():
+                if other_type == card_type or not positions:
+                    continue
+                if type_counts[least][other_type] <= type_counts[most][other_type]:
+                    continue
+                candidates = slots[most].get((faction, card_type))
+                if not candidates:
+                    continue
+
+                # same faction both ways, the faction spread from dealing stays intact
+                give, take = candidates.pop(), positions.pop()
+                packs[most][give], packs[least][take] = (
+                    packs[least][take],
+                    packs[most][give],
+                )
+                slots[most][(faction, other_type)].append(give)
+                slots[least][(faction, card_type)].append(take)
+                type_counts[most][card_type] -= 1
+                type_counts[most][other_type] += 1
+                type_counts[least][card_type] += 1
+                type_counts[least][other_type] -= 1
+                swapped = True
+                break
+
+
+def collate_packs(
+    cards: Sequence[T],
+    pack_count: int,
+    cards_per_pack: int,
+    seed: int,
+    traits: Callable[[T], Traits] = card_traits,
+) -> List[List[T]]:
+    """Packs with factions and card types spread evenly, raises ValueError if the cardpool is too small."""
+    needed = pack_count * cards_per_pack
+    if needed > len(cards):
+        raise ValueError(
+            "Draft settings are not valid. Make sure you have enough cards for the draft."
+        )
+
+    rng = random.Random(seed)
+    drafted = rng.sample(list(cards), needed)
+    drafted_traits = {i: traits(card) for i, card in enumerate(drafted)}
+
+    packs = _deal(drafted, drafted_traits, pack_count)
+    _repair(packs, drafted_traits)
+
+    # dealing order shouldn't decide who gets which pack or where a card sits in it
+    rng.shuffle(packs)
+    for pack in packs:
+        rng.shuffle(pack)
+
+    return [[drafted[i] for i in pack] for pack in packs]
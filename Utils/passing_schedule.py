@@ -0,0 +1,64 @@
+# who holds which pack in which round, worked out once when the draft starts
+# seats sit around a table, packs go to the left (seat + 1) in odd pack rounds and to the right
+# in even ones. the pack seat s holds at a pick is the pack opened by the seat `pick` steps
+# upstream, so every lookup is plain arithmetic on the stored grid
+from typing import List
+
+
+class PassingSchedule:
+    """Seat order and the packs each seat opens, stored on the draft as json."""
+
+    def __init__(self, seating: List[int], packs: List[List[int]], cards_per_pack: int):
+        # seating: user ids by seat, packs: pack ids opened per pack round and seat
+        self.seating = seating
+        self.packs = packs
+        self.cards_per_pack = cards_per_pack
+
+    @classmethod
+    def build(
+        cls, seating: List[int], pack_ids: List[int], cards_per_pack: int
+    ) -> "PassingSchedule":
+        """Deal pack ids in creation order, seat by seat for every pack round."""
+        seats = len(seating)
+        if not seats or len(pack_ids) % seats:
+            raise ValueError("Every seat needs the same number of packs.")
+
+        packs = [pack_ids[i : i + seats] for i in range(0, len(pack_ids), seats)]
+        return cls(seating, packs, cards_per_pack)
+
+    @classmethod
+    def from_json(cls, data: dict) -> "PassingSchedule":
+        return cls(data["seating"], data["packs"], data["cards_per_pack"])
+
+    def to_json(self) -> dict:
+        return {
+            "seating": self.seating,
+            "packs": self.packs,
+            "cards_per_pack": self.cards_per_pack,
+        }
+
+    @property
+    def total_rounds(self) -> int:
+        # one pick per seat per round, every pack is picked empty
+        return len(self.packs) * self.cards_per_pack
+
+    def pack_round(self, draft_round: int) -> int:
+        return draft_round // self.cards_per_pack
+
+    def direction(self, draft_round: int) -> int:
+        """1 when packs go left this round, -1 when they go right."""
+        return 1 if self.pack_round(draft_round) % 2 == 0 else -1
+
+    def is_last_pick(self, draft_round: int) -> bool:
+        """The packs of this round are empty once it's picked."""
+        return draft_round % self.cards_per_pack == self.cards_per_pack - 1
+
+    def pack_for(self, draft_round: int, seat: int) -> int:
+        """Id of the pack seat holds in this round."""
+        pick = draft_round % self.cards_per_pack
+        opened_by = (seat - self.direction(draft_round) * pick) % len(self.seating)
+        return self.packs[self.pack_round(draft_round)][opened_by]
+
+    def packs_for(self, draft_round: int) -> List[int]:
+        """Pack ids of this round in seat order."""
+        return [self.pack_for(draft_round, seat) for seat in range(len(self.seating))]
@@ -0,0 +1,47 @@
+# timings of the steps between starting the process and on_ready, logged with PROFILE_STARTUP=True
+# steps are always recorded, it's a clock read and a module count each. only the report is optional
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+
+class StartupProfile:
+    """Wall time and newly imported modules per startup step."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.steps: List[Tuple[str, float, int]] = []
+        self.reported = False
+
+    @contextmanager
+    def step(self, name: str):
+        modules = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append(
+                (name, time.perf_counter() - start, len(sys.modules) - modules)
+            )
+
+    def report(self):
+        """Log every step, slowest first, once per process."""
+        if self.reported:
+            return
+        self.reported = True
+
+        for name, seconds, modules in sorted(
+            self.steps, key=lambda step: step[1], reverse=True
+        ):
+            logging.info(
+                f"STARTUP - {name}: {seconds * 1000:.1f} ms, {modules} modules imported"
+            )
+        logging.info(
+            f"STARTUP - ready after {time.perf_counter() - self.started:.2f} s, {len(sys.modules)} modules loaded"
+        )
+
+
+# the clock starts when this module is imported, bot.py does that first
+startup_profile = StartupProfile()
@@ -11,12 +11,19 @@
 import os
 import logging
 
-from dotenv import load_dotenv
+# first, its clock measures the whole startup
+from Utils.startup_profile import startup_profile
 
-import discord
-from discord.ext import commands
+with startup_profile.step("import libraries"):
+    from dotenv import load_dotenv
 
-from Database import database
+    import discord
+    from discord import app_commands
+    from discord.ext import commands
+
+    from Database import database
+    from Utils.banlist import allows, banlist
+    from Utils.command_sync import command_sync
 
 import asyncio
 import platform
@@ -42,18 +49,34 @@ load_dotenv()
 
 is_dev = os.getenv("IS_DEV") == "True"
 
+# logs how long each step took to reach on_ready
+profile_startup = os.getenv("PROFILE_STARTUP") == "True"
+
+EXTENSIONS = [
+    "Cogs.admin_cog",
+    "Cogs.draft_cog",
+    "Cogs.cube_cog",
+    "Cogs.misc_cog",
+]
+
+
+class Tree(app_commands.CommandTree):
+    # slash commands don't go through bot checks
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await allows(interaction)
+
 
 class MyBot(commands.Bot):
     async def setup_hook(self):
 
-        await database.init()
-
-        await bot.load_extension("Cogs.admin_cog")
-        await bot.load_extension("Cogs.draft_cog")
-        await bot.load_extension("Cogs.misc_cog")
+        with startup_profile.step("database init"):
+            await database.init()
+            banlist.load()
 
-        if is_dev:
-            await bot.load_extension("Cogs.test_cog")
+        # test fixtures are only imported in dev
+        for extension in EXTENSIONS + (["Cogs.test_cog"] if is_dev else []):
+            with startup_profile.step(f"load {extension}"):
+                await bot.load_extension(extension)
 
     async def close(self):
         logging.info("Closing discord bot...")
@@ -66,26 +89,23 @@ intents = discord.Intents.all()
 bot = MyBot(
     command_prefix="!",
     intents=intents,
+    tree_cls=Tree,
 )
 
 
 @bot.event
 async def on_ready():
     logging.info(f"{bot.user} has connected to Discord!")
+    if profile_startup:
+        startup_profile.report()
+
+    # only guilds whose commands changed since the last deploy are synced
+    await command_sync.sync(bot.tree, bot.guilds)
 
 
 @bot.check_once
 def exclude_banned_users(ctx):
-    # previously would prevent cmds from running if banlist.txt doesn't exist
-    # 'x+' mode raises FileExistsError if the file already exists
-    try:
-        open("Data/banlist.txt", "x+")
-    except FileExistsError:
-        with open("Data/banlist.txt", "r") as f:
-            for line in f.readlines():
-                if line.strip("\n") == str(ctx.author.id):
-                    return False
-    return True
+    return ctx.author.id not in banlist
 
 
 bot.run(os.getenv("DISCORD_TOKEN"), log_handler=None)
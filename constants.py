@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 EMBED_COLOR = 0x96F520
 
 MIN_PARTICIPANTS = 1
@@ -13,3 +15,10 @@ Head Chieftain Dzikus
 612f6fe0-f3e2-11ec-a26e-9defb71be79c
 d43cdd40-612b-11ed-82b4-833eed596c50
 ```"""
+
+# drafts are reclaimed by the cleanup task once their time to live runs out
+PREPARING_DRAFT_TTL = timedelta(days=7)
+FINISHED_DRAFT_TTL = timedelta(days=7)
+# running drafts live as long as their picks can take plus this, catches drafts orphaned by a restart
+RUNNING_DRAFT_GRACE = timedelta(days=1)
+EXPIRY_CHECK_INTERVAL_MINUTES = 1